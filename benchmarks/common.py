@@ -0,0 +1,104 @@
+import argparse
+import gc
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def environment() -> Dict:
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(timings: List[float]) -> Dict:
+    mean = statistics.fmean(timings)
+    return {
+        'rounds': len(timings),
+        'mean_us': round(mean * 1e6, 3),
+        'median_us': round(statistics.median(timings) * 1e6, 3),
+        'stdev_us': round(
+            statistics.stdev(timings) * 1e6 if len(timings) > 1 else 0.0, 3
+        ),
+        'min_us': round(min(timings) * 1e6, 3),
+        'ops_per_second': round(1 / mean, 2) if mean else None,
+    }
+
+
+def memory_peak(func: Callable, repeat: int = 5) -> int:
+    peaks = []
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return min(peaks)
+
+
+def bench(
+    func: Callable, rounds: int, warmup: int = 1, trace_memory: bool = True
+) -> Dict:
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    result = summarize(timings)
+    if trace_memory:
+        result['memory_peak_bytes'] = memory_peak(func)
+    return result
+
+
+def parameters(args: argparse.Namespace) -> Dict:
+    return {
+        name: value for name, value in vars(args).items() if name != 'output'
+    }
+
+
+def write_report(report: Dict, output: Optional[str]) -> None:
+    content = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(content + '\n')
+    else:
+        sys.stdout.write(content + '\n')
@@ -0,0 +1,430 @@
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from pwdlib import PasswordHash
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    create_async_engine,
+)
+
+from benchmarks.common import environment, write_report
+from car_api.models import Base
+from car_api.models.cars import Brand, Car, FuelType, TransmissionType
+from car_api.models.users import User
+
+BRAND_NAMES = (
+    'Toyota',
+    'Volkswagen',
+    'Chevrolet',
+    'Fiat',
+    'Hyundai',
+    'Honda',
+    'Renault',
+    'Jeep',
+    'Ford',
+    'Nissan',
+    'Peugeot',
+    'Citroën',
+    'BMW',
+    'Mercedes-Benz',
+    'Audi',
+    'Kia',
+    'Mitsubishi',
+    'BYD',
+    'Volvo',
+    'Chery',
+)
+MODEL_NAMES = (
+    'Corolla',
+    'Gol',
+    'Onix',
+    'Argo',
+    'HB20',
+    'Civic',
+    'Kwid',
+    'Compass',
+    'Ranger',
+    'Kicks',
+    '208',
+    'C3',
+    'Série 3',
+    'Classe C',
+    'A3',
+    'Sportage',
+    'L200',
+    'Dolphin',
+    'XC60',
+    'Tiggo 5x',
+)
+TRIMS = ('', ' LT', ' Comfort', ' Sport', ' Limited', ' Premium')
+COLORS = ('Branco', 'Preto', 'Prata', 'Cinza', 'Vermelho', 'Azul')
+FUEL_WEIGHTS = {
+    FuelType.FLEX: 60,
+    FuelType.GASOLINE: 15,
+    FuelType.DIESEL: 10,
+    FuelType.HYBRID: 6,
+    FuelType.ELECTRIC: 5,
+    FuelType.ETHANOL: 4,
+}
+TRANSMISSION_WEIGHTS = {
+    TransmissionType.AUTOMATIC: 45,
+    TransmissionType.MANUAL: 35,
+    TransmissionType.CVT: 15,
+    TransmissionType.SEMI_AUTOMATIC: 5,
+}
+PLATE_CAPACITY = 26**4 * 10**3
+CHOICE_BATCH = 10_000
+CURRENT_YEAR = 2025
+
+
+def zipf_cum_weights(size: int, exponent: float) -> List[float]:
+    return list(
+        itertools.accumulate(1 / rank**exponent for rank in range(1, size + 1))
+    )
+
+
+def plate(index: int, multiplier: int, offset: int) -> str:
+    value = (index * multiplier + offset) % PLATE_CAPACITY
+    value, last = divmod(value, 100)
+    value, letter = divmod(value, 26)
+    value, digit = divmod(value, 10)
+    letters = []
+    for _ in range(3):
+        value, position = divmod(value, 26)
+        letters.append(chr(65 + position))
+    return f'{"".join(letters)}{digit}{chr(65 + letter)}{last:02d}'
+
+
+def plate_permutation(generator: random.Random) -> Tuple[int, int]:
+    multiplier = generator.randrange(1, PLATE_CAPACITY)
+    while math.gcd(multiplier, PLATE_CAPACITY) != 1:
+        multiplier += 1
+    return multiplier, generator.randrange(PLATE_CAPACITY)
+
+
+def batched(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+class DatasetGenerator:
+    def __init__(
+        self,
+        users: int,
+        brands: int,
+        cars: int,
+        seed: int = 42,
+        owner_skew: float = 0.8,
+        brand_skew: float = 0.9,
+        password_hash: str = '',
+        now: Optional[datetime] = None,
+    ):
+        self.users = users
+        self.brands = brands
+        self.cars = cars
+        self.seed = seed
+        self.owner_skew = owner_skew
+        self.brand_skew = brand_skew
+        self.password_hash = password_hash
+        self.now = now or datetime(CURRENT_YEAR, 1, 1)
+
+    def stream(self, name: str) -> random.Random:
+        return random.Random(f'{self.seed}:{name}')
+
+    def timestamp(self, generator: random.Random, days: int) -> datetime:
+        return self.now - timedelta(seconds=generator.randrange(days * 86400))
+
+    def user_rows(self, first_id: int = 1) -> Iterator[Dict]:
+        generator = self.stream('users')
+        for index in range(self.users):
+            created_at = self.timestamp(generator, 3 * 365)
+            yield {
+                'id': first_id + index,
+                'username': f'user{first_id + index:08d}',
+                'email': f'user{first_id + index:08d}@example.com',
+                'password': self.password_hash,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+
+    def brand_rows(self, first_id: int = 1) -> Iterator[Dict]:
+        generator = self.stream('brands')
+        for index in range(self.brands):
+            name = BRAND_NAMES[index % len(BRAND_NAMES)]
+            if index >= len(BRAND_NAMES):
+                name = f'{name} {index // len(BRAND_NAMES) + 1}'
+            created_at = self.timestamp(generator, 5 * 365)
+            yield {
+                'id': first_id + index,
+                'name': name,
+                'description': f'Marca {name}',
+                'is_active': generator.random() < 0.95,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+
+    def car_rows(
+        self,
+        first_id: int = 1,
+        first_owner_id: int = 1,
+        first_brand_id: int = 1,
+    ) -> Iterator[Dict]:
+        generator = self.stream('cars')
+        permutation = plate_permutation(generator)
+        owner_ids = range(first_owner_id, first_owner_id + self.users)
+        brand_ids = range(first_brand_id, first_brand_id + self.brands)
+        owner_weights = zipf_cum_weights(self.users, self.owner_skew)
+        brand_weights = zipf_cum_weights(self.brands, self.brand_skew)
+        brand_prices = {
+            brand_id: generator.lognormvariate(11.4, 0.45)
+            for brand_id in brand_ids
+        }
+
+        for start in range(0, self.cars, CHOICE_BATCH):
+            size = min(CHOICE_BATCH, self.cars - start)
+            choices = zip(
+                range(first_id + start, first_id + start + size),
+                generator.choices(
+                    brand_ids, cum_weights=brand_weights, k=size
+                ),
+                generator.choices(
+                    owner_ids, cum_weights=owner_weights, k=size
+                ),
+                generator.choices(
+                    list(FUEL_WEIGHTS), list(FUEL_WEIGHTS.values()), k=size
+                ),
+                generator.choices(
+                    list(TRANSMISSION_WEIGHTS),
+                    list(TRANSMISSION_WEIGHTS.values()),
+                    k=size,
+                ),
+            )
+            for car_id, brand_id, owner_id, fuel_type, transmission in choices:
+                row = self.car_row(
+                    generator, brand_prices[brand_id], car_id, permutation
+                )
+                row.update(
+                    brand_id=brand_id,
+                    owner_id=owner_id,
+                    fuel_type=fuel_type.value,
+                    transmission=transmission.value,
+                )
+                yield row
+
+    def car_row(
+        self,
+        generator: random.Random,
+        brand_price: float,
+        car_id: int,
+        permutation: Tuple[int, int],
+    ) -> Dict:
+        age = min(int(generator.expovariate(1 / 5)), 35)
+        model_year = CURRENT_YEAR - age
+        price = brand_price * 0.9**age * generator.lognormvariate(0, 0.15)
+        created_at = self.timestamp(generator, 2 * 365)
+        age_seconds = int((self.now - created_at).total_seconds())
+        return {
+            'id': car_id,
+            'model': generator.choice(MODEL_NAMES) + generator.choice(TRIMS),
+            'factory_year': model_year - (generator.random() < 0.3),
+            'model_year': model_year,
+            'color': generator.choice(COLORS),
+            'plate': plate(car_id, *permutation),
+            'price': Decimal(max(price, 5000)).quantize(Decimal('0.01')),
+            'description': None,
+            'is_available': generator.random() < 0.8,
+            'created_at': created_at,
+            'updated_at': created_at
+            + timedelta(seconds=generator.randrange(age_seconds + 1)),
+        }
+
+
+async def next_id(conn: AsyncConnection, table: Table) -> int:
+    return (await conn.scalar(select(func.max(table.c.id)))) or 0
+
+
+def placeholders(paramstyle: str, count: int) -> str:
+    if paramstyle == 'qmark':
+        return ', '.join('?' * count)
+    if paramstyle == 'numeric_dollar':
+        return ', '.join(f'${index}' for index in range(1, count + 1))
+    return ', '.join(['%s'] * count)
+
+
+def row_converter(table: Table, dialect) -> Callable[[Dict], Tuple]:
+    processors = [
+        (
+            column.name,
+            column.type.dialect_impl(dialect).bind_processor(dialect),
+        )
+        for column in table.columns
+    ]
+
+    def convert(row: Dict) -> Tuple:
+        return tuple(
+            processor(row[name]) if processor else row[name]
+            for name, processor in processors
+        )
+
+    return convert
+
+
+async def insert_rows(
+    conn: AsyncConnection,
+    table: Table,
+    rows: Iterator[Dict],
+    batch_size: int,
+    use_copy: bool,
+) -> int:
+    count = 0
+    columns = ', '.join(column.name for column in table.columns)
+    if use_copy:
+        raw = await conn.get_raw_connection()
+        cursor = raw.driver_connection.cursor()
+        statement = f'COPY {table.name} ({columns}) FROM STDIN'
+        async with cursor.copy(statement) as copy:
+            for row in rows:
+                await copy.write_row([row[c.name] for c in table.columns])
+                count += 1
+    else:
+        convert = row_converter(table, conn.dialect)
+        values = placeholders(conn.dialect.paramstyle, len(table.columns))
+        statement = f'INSERT INTO {table.name} ({columns}) VALUES ({values})'
+        for batch in batched(rows, batch_size):
+            await conn.exec_driver_sql(statement, [convert(r) for r in batch])
+            count += len(batch)
+
+    if conn.dialect.name == 'postgresql':
+        await conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f'(SELECT max(id) FROM {table.name}))'
+            )
+        )
+    return count
+
+
+async def seed(
+    engine: AsyncEngine,
+    generator: DatasetGenerator,
+    batch_size: int = 10_000,
+    use_copy: bool = False,
+    create_schema: bool = False,
+) -> Dict:
+    use_copy = use_copy and engine.dialect.name == 'postgresql'
+    timings = {}
+    async with engine.begin() as conn:
+        if create_schema:
+            await conn.run_sync(Base.metadata.create_all)
+
+        first_user = await next_id(conn, User.__table__) + 1
+        first_brand = await next_id(conn, Brand.__table__) + 1
+        first_car = await next_id(conn, Car.__table__) + 1
+        tables = (
+            (User.__table__, generator.user_rows(first_user)),
+            (Brand.__table__, generator.brand_rows(first_brand)),
+            (
+                Car.__table__,
+                generator.car_rows(first_car, first_user, first_brand),
+            ),
+        )
+        for table, rows in tables:
+            started = time.perf_counter()
+            count = await insert_rows(conn, table, rows, batch_size, use_copy)
+            elapsed = time.perf_counter() - started
+            timings[table.name] = {
+                'rows': count,
+                'seconds': round(elapsed, 3),
+                'rows_per_second': round(count / elapsed, 1)
+                if elapsed
+                else None,
+            }
+
+    return {
+        'dialect': engine.dialect.name,
+        'method': 'copy' if use_copy else 'executemany',
+        'tables': timings,
+    }
+
+
+async def seed_database(database_url: str, *args, **kwargs) -> Dict:
+    engine = create_async_engine(database_url)
+    try:
+        return await seed(engine, *args, **kwargs)
+    finally:
+        await engine.dispose()
+
+
+def resolve_password_hash(password: str, password_hash: str) -> str:
+    return password_hash or PasswordHash.recommended().hash(password)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Gera usuários, marcas e carros sintéticos em massa'
+    )
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--brands', type=int, default=50)
+    parser.add_argument('--cars', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--owner-skew', type=float, default=0.8)
+    parser.add_argument('--brand-skew', type=float, default=0.9)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument(
+        '--copy',
+        action='store_true',
+        help='Usa COPY no PostgreSQL em vez de executemany',
+    )
+    parser.add_argument('--create-schema', action='store_true')
+    parser.add_argument('--password', default='password123')
+    parser.add_argument(
+        '--password-hash',
+        default='',
+        help='Hash argon2 pré-computado usado para todos os usuários',
+    )
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    args = parser.parse_args()
+
+    generator = DatasetGenerator(
+        users=args.users,
+        brands=args.brands,
+        cars=args.cars,
+        seed=args.seed,
+        owner_skew=args.owner_skew,
+        brand_skew=args.brand_skew,
+        password_hash=resolve_password_hash(args.password, args.password_hash),
+    )
+    started = time.perf_counter()
+    result = asyncio.run(
+        seed_database(
+            args.database_url,
+            generator,
+            args.batch_size,
+            args.copy,
+            args.create_schema,
+        )
+    )
+    write_report(
+        {
+            'benchmark': 'dataset',
+            'environment': environment(),
+            'seed': args.seed,
+            'seconds': round(time.perf_counter() - started, 3),
+            **result,
+        },
+        args.output,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+import argparse
+import json
+import math
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from benchmarks.common import write_report
+
+BASELINES_DIR = Path(__file__).parent / 'baselines'
+SUITES = {'micro': 'benchmarks.micro', 'load': 'benchmarks.load'}
+DEFAULT_THRESHOLDS = {
+    'latency': 0.10,
+    'tail_latency': 0.25,
+    'throughput': 0.15,
+    'errors': 0.01,
+    'queries': 0.0,
+    'allocations': 0.10,
+}
+ABSOLUTE_KINDS = {'errors'}
+ROUTE_QUERIES_NOISE = 0.1
+LOWER_IS_BETTER = {
+    'latency',
+    'tail_latency',
+    'errors',
+    'queries',
+    'allocations',
+}
+
+
+@dataclass
+class Metric:
+    name: str
+    kind: str
+    value: float
+    noise: float = 0.0
+
+
+@dataclass
+class Comparison:
+    name: str
+    kind: str
+    baseline: Optional[float]
+    current: Optional[float]
+    status: str
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return (self.current - self.baseline) / self.baseline
+
+
+def standard_error(case: Dict) -> float:
+    return case['stdev_us'] / math.sqrt(case['rounds'])
+
+
+def micro_metrics(report: Dict) -> Iterator[Metric]:
+    for group, cases in report['results'].items():
+        for name, case in cases.items():
+            if not isinstance(case, dict) or 'mean_us' not in case:
+                continue
+            prefix = f'micro.{group}.{name}'
+            yield Metric(
+                f'{prefix}.mean_us',
+                'latency',
+                case['mean_us'],
+                standard_error(case),
+            )
+            if 'memory_peak_bytes' in case:
+                yield Metric(
+                    f'{prefix}.memory_peak_bytes',
+                    'allocations',
+                    case['memory_peak_bytes'],
+                )
+            if 'queries' in case:
+                yield Metric(f'{prefix}.queries', 'queries', case['queries'])
+
+
+def load_metrics(report: Dict) -> Iterator[Metric]:
+    for stage in report['stages']:
+        prefix = f'load.c{stage["concurrency"]}'
+        yield Metric(
+            f'{prefix}.throughput_rps', 'throughput', stage['throughput_rps']
+        )
+        yield Metric(f'{prefix}.error_rate', 'errors', stage['error_rate'])
+        for name, endpoint in stage['endpoints'].items():
+            for percentile in ('p95_ms', 'p99_ms'):
+                yield Metric(
+                    f'{prefix}.{name}.{percentile}',
+                    'tail_latency',
+                    endpoint[percentile],
+                )
+        for route, cost in stage.get('routes', {}).items():
+            yield Metric(
+                f'{prefix}.{route}.queries_per_request',
+                'queries',
+                cost['queries_per_request'],
+                ROUTE_QUERIES_NOISE,
+            )
+
+
+EXTRACTORS = {'micro': micro_metrics, 'load': load_metrics}
+
+
+def compare(
+    baseline: List[Metric],
+    current: List[Metric],
+    thresholds: Dict[str, float],
+    noise_factor: float,
+) -> List[Comparison]:
+    previous = {metric.name: metric for metric in baseline}
+    comparisons = []
+    for metric in current:
+        base = previous.pop(metric.name, None)
+        if base is None:
+            comparisons.append(
+                Comparison(metric.name, metric.kind, None, metric.value, 'new')
+            )
+            continue
+
+        threshold = thresholds[metric.kind]
+        if metric.kind not in ABSOLUTE_KINDS:
+            threshold *= abs(base.value)
+        allowed = max(
+            threshold,
+            noise_factor * math.hypot(base.noise, metric.noise),
+        )
+        worse = metric.value - base.value
+        if metric.kind not in LOWER_IS_BETTER:
+            worse = -worse
+
+        status = 'ok'
+        if worse > allowed:
+            status = 'regression'
+        elif -worse > allowed:
+            status = 'improvement'
+        comparisons.append(
+            Comparison(
+                metric.name, metric.kind, base.value, metric.value, status
+            )
+        )
+
+    comparisons.extend(
+        Comparison(metric.name, metric.kind, metric.value, None, 'missing')
+        for metric in previous.values()
+    )
+    return comparisons
+
+
+def best_of(runs: List[List[Metric]]) -> List[Metric]:
+    grouped: Dict[str, List[Metric]] = {}
+    for metrics in runs:
+        for metric in metrics:
+            grouped.setdefault(metric.name, []).append(metric)
+
+    merged = []
+    for name, metrics in grouped.items():
+        values = [metric.value for metric in metrics]
+        kind = metrics[0].kind
+        best = min(values) if kind in LOWER_IS_BETTER else max(values)
+        spread = (max(values) - min(values)) / 2
+        noise = max(spread, *(metric.noise for metric in metrics))
+        merged.append(Metric(name, kind, best, noise))
+    return merged
+
+
+def suite_metrics(suite: str, runs: List[Dict]) -> List[Metric]:
+    extract = EXTRACTORS[suite]
+    return best_of([list(extract(report)) for report in runs])
+
+
+def to_argv(parameters: Dict) -> List[str]:
+    argv = []
+    for name, value in parameters.items():
+        option = f'--{name.replace("_", "-")}'
+        if value is None or value is False:
+            continue
+        if value is True:
+            argv.append(option)
+        elif isinstance(value, dict):
+            argv.extend([
+                option,
+                ','.join(f'{key}={item}' for key, item in value.items()),
+            ])
+        elif isinstance(value, list):
+            argv.extend([option, ','.join(str(item) for item in value)])
+        else:
+            argv.extend([option, str(value)])
+    return argv
+
+
+def run_suite(suite: str, baseline: Optional[Dict]) -> Dict:
+    argv = to_argv(baseline['runs'][0]['parameters']) if baseline else []
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / f'{suite}.json'
+        subprocess.run(
+            [sys.executable, '-m', SUITES[suite], *argv, '--output', output],
+            check=True,
+        )
+        return json.loads(output.read_text(encoding='utf-8'))
+
+
+def read_json(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def format_value(value: Optional[float]) -> str:
+    if value is None:
+        return '-'
+    return f'{value:.3f}' if isinstance(value, float) else str(value)
+
+
+def format_table(comparisons: List[Comparison], verbose: bool) -> str:
+    width = max([len(row.name) for row in comparisons] + [6])
+    lines = [
+        f'{"metric":<{width}} {"baseline":>14} {"current":>14} '
+        f'{"change":>9}  status',
+    ]
+    for row in comparisons:
+        if not verbose and row.status == 'ok':
+            continue
+        change = '-' if row.change is None else f'{row.change:+.1%}'
+        lines.append(
+            f'{row.name:<{width}} {format_value(row.baseline):>14} '
+            f'{format_value(row.current):>14} {change:>9}  {row.status}'
+        )
+
+    counts: Dict[str, int] = {}
+    for row in comparisons:
+        counts[row.status] = counts.get(row.status, 0) + 1
+    lines.append(
+        ', '.join(f'{status}: {count}' for status, count in counts.items())
+    )
+    return '\n'.join(lines)
+
+
+def parse_thresholds(value: str) -> Dict[str, float]:
+    thresholds = {}
+    for item in value.split(','):
+        kind, _, threshold = item.partition('=')
+        if kind not in DEFAULT_THRESHOLDS:
+            raise argparse.ArgumentTypeError(f'Métrica inválida: {kind}')
+        thresholds[kind] = float(threshold)
+    return thresholds
+
+
+def parse_current(value: str) -> Dict[str, str]:
+    suite, _, path = value.partition('=')
+    if suite not in SUITES:
+        raise argparse.ArgumentTypeError(f'Suíte inválida: {suite}')
+    return {suite: path}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compara benchmarks com os baselines versionados'
+    )
+    parser.add_argument(
+        '--suite', action='append', choices=sorted(SUITES), dest='suites'
+    )
+    parser.add_argument(
+        '--current',
+        action='append',
+        type=parse_current,
+        default=[],
+        help='Usa um resultado existente em vez de rodar a suíte '
+        '(ex.: micro=results.json)',
+    )
+    parser.add_argument('--threshold', type=parse_thresholds, default={})
+    parser.add_argument('--noise-factor', type=float, default=3.0)
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='Execuções por suíte; vale o melhor valor de cada métrica',
+    )
+    parser.add_argument('--baselines', type=Path, default=BASELINES_DIR)
+    parser.add_argument(
+        '--update', action='store_true', help='Grava o resultado como baseline'
+    )
+    parser.add_argument('--verbose', action='store_true')
+    parser.add_argument('--output', help='Arquivo JSON com a comparação')
+    args = parser.parse_args()
+
+    thresholds = dict(DEFAULT_THRESHOLDS, **args.threshold)
+    current_paths = {}
+    for item in args.current:
+        current_paths.update(item)
+
+    regressions = 0
+    summary = {}
+    for suite in args.suites or list(SUITES):
+        baseline_path = args.baselines / f'{suite}.json'
+        baseline = read_json(baseline_path)
+        if suite in current_paths:
+            runs = [read_json(Path(current_paths[suite]))]
+        else:
+            runs = [run_suite(suite, baseline) for _ in range(args.repeat)]
+
+        if args.update or baseline is None:
+            args.baselines.mkdir(parents=True, exist_ok=True)
+            write_report({'suite': suite, 'runs': runs}, str(baseline_path))
+            print(f'{suite}: baseline gravado em {baseline_path}')
+            continue
+
+        comparisons = compare(
+            suite_metrics(suite, baseline['runs']),
+            suite_metrics(suite, runs),
+            thresholds,
+            args.noise_factor,
+        )
+        print(f'\n## {suite}\n{format_table(comparisons, args.verbose)}')
+        regressions += sum(row.status == 'regression' for row in comparisons)
+        summary[suite] = [vars(row) for row in comparisons]
+
+    if args.output:
+        write_report(summary, args.output)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,503 @@
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import re
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.common import (
+    environment,
+    parameters,
+    percentile,
+    write_report,
+)
+from benchmarks.startup import wait_for
+from car_api.models import Base
+
+DEFAULT_MIX = {
+    'login': 1,
+    'list_cars': 6,
+    'get_car': 4,
+    'create_car': 1,
+    'update_car': 1,
+    'delete_car': 1,
+    'list_brands': 2,
+    'get_brand': 1,
+}
+FUEL_TYPES = ('gasoline', 'ethanol', 'flex', 'diesel', 'electric', 'hybrid')
+TRANSMISSIONS = ('manual', 'automatic', 'semi_automatic', 'cvt')
+PASSWORD = 'load-test-password'
+METRIC_LINE = re.compile(r'^(\w+)\{([^}]*)\} (\S+)$')
+LABEL = re.compile(r'(\w+)="([^"]*)"')
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'Operação inválida: {name}')
+        mix[name] = int(weight)
+    return mix
+
+
+def parse_stages(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors[operation] += 1
+        finally:
+            self.latencies[operation].append(time.perf_counter() - started)
+
+    def report(self, elapsed: float) -> Dict:
+        total = sum(len(values) for values in self.latencies.values())
+        errors = sum(self.errors.values())
+        endpoints = {}
+        for operation, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            endpoints[operation] = {
+                'requests': len(ordered),
+                'errors': self.errors[operation],
+                'error_rate': round(self.errors[operation] / len(ordered), 4),
+                'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+                'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+                'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+            }
+        return {
+            'requests': total,
+            'errors': errors,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+            'throughput_rps': round(total / elapsed, 2),
+            'endpoints': endpoints,
+        }
+
+
+class VirtualUser:
+    plates = itertools.count()
+    plate_prefix = ''.join(random.choices(string.ascii_uppercase, k=3))
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        account: Dict,
+        brand_ids: List[int],
+        generator: random.Random,
+    ):
+        self.client = client
+        self.account = account
+        self.brand_ids = brand_ids
+        self.generator = generator
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {'Authorization': f'Bearer {self.account["token"]}'}
+
+    @property
+    def car_ids(self) -> List[int]:
+        return self.account['car_ids']
+
+    def car_payload(self) -> Dict:
+        year = self.generator.randint(2005, 2025)
+        return {
+            'model': f'Load {self.generator.randint(1, 500)}',
+            'factory_year': year,
+            'model_year': year + self.generator.randint(0, 1),
+            'color': self.generator.choice(('Branco', 'Preto', 'Prata')),
+            'plate': f'{self.plate_prefix}{next(self.plates):07d}',
+            'fuel_type': self.generator.choice(FUEL_TYPES),
+            'transmission': self.generator.choice(TRANSMISSIONS),
+            'price': str(self.generator.randint(15000, 300000)),
+            'brand_id': self.generator.choice(self.brand_ids),
+        }
+
+    def car_filters(self) -> Dict:
+        options = {
+            'search': f'Load {self.generator.randint(1, 50)}',
+            'brand_id': self.generator.choice(self.brand_ids),
+            'fuel_type': self.generator.choice(FUEL_TYPES),
+            'transmission': self.generator.choice(TRANSMISSIONS),
+            'is_available': 'true',
+            'min_price': self.generator.randint(15000, 80000),
+            'max_price': self.generator.randint(100000, 300000),
+        }
+        names = self.generator.sample(
+            list(options), self.generator.randint(0, 3)
+        )
+        params = {name: options[name] for name in names}
+        params['limit'] = self.generator.choice((10, 50, 100))
+        return params
+
+    async def call(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = await self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def login(self) -> None:
+        response = await self.call(
+            'POST',
+            '/api/v1/auth/token',
+            json={'email': self.account['email'], 'password': PASSWORD},
+        )
+        self.account['token'] = response.json()['access_token']
+
+    async def list_cars(self) -> None:
+        await self.call(
+            'GET',
+            '/api/v1/cars/',
+            params=self.car_filters(),
+            headers=self.headers,
+        )
+
+    async def get_car(self) -> None:
+        if not self.car_ids:
+            await self.create_car()
+            return
+        car_id = self.generator.choice(self.car_ids)
+        await self.call('GET', f'/api/v1/cars/{car_id}', headers=self.headers)
+
+    async def create_car(self) -> None:
+        response = await self.call(
+            'POST',
+            '/api/v1/cars/',
+            json=self.car_payload(),
+            headers=self.headers,
+        )
+        self.car_ids.append(response.json()['id'])
+
+    async def update_car(self) -> None:
+        if not self.car_ids:
+            await self.create_car()
+            return
+        car_id = self.generator.choice(self.car_ids)
+        await self.call(
+            'PUT',
+            f'/api/v1/cars/{car_id}',
+            json={
+                'price': str(self.generator.randint(15000, 300000)),
+                'is_available': self.generator.random() < 0.8,
+            },
+            headers=self.headers,
+        )
+
+    async def delete_car(self) -> None:
+        if len(self.car_ids) < 2:
+            await self.create_car()
+            return
+        car_id = self.car_ids.pop(self.generator.randrange(len(self.car_ids)))
+        await self.call(
+            'DELETE', f'/api/v1/cars/{car_id}', headers=self.headers
+        )
+
+    async def list_brands(self) -> None:
+        await self.call(
+            'GET',
+            '/api/v1/brands/',
+            params={'limit': self.generator.choice((10, 50, 100))},
+            headers=self.headers,
+        )
+
+    async def get_brand(self) -> None:
+        brand_id = self.generator.choice(self.brand_ids)
+        await self.call(
+            'GET', f'/api/v1/brands/{brand_id}', headers=self.headers
+        )
+
+
+async def prepare(
+    client: httpx.AsyncClient, users: int, brands: int, cars: int
+) -> Dict:
+    suffix = ''.join(random.choices(string.ascii_lowercase, k=6))
+    accounts = []
+    for index in range(users):
+        email = f'load{index}-{suffix}@example.com'
+        response = await client.post(
+            '/api/v1/users/',
+            json={
+                'username': f'load{index}-{suffix}',
+                'email': email,
+                'password': PASSWORD,
+            },
+        )
+        response.raise_for_status()
+        response = await client.post(
+            '/api/v1/auth/token',
+            json={'email': email, 'password': PASSWORD},
+        )
+        response.raise_for_status()
+        accounts.append({
+            'email': email,
+            'token': response.json()['access_token'],
+            'car_ids': [],
+        })
+
+    headers = {'Authorization': f'Bearer {accounts[0]["token"]}'}
+    brand_ids = []
+    for index in range(brands):
+        response = await client.post(
+            '/api/v1/brands/',
+            json={'name': f'Load {suffix} {index}'},
+            headers=headers,
+        )
+        response.raise_for_status()
+        brand_ids.append(response.json()['id'])
+
+    generator = random.Random(0)
+    for account in accounts:
+        user = VirtualUser(client, account, brand_ids, generator)
+        for _ in range(cars):
+            await user.create_car()
+
+    return {'accounts': accounts, 'brand_ids': brand_ids}
+
+
+async def worker(
+    user: VirtualUser,
+    operations: List[str],
+    weights: List[int],
+    recorder: Recorder,
+    deadline: float,
+) -> None:
+    while time.perf_counter() < deadline:
+        operation = user.generator.choices(operations, weights)[0]
+        with recorder.measure(operation):
+            await getattr(user, operation)()
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    state: Dict,
+    mix: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> Dict:
+    operations = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in operations]
+    recorder = Recorder()
+    accounts = state['accounts']
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(
+            worker(
+                VirtualUser(
+                    client,
+                    accounts[index % len(accounts)],
+                    state['brand_ids'],
+                    random.Random(seed + index),
+                ),
+                operations,
+                weights,
+                recorder,
+                deadline,
+            )
+            for index in range(concurrency)
+        )
+    )
+    return dict(
+        recorder.report(time.perf_counter() - started),
+        concurrency=concurrency,
+    )
+
+
+def saturation(stages: List[Dict]) -> Optional[Dict]:
+    if not stages:
+        return None
+    best = max(stages, key=lambda stage: stage['throughput_rps'])
+    return {
+        'concurrency': best['concurrency'],
+        'throughput_rps': best['throughput_rps'],
+    }
+
+
+def read_counter(content: str, name: str) -> Dict[str, float]:
+    totals: Dict[str, float] = defaultdict(float)
+    for line in content.splitlines():
+        match = METRIC_LINE.match(line)
+        if match is None or match.group(1) != name:
+            continue
+        labels = dict(LABEL.findall(match.group(2)))
+        totals[labels['route']] += float(match.group(3))
+    return totals
+
+
+async def scrape_metrics(
+    client: httpx.AsyncClient,
+) -> Optional[Dict[str, Dict[str, float]]]:
+    try:
+        response = await client.get('/metrics')
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    return {
+        'requests': read_counter(response.text, 'http_requests_total'),
+        'statements': read_counter(response.text, 'db_statements_total'),
+    }
+
+
+def route_costs(before: Dict, after: Dict) -> Dict[str, Dict]:
+    costs = {}
+    for route, total in sorted(after['requests'].items()):
+        requests = total - before['requests'].get(route, 0.0)
+        if requests <= 0:
+            continue
+        statements = after['statements'].get(route, 0.0) - before[
+            'statements'
+        ].get(route, 0.0)
+        costs[route] = {
+            'requests': int(requests),
+            'queries_per_request': round(statements / requests, 3),
+        }
+    return costs
+
+
+async def run(args: argparse.Namespace, base_url: str) -> Dict:
+    limits = httpx.Limits(
+        max_connections=max(args.stages), max_keepalive_connections=None
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        state = await prepare(client, args.users, args.brands, args.cars)
+        stages = []
+        for concurrency in args.stages:
+            before = await scrape_metrics(client)
+            stage = await run_stage(
+                client,
+                state,
+                args.mix,
+                concurrency,
+                args.duration,
+                args.seed,
+            )
+            after = await scrape_metrics(client)
+            if before is not None and after is not None:
+                stage['routes'] = route_costs(before, after)
+            print(format_stage(stage), file=sys.stderr)
+            stages.append(stage)
+
+    return {
+        'benchmark': 'load',
+        'environment': environment(),
+        'parameters': parameters(args),
+        'base_url': base_url,
+        'stages': stages,
+        'saturation': saturation(stages),
+    }
+
+
+def format_stage(stage: Dict) -> str:
+    lines = [
+        f'concurrency={stage["concurrency"]} '
+        f'rps={stage["throughput_rps"]} '
+        f'errors={stage["error_rate"]:.2%}',
+        f'  {"endpoint":<12} {"reqs":>7} {"err":>6} '
+        f'{"p50":>9} {"p95":>9} {"p99":>9}',
+    ]
+    lines.extend(
+        f'  {name:<12} {values["requests"]:>7} {values["errors"]:>6} '
+        f'{values["p50_ms"]:>9.2f} {values["p95_ms"]:>9.2f} '
+        f'{values["p99_ms"]:>9.2f}'
+        for name, values in stage['endpoints'].items()
+    )
+    return '\n'.join(lines)
+
+
+async def create_schema(database_url: str) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+@contextmanager
+def spawn_server(database_url: str, port: int, timeout: float):
+    asyncio.run(create_schema(database_url))
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        SERVER_PORT=str(port),
+        SERVER_WORKERS='1',
+    )
+    env.setdefault('JWT_SECRET_KEY', 'load-test-secret')
+    env.setdefault('RATE_LIMIT_ENABLED', 'false')
+    env.setdefault('CONCURRENCY_LIMIT_ENABLED', 'false')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'car_api.server'],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(f'http://127.0.0.1:{port}/health_check', timeout)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Teste de carga com mix de tráfego e concorrência '
+        'crescente'
+    )
+    parser.add_argument(
+        '--base-url',
+        help='URL de uma API já em execução; sem ela um worker é iniciado',
+    )
+    parser.add_argument(
+        '--database-url',
+        help='Banco do worker iniciado (padrão: SQLite temporário)',
+    )
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument(
+        '--stages', type=parse_stages, default=parse_stages('1,4,16,64')
+    )
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--brands', type=int, default=10)
+    parser.add_argument('--cars', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    args = parser.parse_args()
+
+    if args.base_url:
+        report = asyncio.run(run(args, args.base_url))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            database_url = (
+                args.database_url or f'sqlite+aiosqlite:///{directory}/load.db'
+            )
+            with spawn_server(database_url, args.port, args.timeout) as url:
+                report = asyncio.run(run(args, url))
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from pydantic import ValidationError
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import bench, environment, parameters, write_report
+from benchmarks.dataset import DatasetGenerator, seed
+from car_api.core.responses import model_response
+from car_api.core.security import (
+    create_access_token,
+    get_password_hash,
+    verify_password,
+    verify_token,
+)
+from car_api.models.cars import Car, FuelType, TransmissionType
+from car_api.routers.cars import apply_car_filters
+from car_api.schemas.cars import (
+    CAR_FIELDS,
+    CarFilterSchema,
+    CarListPublicSchema,
+    CarSchema,
+    car_list_public_schema,
+)
+
+ARGON2_PARAMS = re.compile(r'\$m=(\d+),t=(\d+),p=(\d+)\$')
+
+CAR_PAYLOAD = {
+    'model': '  Corolla XEi  ',
+    'factory_year': 2022,
+    'model_year': 2023,
+    'color': 'Prata',
+    'plate': ' abc1d23 ',
+    'fuel_type': 'flex',
+    'transmission': 'automatic',
+    'price': '129990.90',
+    'description': 'Único dono',
+    'brand_id': 1,
+}
+
+FILTER_COMBINATIONS = {
+    'none': {},
+    'search': {'search': 'Corolla'},
+    'brand': {'brand_id': 3},
+    'fuel_transmission': {
+        'fuel_type': FuelType.FLEX,
+        'transmission': TransmissionType.AUTOMATIC,
+    },
+    'price_range': {'min_price': 40000, 'max_price': 80000},
+    'available_brand_price': {
+        'is_available': True,
+        'brand_id': 3,
+        'max_price': 120000,
+    },
+    'all': {
+        'search': 'a',
+        'brand_id': 3,
+        'fuel_type': FuelType.FLEX,
+        'transmission': TransmissionType.AUTOMATIC,
+        'is_available': True,
+        'min_price': 20000,
+        'max_price': 150000,
+    },
+}
+
+
+def argon2_parameters(hashed: str) -> Dict:
+    match = ARGON2_PARAMS.search(hashed)
+    if match is None:
+        return {}
+    memory_kib, time_cost, parallelism = map(int, match.groups())
+    return {
+        'memory_kib': memory_kib,
+        'time_cost': time_cost,
+        'parallelism': parallelism,
+    }
+
+
+def run_security(rounds: int, hash_rounds: int) -> Dict:
+    token = create_access_token({'sub': '1'})
+    hashed = get_password_hash('benchmark-password')
+    return {
+        'argon2': argon2_parameters(hashed),
+        'create_access_token': bench(
+            lambda: create_access_token({'sub': '1'}), rounds
+        ),
+        'verify_token': bench(lambda: verify_token(token), rounds),
+        'get_password_hash': bench(
+            lambda: get_password_hash('benchmark-password'), hash_rounds
+        ),
+        'verify_password': bench(
+            lambda: verify_password('benchmark-password', hashed),
+            hash_rounds,
+        ),
+    }
+
+
+def validate_invalid_car() -> None:
+    try:
+        CarSchema.model_validate(
+            dict(CAR_PAYLOAD, plate='ab', factory_year=1800)
+        )
+    except ValidationError:
+        pass
+
+
+def run_validation(rounds: int) -> Dict:
+    return {
+        'car_schema_valid': bench(
+            lambda: CarSchema.model_validate(CAR_PAYLOAD), rounds
+        ),
+        'car_schema_invalid': bench(validate_invalid_car, rounds),
+    }
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[List[str]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+async def list_cars(engine: AsyncEngine, filters: CarFilterSchema) -> List:
+    query = (
+        select(Car).options(selectinload(Car.brand)).where(Car.owner_id == 1)
+    )
+    query = apply_car_filters(query, filters).limit(100)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        result = await session.execute(query)
+        return result.scalars().all()
+
+
+async def fetch_pages(session: AsyncSession, page_size: int) -> Dict:
+    orm_result = await session.execute(
+        select(Car)
+        .options(selectinload(Car.brand), selectinload(Car.owner))
+        .limit(page_size)
+    )
+    row_result = await session.execute(
+        select(*(getattr(Car, name) for name in CAR_FIELDS)).limit(page_size)
+    )
+    return {
+        'orm': {
+            'cars': orm_result.scalars().all(),
+            'offset': 0,
+            'limit': page_size,
+        },
+        'rows': {'cars': row_result.all(), 'offset': 0, 'limit': page_size},
+    }
+
+
+def run_database(
+    size: int, page_size: int, rounds: int, brands: int, owners: int
+) -> Dict:
+    loop = asyncio.new_event_loop()
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    try:
+        loop.run_until_complete(
+            seed(
+                engine,
+                DatasetGenerator(owners, brands, size, password_hash='x'),
+                create_schema=True,
+            )
+        )
+        session = AsyncSession(engine, expire_on_commit=False)
+        pages = loop.run_until_complete(fetch_pages(session, page_size))
+        row_schema = car_list_public_schema(CAR_FIELDS, ())
+
+        queries = {}
+        for name, values in FILTER_COMBINATIONS.items():
+            filters = CarFilterSchema(**values)
+            with count_statements(engine.sync_engine) as statements:
+                matched = len(
+                    loop.run_until_complete(list_cars(engine, filters))
+                )
+            queries[name] = dict(
+                bench(
+                    lambda filters=filters: loop.run_until_complete(
+                        list_cars(engine, filters)
+                    ),
+                    rounds,
+                    trace_memory=False,
+                ),
+                matched=matched,
+                queries=len(statements),
+            )
+
+        loop.run_until_complete(session.close())
+        return {
+            'dataset': {'cars': size, 'brands': brands, 'owners': owners},
+            'serialization': {
+                'page_size': page_size,
+                'car_public_from_orm': bench(
+                    lambda: model_response(CarListPublicSchema, pages['orm']),
+                    rounds,
+                ),
+                'car_public_from_rows': bench(
+                    lambda: model_response(row_schema, pages['rows']),
+                    rounds,
+                ),
+            },
+            'list_cars': queries,
+        }
+    finally:
+        loop.run_until_complete(engine.dispose())
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Microbenchmarks das primitivas mais usadas da API'
+    )
+    parser.add_argument('--rounds', type=int, default=1000)
+    parser.add_argument('--hash-rounds', type=int, default=20)
+    parser.add_argument('--sql-rounds', type=int, default=200)
+    parser.add_argument('--cars', type=int, default=5000)
+    parser.add_argument('--brands', type=int, default=20)
+    parser.add_argument('--owners', type=int, default=10)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    args = parser.parse_args()
+
+    report = {
+        'benchmark': 'micro',
+        'environment': environment(),
+        'parameters': parameters(args),
+        'results': {
+            'security': run_security(args.rounds, args.hash_rounds),
+            'validation': run_validation(args.rounds),
+            **run_database(
+                args.cars,
+                args.page_size,
+                args.sql_rounds,
+                args.brands,
+                args.owners,
+            ),
+        },
+    }
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
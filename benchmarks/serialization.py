@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from car_api.core.responses import model_response
+from car_api.models.cars import Brand, Car, FuelType, TransmissionType
+from car_api.models.users import User
+from car_api.schemas.cars import (
+    CarListPublicSchema,
+    car_normalized_list_public_schema,
+)
+
+
+def build_page(size: int = 100, brands: int = 5) -> dict:
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    owner = User(
+        id=1,
+        username='benchmark',
+        email='benchmark@example.com',
+        password='x',
+        created_at=now,
+        updated_at=now,
+    )
+    brand_objects = [
+        Brand(
+            id=index + 1,
+            name=f'Brand {index}',
+            description='Benchmark brand',
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(brands)
+    ]
+    cars = [
+        Car(
+            id=index + 1,
+            model=f'Model {index}',
+            factory_year=2020,
+            model_year=2021,
+            color='White',
+            plate=f'BEN{index:04d}',
+            fuel_type=FuelType.FLEX,
+            transmission=TransmissionType.AUTOMATIC,
+            price=Decimal('45999.90') + index,
+            description='Benchmark car',
+            is_available=True,
+            brand_id=brand_objects[index % brands].id,
+            owner_id=owner.id,
+            created_at=now,
+            updated_at=now,
+            brand=brand_objects[index % brands],
+            owner=owner,
+        )
+        for index in range(size)
+    ]
+    return {'cars': cars, 'offset': 0, 'limit': size}
+
+
+def encode_default(loop, field, page: dict) -> bytes:
+    content = loop.run_until_complete(
+        serialize_response(field=field, response_content=page)
+    )
+    return JSONResponse(content).body
+
+
+def encode_model_response(page: dict) -> bytes:
+    return model_response(CarListPublicSchema, page).body
+
+
+def encode_normalized(page: dict) -> bytes:
+    cars = page['cars']
+    content = {
+        'cars': cars,
+        'brands': {car.brand.id: car.brand for car in cars},
+        'users': {car.owner.id: car.owner for car in cars},
+        'offset': page['offset'],
+        'limit': page['limit'],
+    }
+    return model_response(car_normalized_list_public_schema(), content).body
+
+
+def measure(func, rounds: int) -> dict:
+    func()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        size = len(func())
+    elapsed = time.perf_counter() - started
+    return {
+        'rounds': rounds,
+        'seconds': round(elapsed, 6),
+        'pages_per_second': round(rounds / elapsed, 2),
+        'mean_ms': round(elapsed / rounds * 1000, 4),
+        'bytes': size,
+    }
+
+
+def run(page_size: int, rounds: int) -> dict:
+    page = build_page(page_size)
+    field = create_model_field(
+        name='Response_list_cars',
+        type_=CarListPublicSchema,
+        mode='serialization',
+    )
+    loop = asyncio.new_event_loop()
+    try:
+        return {
+            'benchmark': 'serialization',
+            'page_size': page_size,
+            'results': {
+                'jsonable_encoder': measure(
+                    lambda: encode_default(loop, field, page), rounds
+                ),
+                'model_response': measure(
+                    lambda: encode_model_response(page), rounds
+                ),
+                'model_response_normalized': measure(
+                    lambda: encode_normalized(page), rounds
+                ),
+            },
+        }
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Throughput de serialização de páginas de carros'
+    )
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=500)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.page_size, args.rounds), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def import_profile(module: str, top: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:') :].split('|')
+        entries.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+
+    entries.sort(key=lambda entry: entry['cumulative_us'], reverse=True)
+    total = next(
+        (e['cumulative_us'] for e in entries if e['module'] == module), 0
+    )
+    return {'module': module, 'total_us': total, 'top': entries[:top]}
+
+
+def wait_for(url: str, timeout: float) -> float:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.01)
+    raise TimeoutError(url)
+
+
+def first_response(port: int, prebuilt: bool, timeout: float) -> dict:
+    env = dict(
+        os.environ,
+        SERVER_PORT=str(port),
+        SERVER_WORKERS='1',
+        OPENAPI_PREBUILT=str(prebuilt).lower(),
+    )
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'car_api.server'],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        ready = wait_for(f'http://127.0.0.1:{port}/health_check', timeout)
+        docs_started = time.perf_counter()
+        wait_for(f'http://127.0.0.1:{port}/openapi.json', timeout)
+        docs_finished = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        'openapi_prebuilt': prebuilt,
+        'first_response_ms': round((ready - started) * 1000, 2),
+        'first_openapi_ms': round((docs_finished - docs_started) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Tempo de import e de inicialização até a 1ª resposta'
+    )
+    parser.add_argument('--module', default='car_api.app')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    report = {
+        'benchmark': 'startup',
+        'import_profile': import_profile(args.module, args.top),
+        'startup': [
+            first_response(args.port, prebuilt, args.timeout)
+            for prebuilt in (False, True)
+        ],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,57 @@
-from fastapi import FastAPI, status
+import asyncio
+from contextlib import asynccontextmanager
 
-from car_api.routers import auth, brands, cars, users
+from fastapi import FastAPI, Response, status
 
-app = FastAPI()
+from car_api.core import database, events, metrics, readiness, suggest
+from car_api.core.openapi import prebuilt_openapi
+from car_api.core.profiling import ProfilingMiddleware
+from car_api.core.settings import get_settings
+from car_api.core.slow_queries import log_slow_query_report
+from car_api.core.tracing import shutdown_tracer
+from car_api.routers import auth, batch, brands, cars, users
+
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lag_monitor = asyncio.create_task(metrics.monitor_event_loop_lag())
+    flusher = (
+        asyncio.create_task(
+            metrics.flush_periodically(
+                settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS
+            )
+        )
+        if settings.METRICS_DIR
+        else None
+    )
+    refreshers = [
+        asyncio.create_task(
+            suggest.keep_fresh(
+                get_index, load, settings.SUGGEST_REFRESH_SECONDS
+            )
+        )
+        for get_index, load in (
+            (suggest.get_car_index, cars.car_suggest_rows),
+            (suggest.get_brand_index, brands.brand_suggest_rows),
+        )
+    ]
+    yield
+    events.get_event_broker().close()
+    lag_monitor.cancel()
+    for refresher in refreshers:
+        refresher.cancel()
+    if flusher:
+        flusher.cancel()
+        metrics.write_snapshot(
+            settings.METRICS_DIR, metrics.REGISTRY.snapshot()
+        )
+    shutdown_tracer()
+    log_slow_query_report()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(
     router=auth.router,
@@ -28,7 +77,48 @@ app.include_router(
     tags=['cars'],
 )
 
+app.include_router(
+    router=batch.router,
+    prefix='/api/v1/batch',
+    tags=['batch'],
+)
+
+if settings.PROFILING_TOKEN:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILING_TOKEN,
+        output_dir=settings.PROFILING_OUTPUT_DIR,
+        interval=settings.PROFILING_INTERVAL,
+    )
+
+if settings.OPENAPI_PREBUILT:
+    app.openapi = prebuilt_openapi(app, settings.OPENAPI_PATH)
+
 
 @app.get('/health_check', status_code=status.HTTP_200_OK)
 def health_check():
     return {'status': 'ok'}
+
+
+@app.get(
+    '/ready',
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            'description': 'Instância indisponível para receber tráfego'
+        }
+    },
+)
+async def ready(response: Response):
+    probe = readiness.get_readiness_probe()
+    is_ready, report = await probe.report(database.engine)
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
+
+
+@app.get('/metrics', include_in_schema=False)
+def metrics_endpoint():
+    return Response(
+        metrics.render(settings.METRICS_DIR), media_type=metrics.CONTENT_TYPE
+    )
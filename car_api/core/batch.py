@@ -0,0 +1,196 @@
+import json
+import logging
+import re
+from typing import Any, Dict, List
+
+from fastapi import Request, status
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from car_api.core import database, events
+
+logger = logging.getLogger(__name__)
+
+REFERENCE = re.compile(r'\{([^{}]+)\}')
+ALLOWED_PREFIX = '/api/v1/'
+BLOCKED_PATHS = ('/api/v1/batch', '/api/v1/cars/events')
+
+
+class BatchReferenceError(Exception):
+    pass
+
+
+class BatchSession(AsyncSession):
+    def __init__(self, *args, atomic: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.atomic = atomic
+        self.info['pending_events'] = [] if atomic else None
+
+    async def commit(self) -> None:
+        if self.atomic:
+            await self.flush()
+        else:
+            await super().commit()
+
+    async def finish(self) -> None:
+        await super().commit()
+        broker = events.get_event_broker()
+        for owner_id, event, data in self.info['pending_events'] or []:
+            broker.publish(owner_id, event, data)
+
+    async def discard(self) -> None:
+        await self.rollback()
+        if self.atomic:
+            self.info['pending_events'] = []
+
+
+def lookup(results: List[Dict], reference: str) -> Any:
+    index, *keys = reference.split('.')
+    try:
+        result = results[int(index)]
+        if result['status'] >= status.HTTP_300_MULTIPLE_CHOICES:
+            raise BatchReferenceError(reference)
+        value = result['body']
+        for key in keys:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+    except (ValueError, IndexError, KeyError, TypeError):
+        raise BatchReferenceError(reference)
+    return value
+
+
+def resolve(value: Any, results: List[Dict]) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {'$ref'}:
+            return lookup(results, str(value['$ref']))
+        return {key: resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, results) for item in value]
+    return value
+
+
+def resolve_path(path: str, results: List[Dict]) -> str:
+    return REFERENCE.sub(
+        lambda match: str(lookup(results, match.group(1))), path
+    )
+
+
+def is_operation(request: Request) -> bool:
+    return getattr(request.state, 'batch_operation', False)
+
+
+def allowed(path: str) -> bool:
+    path = path.partition('?')[0].rstrip('/')
+    return path.startswith(ALLOWED_PREFIX) and path not in BLOCKED_PATHS
+
+
+async def dispatch(
+    request: Request, method: str, path: str, body: Any
+) -> Dict:
+    path, _, query = path.partition('?')
+    content = b'' if body is None else json.dumps(body).encode()
+    headers = [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(content)).encode()),
+    ]
+    if 'authorization' in request.headers:
+        headers.append((
+            b'authorization',
+            request.headers['authorization'].encode(),
+        ))
+
+    scope = {
+        **request.scope,
+        'method': method,
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'headers': headers,
+        'state': {**request.scope.get('state', {}), 'batch_operation': True},
+    }
+    for key in ('path_params', 'endpoint', 'route'):
+        scope.pop(key, None)
+
+    received = False
+    response = {'status': status.HTTP_500_INTERNAL_SERVER_ERROR, 'body': b''}
+
+    async def receive() -> Dict:
+        nonlocal received
+        if received:
+            return {'type': 'http.disconnect'}
+        received = True
+        return {'type': 'http.request', 'body': content, 'more_body': False}
+
+    async def send(message: Dict) -> None:
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['body'] += message.get('body', b'')
+
+    await request.app.router(scope, receive, send)
+    return {
+        'status': response['status'],
+        'body': json.loads(response['body']) if response['body'] else None,
+    }
+
+
+async def run_operation(
+    request: Request, operation, results: List[Dict]
+) -> Dict:
+    try:
+        path = resolve_path(operation.path, results)
+        body = resolve(operation.body, results)
+    except BatchReferenceError as exc:
+        return {
+            'status': status.HTTP_400_BAD_REQUEST,
+            'body': {'detail': f'Referência inválida: {exc}'},
+        }
+
+    if not allowed(path):
+        return {
+            'status': status.HTTP_400_BAD_REQUEST,
+            'body': {'detail': 'Operação não permitida em lote'},
+        }
+
+    try:
+        return await dispatch(request, operation.method.value, path, body)
+    except Exception:
+        logger.exception(
+            'Falha na operação %s %s do lote', operation.method.value, path
+        )
+        return {
+            'status': status.HTTP_500_INTERNAL_SERVER_ERROR,
+            'body': {'detail': 'Erro interno'},
+        }
+
+
+async def execute_batch(
+    request: Request, engine: AsyncEngine, operations: List, atomic: bool
+) -> Dict:
+    results: List[Dict] = []
+    failed = False
+    async with BatchSession(
+        engine, expire_on_commit=False, atomic=atomic
+    ) as session:
+        token = database.current_session.set(session)
+        try:
+            for operation in operations:
+                if failed:
+                    results.append({
+                        'status': status.HTTP_424_FAILED_DEPENDENCY,
+                        'body': {'detail': 'Operação não executada'},
+                    })
+                    continue
+
+                result = await run_operation(request, operation, results)
+                results.append(result)
+                if result['status'] >= status.HTTP_300_MULTIPLE_CHOICES:
+                    await session.discard()
+                    failed = atomic
+        finally:
+            database.current_session.reset(token)
+
+        if failed:
+            await session.discard()
+        else:
+            await session.finish()
+
+    return {'results': results, 'committed': not failed}
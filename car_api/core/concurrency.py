@@ -0,0 +1,123 @@
+import math
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from car_api.core.metrics import CONCURRENCY_IN_FLIGHT, CONCURRENCY_LIMIT
+from car_api.core.settings import get_settings
+
+PRIORITY_SHARES = {'high': 1.0, 'medium': 0.9, 'low': 0.75}
+READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 2,
+        max_limit: int = 200,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        rtt_window: float = 30.0,
+        retry_after: int = 1,
+        priorities: Optional[Dict[str, str]] = None,
+    ):
+        self.initial_limit = float(initial_limit)
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.rtt_window = rtt_window
+        self.retry_after = retry_after
+        self.priorities = priorities or {}
+        self.in_flight = 0
+        self.latency: Dict[str, float] = {}
+        self.samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self.last_decrease = -math.inf
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    def priority(self, route: str, methods: Iterable[str]) -> str:
+        if route in self.priorities:
+            return self.priorities[route]
+        return 'medium' if set(methods) <= READ_METHODS else 'high'
+
+    def capacity(self, priority: str) -> int:
+        return max(1, int(self.limit * PRIORITY_SHARES[priority]))
+
+    def try_acquire(self, priority: str) -> bool:
+        if self.in_flight >= self.capacity(priority):
+            return False
+        self.in_flight += 1
+        CONCURRENCY_IN_FLIGHT.set(self.in_flight)
+        return True
+
+    def baseline(self, route: str) -> float:
+        return self.samples[route][0][1]
+
+    def observe(self, route: str, latency: float, now: float) -> float:
+        samples = self.samples.setdefault(route, deque())
+        while samples and samples[-1][1] >= latency:
+            samples.pop()
+        samples.append((now, latency))
+        while samples[0][0] < now - self.rtt_window:
+            samples.popleft()
+
+        average = self.latency.get(route, latency)
+        average += self.smoothing * (latency - average)
+        self.latency[route] = average
+        return max(0.5, min(1.0, self.tolerance * samples[0][1] / average))
+
+    def release(
+        self, route: str, latency: float, now: float, failed: bool = False
+    ) -> None:
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        CONCURRENCY_IN_FLIGHT.set(self.in_flight)
+
+        gradient = self.observe(route, latency, now)
+        saturated = in_flight >= self.capacity('low')
+        if saturated and (failed or gradient < 1.0):
+            self.decrease(
+                now, self.latency[route], self.backoff if failed else gradient
+            )
+        elif not failed and gradient == 1.0 and in_flight * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        elif self.limit < self.initial_limit:
+            self.limit = min(self.initial_limit, self.limit + 1 / self.limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    def decrease(self, now: float, window: float, factor: float) -> None:
+        if now - self.last_decrease < window:
+            return
+        self.last_decrease = now
+        self.limit = max(self.min_limit, self.limit * factor)
+
+    def rejection(self) -> JSONResponse:
+        return JSONResponse(
+            {'detail': 'Servidor sobrecarregado, tente novamente'},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': str(self.retry_after)},
+        )
+
+
+@lru_cache
+def get_concurrency_limiter() -> Optional[AdaptiveLimiter]:
+    settings = get_settings()
+    if not settings.CONCURRENCY_LIMIT_ENABLED:
+        return None
+    return AdaptiveLimiter(
+        initial_limit=settings.CONCURRENCY_INITIAL_LIMIT,
+        min_limit=settings.CONCURRENCY_MIN_LIMIT,
+        max_limit=settings.CONCURRENCY_MAX_LIMIT,
+        backoff=settings.CONCURRENCY_BACKOFF,
+        tolerance=settings.CONCURRENCY_LATENCY_TOLERANCE,
+        rtt_window=settings.CONCURRENCY_RTT_WINDOW,
+        retry_after=settings.CONCURRENCY_RETRY_AFTER,
+        priorities=settings.CONCURRENCY_PRIORITIES,
+    )
@@ -1,10 +1,56 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Optional
 
-from car_api.core.settings import Settings
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 
-engine = create_async_engine(Settings().DATABASE_URL)
+from car_api.core.settings import get_settings
+from car_api.core.tracing import traced
 
 
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return create_async_engine(get_settings().DATABASE_URL)
+
+
+def __getattr__(name: str):
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+current_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+    'current_session', default=None
+)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    session.info.setdefault('after_commit', []).append(callback)
+
+
+@event.listens_for(Session, 'after_commit')
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop('after_commit', []):
+        callback()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop('after_commit', None)
+
+
+@traced
 async def get_session():
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+    session = current_session.get()
+    if session is not None:
+        yield session
+        return
+
+    async with AsyncSession(get_engine(), expire_on_commit=False) as session:
         yield session
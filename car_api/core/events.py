@@ -0,0 +1,103 @@
+import asyncio
+import itertools
+import json
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional, Set
+
+from car_api.core.metrics import EVENT_SUBSCRIBERS, EVENTS_DROPPED
+from car_api.core.settings import get_settings
+
+KEEPALIVE_FRAME = b': keepalive\n\n'
+
+
+class Subscription:
+    def __init__(self, owner_id: int, queue_size: int):
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.dropped = 0
+
+    def push(self, frame: Optional[bytes]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            EVENTS_DROPPED.inc()
+        self.queue.put_nowait(frame)
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = 100, keepalive: float = 15.0):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self.subscribers: Dict[int, Set[Subscription]] = {}
+        self.sequence = itertools.count(1)
+
+    def has_subscribers(self, owner_id: int) -> bool:
+        return owner_id in self.subscribers
+
+    def subscribe(self, owner_id: int) -> Subscription:
+        subscription = Subscription(owner_id, self.queue_size)
+        self.subscribers.setdefault(owner_id, set()).add(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self.subscribers.get(subscription.owner_id)
+        if not subscriptions or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self.subscribers[subscription.owner_id]
+        EVENT_SUBSCRIBERS.dec()
+
+    def publish(self, owner_id: int, event: str, data: str) -> None:
+        subscriptions = self.subscribers.get(owner_id)
+        if not subscriptions:
+            return
+        frame = (
+            f'id: {next(self.sequence)}\nevent: {event}\ndata: {data}\n\n'
+        ).encode()
+        for subscription in subscriptions:
+            subscription.push(frame)
+
+    def close(self) -> None:
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                subscription.push(None)
+
+    async def stream(self, owner_id: int) -> AsyncIterator[bytes]:
+        subscription = self.subscribe(owner_id)
+        try:
+            yield b': connected\n\n'
+            while True:
+                try:
+                    async with asyncio.timeout(self.keepalive):
+                        frame = await subscription.queue.get()
+                except TimeoutError:
+                    yield KEEPALIVE_FRAME
+                    continue
+                if subscription.dropped:
+                    data = json.dumps({'dropped': subscription.dropped})
+                    subscription.dropped = 0
+                    yield f'event: lagged\ndata: {data}\n\n'.encode()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+
+def publish(session, owner_id: int, event: str, data: str) -> None:
+    pending = session.info.get('pending_events')
+    if pending is not None:
+        pending.append((owner_id, event, data))
+        return
+    get_event_broker().publish(owner_id, event, data)
+
+
+@lru_cache
+def get_event_broker() -> EventBroker:
+    settings = get_settings()
+    return EventBroker(
+        queue_size=settings.EVENTS_QUEUE_SIZE,
+        keepalive=settings.EVENTS_KEEPALIVE_SECONDS,
+    )
@@ -0,0 +1,337 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from car_api.core import database, rate_limit
+from car_api.core.metrics import IDEMPOTENT_REPLAYS
+from car_api.core.settings import get_settings
+from car_api.models.idempotency import IdempotencyRecord
+
+HEADER = 'idempotency-key'
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: Optional[str]
+    expires_at: float
+
+    def response(self) -> Response:
+        return Response(
+            self.body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers={'Idempotent-Replayed': 'true'},
+        )
+
+
+def mismatch() -> IdempotencyConflict:
+    return IdempotencyConflict(
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        'Idempotency-Key já usada com outro conteúdo',
+    )
+
+
+def in_progress() -> IdempotencyConflict:
+    return IdempotencyConflict(
+        status.HTTP_409_CONFLICT,
+        'Requisição com esta Idempotency-Key em processamento',
+    )
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        routes: Iterable[str] = (),
+        ttl: float = 86400.0,
+        wait_timeout: float = 10.0,
+        sweep_interval: float = 60.0,
+        lock_timeout: float = 60.0,
+    ):
+        self.routes = set(routes)
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.sweep_interval = sweep_interval
+        self.lock_timeout = lock_timeout
+        self.next_sweep = 0.0
+
+    def due(self, now: float) -> bool:
+        if now < self.next_sweep:
+            return False
+        self.next_sweep = now + self.sweep_interval
+        return True
+
+
+class MemoryStore(IdempotencyStore):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.responses: Dict[str, StoredResponse] = {}
+        self.pending: Dict[str, Tuple[str, asyncio.Event]] = {}
+
+    def sweep(self, now: float) -> None:
+        if not self.due(now):
+            return
+        self.responses = {
+            key: stored
+            for key, stored in self.responses.items()
+            if stored.expires_at > now
+        }
+
+    async def acquire(
+        self, key: str, fingerprint: str
+    ) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            now = time.time()
+            self.sweep(now)
+            stored = self.responses.get(key)
+            if stored and stored.expires_at > now:
+                if stored.fingerprint != fingerprint:
+                    raise mismatch()
+                return stored
+
+            if key not in self.pending:
+                self.pending[key] = (fingerprint, asyncio.Event())
+                return None
+
+            pending_fingerprint, done = self.pending[key]
+            if pending_fingerprint != fingerprint:
+                raise mismatch()
+            try:
+                async with asyncio.timeout(deadline - time.monotonic()):
+                    await done.wait()
+            except TimeoutError:
+                raise in_progress()
+
+    async def save(
+        self,
+        key: str,
+        fingerprint: str,
+        status_code: int,
+        body: bytes,
+        media_type: Optional[str],
+    ) -> None:
+        self.responses[key] = StoredResponse(
+            fingerprint=fingerprint,
+            status_code=status_code,
+            body=body,
+            media_type=media_type,
+            expires_at=time.time() + self.ttl,
+        )
+
+    async def release(self, key: str) -> None:
+        pending = self.pending.pop(key, None)
+        if pending:
+            pending[1].set()
+
+
+class DatabaseStore(IdempotencyStore):
+    def __init__(self, *args, poll_interval: float = 0.05, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.poll_interval = poll_interval
+
+    async def sweep(self, conn: AsyncConnection, now: float) -> None:
+        if self.due(now):
+            await conn.execute(
+                delete(IdempotencyRecord).where(
+                    IdempotencyRecord.expires_at <= now
+                )
+            )
+
+    async def claim(
+        self, conn: AsyncConnection, key: str, fingerprint: str, now: float
+    ) -> bool:
+        table = IdempotencyRecord.__table__
+        values = {
+            'fingerprint': fingerprint,
+            'status_code': None,
+            'body': None,
+            'media_type': None,
+            'expires_at': now + self.lock_timeout,
+        }
+        statement = rate_limit.UPSERTS[conn.dialect.name](table).values(
+            key=key, **values
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_=values,
+            where=table.c.expires_at <= now,
+        ).returning(table.c.key)
+        return (await conn.execute(statement)).scalar_one_or_none() is not None
+
+    async def acquire(
+        self, key: str, fingerprint: str
+    ) -> Optional[StoredResponse]:
+        engine = database.get_engine()
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            now = time.time()
+            async with engine.begin() as conn:
+                await self.sweep(conn, now)
+                if await self.claim(conn, key, fingerprint, now):
+                    return None
+                record = (
+                    await conn.execute(
+                        select(IdempotencyRecord.__table__).where(
+                            IdempotencyRecord.key == key
+                        )
+                    )
+                ).one_or_none()
+
+            if record is None:
+                continue
+            if record.fingerprint != fingerprint:
+                raise mismatch()
+            if record.status_code is not None:
+                return StoredResponse(
+                    fingerprint=record.fingerprint,
+                    status_code=record.status_code,
+                    body=record.body,
+                    media_type=record.media_type,
+                    expires_at=record.expires_at,
+                )
+            if time.monotonic() >= deadline:
+                raise in_progress()
+            await asyncio.sleep(self.poll_interval)
+
+    async def save(
+        self,
+        key: str,
+        fingerprint: str,
+        status_code: int,
+        body: bytes,
+        media_type: Optional[str],
+    ) -> None:
+        async with database.get_engine().begin() as conn:
+            await conn.execute(
+                update(IdempotencyRecord)
+                .where(
+                    IdempotencyRecord.key == key,
+                    IdempotencyRecord.fingerprint == fingerprint,
+                )
+                .values(
+                    status_code=status_code,
+                    body=body,
+                    media_type=media_type,
+                    expires_at=time.time() + self.ttl,
+                )
+            )
+
+    async def release(self, key: str) -> None:  # noqa: PLR6301
+        async with database.get_engine().begin() as conn:
+            await conn.execute(
+                delete(IdempotencyRecord).where(
+                    IdempotencyRecord.key == key,
+                    IdempotencyRecord.status_code.is_(None),
+                )
+            )
+
+
+STORES = {'memory': MemoryStore, 'database': DatabaseStore}
+
+
+class Guard:
+    def __init__(
+        self,
+        store: Optional[IdempotencyStore] = None,
+        key: str = '',
+        fingerprint: str = '',
+        response: Optional[Response] = None,
+    ):
+        self.store = store
+        self.key = key
+        self.fingerprint = fingerprint
+        self.response = response
+
+    async def save(self, response: Response) -> None:
+        if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            return
+        await self.store.save(
+            self.key,
+            self.fingerprint,
+            response.status_code,
+            bytes(response.body),
+            response.headers.get('content-type'),
+        )
+
+    async def save_error(self, exc: HTTPException) -> None:
+        await self.save(JSONResponse({'detail': exc.detail}, exc.status_code))
+
+    async def release(self) -> None:
+        if self.store:
+            await self.store.release(self.key)
+
+
+async def run(
+    guard: Optional[Guard], handler: Callable, request: Request
+) -> Response:
+    if guard is None:
+        return await handler(request)
+    try:
+        response = await handler(request)
+        await guard.save(response)
+        return response
+    except HTTPException as exc:
+        await guard.save_error(exc)
+        raise
+    finally:
+        await guard.release()
+
+
+def conflict(status_code: int, detail: str) -> Guard:
+    return Guard(response=JSONResponse({'detail': detail}, status_code))
+
+
+async def guard(route: str, request: Request) -> Optional[Guard]:
+    store = get_idempotency_store()
+    value = request.headers.get(HEADER)
+    if store is None or route not in store.routes or value is None:
+        return None
+    if not value or len(value) > MAX_KEY_LENGTH:
+        return conflict(
+            status.HTTP_400_BAD_REQUEST, 'Idempotency-Key inválida'
+        )
+
+    key = f'{route}:{rate_limit.client_identity(request)}:{value}'
+    fingerprint = hashlib.sha256(await request.body()).hexdigest()
+    try:
+        stored = await store.acquire(key, fingerprint)
+    except IdempotencyConflict as exc:
+        return conflict(exc.status_code, exc.detail)
+
+    if stored:
+        IDEMPOTENT_REPLAYS.inc(route)
+        return Guard(response=stored.response())
+    return Guard(store, key, fingerprint)
+
+
+@lru_cache
+def get_idempotency_store() -> Optional[IdempotencyStore]:
+    settings = get_settings()
+    if not settings.IDEMPOTENCY_ENABLED:
+        return None
+    return STORES[settings.IDEMPOTENCY_STORE or 'memory'](
+        routes=settings.IDEMPOTENCY_ROUTES,
+        ttl=settings.IDEMPOTENCY_TTL,
+        wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT,
+        sweep_interval=settings.IDEMPOTENCY_SWEEP_INTERVAL,
+        lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+    )
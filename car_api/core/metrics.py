@@ -0,0 +1,474 @@
+import asyncio
+import json
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from copy import copy
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+    return f'{{{pairs}}}'
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+    def snapshot(self) -> List[list]:
+        return [[list(key), value] for key, value in self.values.items()]
+
+    def merge(self, series: List[list]) -> None:
+        raise NotImplementedError
+
+    def empty(self) -> 'Metric':
+        clone = copy(self)
+        clone.values = {}
+        return clone
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ):
+        super().__init__(name, documentation, labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self.values.get(labels, 0.0)
+
+    def merge(self, series: List[list]) -> None:
+        for labels, value in series:
+            self.inc(*labels, amount=value)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f'{self.name}{_format_labels(self.labels, key)} '
+            f'{_format_value(value)}'
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        aggregate: str = 'sum',
+    ):
+        super().__init__(name, documentation, labels)
+        self.aggregate = aggregate
+
+    def merge(self, series: List[list]) -> None:
+        if self.aggregate == 'sum':
+            super().merge(series)
+            return
+        for labels, value in series:
+            key = tuple(labels)
+            self.values[key] = max(self.values.get(key, value), value)
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        self.values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - started, *labels)
+
+    def count(self, *labels: str) -> int:
+        series = self.values.get(labels)
+        return series[2] if series else 0
+
+    def snapshot(self) -> List[list]:
+        return [
+            [list(key), [list(buckets), total, count]]
+            for key, (buckets, total, count) in self.values.items()
+        ]
+
+    def merge(self, series: List[list]) -> None:
+        for labels, (buckets, total, count) in series:
+            current = self.values.setdefault(
+                tuple(labels), [[0] * len(self.buckets), 0.0, 0]
+            )
+            current[0] = [a + b for a, b in zip(current[0], buckets)]
+            current[1] += total
+            current[2] += count
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        label_names = (*self.labels, 'le')
+        for key, (buckets, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, buckets):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    label_names, (*key, _format_value(bound))
+                )
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            lines.extend([
+                f'{self.name}_bucket'
+                f'{_format_labels(label_names, (*key, "+Inf"))} {count}',
+                f'{self.name}_sum{_format_labels(self.labels, key)} '
+                f'{_format_value(total)}',
+                f'{self.name}_count{_format_labels(self.labels, key)} {count}',
+            ])
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, List[list]]:
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+    def aggregate(self, directory: str) -> 'Registry':
+        merged = Registry()
+        for metric in self.metrics:
+            merged.register(metric.empty())
+        by_name = {metric.name: metric for metric in merged.metrics}
+        for path in sorted(Path(directory).glob('*.json')):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, series in snapshot.items():
+                if name in by_name:
+                    by_name[name].merge(series)
+        return merged
+
+    def retire(self, directory: str, pid: int) -> None:
+        path = Path(directory) / f'{pid}.json'
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        gauges = {
+            metric.name for metric in self.metrics if isinstance(metric, Gauge)
+        }
+        write_snapshot(
+            directory,
+            {
+                name: series
+                for name, series in snapshot.items()
+                if name not in gauges
+            },
+            pid,
+        )
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(
+    Counter(
+        'http_requests_total',
+        'Total de requisições HTTP por rota.',
+        ('route', 'method', 'status'),
+    )
+)
+REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        'http_request_duration_seconds',
+        'Latência das requisições HTTP por rota.',
+        ('route',),
+    )
+)
+REQUESTS_IN_PROGRESS = REGISTRY.register(
+    Gauge(
+        'http_requests_in_progress',
+        'Requisições HTTP em andamento por rota.',
+        ('route',),
+    )
+)
+DB_STATEMENTS = REGISTRY.register(
+    Counter(
+        'db_statements_total',
+        'Total de statements SQL executados por rota.',
+        ('route',),
+    )
+)
+DB_STATEMENT_DURATION = REGISTRY.register(
+    Histogram(
+        'db_statement_duration_seconds',
+        'Duração de cada statement SQL por rota.',
+        ('route',),
+    )
+)
+DB_STATEMENTS_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        'db_statements_per_request',
+        'Statements SQL executados por requisição.',
+        ('route',),
+        buckets=COUNT_BUCKETS,
+    )
+)
+DB_TIME_PER_REQUEST = REGISTRY.register(
+    Histogram(
+        'db_time_per_request_seconds',
+        'Tempo total em SQL por requisição.',
+        ('route',),
+    )
+)
+PASSWORD_HASH_DURATION = REGISTRY.register(
+    Histogram(
+        'password_hash_duration_seconds',
+        'Tempo gasto com argon2 (hash e verificação).',
+        ('operation',),
+    )
+)
+JWT_VERIFY_DURATION = REGISTRY.register(
+    Histogram(
+        'jwt_verify_duration_seconds',
+        'Tempo gasto na verificação de tokens JWT.',
+    )
+)
+EVENT_LOOP_LAG = REGISTRY.register(
+    Gauge(
+        'event_loop_lag_seconds',
+        'Atraso observado no event loop na última medição.',
+        aggregate='max',
+    )
+)
+EVENT_LOOP_LAG_DURATION = REGISTRY.register(
+    Histogram(
+        'event_loop_lag_duration_seconds',
+        'Distribuição do atraso do event loop.',
+    )
+)
+CONCURRENCY_LIMIT = REGISTRY.register(
+    Gauge(
+        'concurrency_limit',
+        'Limite adaptativo de requisições concorrentes.',
+    )
+)
+CONCURRENCY_IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        'concurrency_in_flight',
+        'Requisições em andamento sob o limite adaptativo.',
+    )
+)
+REQUESTS_SHED = REGISTRY.register(
+    Counter(
+        'http_requests_shed_total',
+        'Requisições rejeitadas pelo limite de concorrência.',
+        ('route', 'priority'),
+    )
+)
+RATE_LIMITED = REGISTRY.register(
+    Counter(
+        'http_requests_rate_limited_total',
+        'Requisições rejeitadas pelo rate limit.',
+        ('route',),
+    )
+)
+IDEMPOTENT_REPLAYS = REGISTRY.register(
+    Counter(
+        'http_requests_idempotent_replays_total',
+        'Respostas reenviadas a partir da Idempotency-Key.',
+        ('route',),
+    )
+)
+SUGGEST_ENTRIES = REGISTRY.register(
+    Gauge(
+        'suggest_index_entries',
+        'Registros no índice de autocompletar.',
+        ('index',),
+    )
+)
+EVENT_SUBSCRIBERS = REGISTRY.register(
+    Gauge(
+        'event_subscribers',
+        'Conexões abertas no stream de eventos de carros.',
+    )
+)
+EVENTS_DROPPED = REGISTRY.register(
+    Counter(
+        'events_dropped_total',
+        'Eventos descartados por assinantes lentos.',
+    )
+)
+
+
+@dataclass
+class RequestStats:
+    route: str
+    started: float = 0.0
+    statements: int = 0
+    db_time: float = 0.0
+    token: Optional[Token] = None
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    'current_request', default=None
+)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    context._metrics_started = perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    elapsed = perf_counter() - context._metrics_started
+    stats = current_request.get()
+    route = stats.route if stats else 'none'
+
+    DB_STATEMENTS.inc(route)
+    DB_STATEMENT_DURATION.observe(elapsed, route)
+
+    if stats:
+        stats.statements += 1
+        stats.db_time += elapsed
+
+
+def start_request(route: str) -> RequestStats:
+    stats = RequestStats(route, started=perf_counter())
+    stats.token = current_request.set(stats)
+    REQUESTS_IN_PROGRESS.inc(route)
+    return stats
+
+
+def finish_request(stats: RequestStats, method: str, status_code: int) -> None:
+    route = stats.route
+    REQUEST_DURATION.observe(perf_counter() - stats.started, route)
+    REQUESTS_IN_PROGRESS.dec(route)
+    REQUESTS.inc(route, method, str(status_code))
+    DB_STATEMENTS_PER_REQUEST.observe(stats.statements, route)
+    DB_TIME_PER_REQUEST.observe(stats.db_time, route)
+    current_request.reset(stats.token)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_DURATION.observe(lag)
+
+
+def write_snapshot(
+    directory: str, snapshot: Dict[str, Any], pid: Optional[int] = None
+) -> None:
+    path = Path(directory) / f'{pid or os.getpid()}.json'
+    partial = path.with_suffix('.tmp')
+    partial.write_text(json.dumps(snapshot))
+    partial.replace(path)
+
+
+def render(directory: str = '') -> str:
+    if not directory:
+        return REGISTRY.render()
+    write_snapshot(directory, REGISTRY.snapshot())
+    return REGISTRY.aggregate(directory).render()
+
+
+async def flush_periodically(directory: str, interval: float = 1.0) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(write_snapshot, directory, REGISTRY.snapshot())
@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+from typing import Callable, Dict
+
+from fastapi import FastAPI
+
+
+def prebuilt_openapi(app: FastAPI, path: str) -> Callable[[], Dict]:
+    def openapi() -> Dict:
+        if app.openapi_schema is None:
+            app.openapi_schema = json.loads(Path(path).read_bytes())
+        return app.openapi_schema
+
+    return openapi
+
+
+def export_openapi(app: FastAPI, path: str) -> None:
+    Path(path).write_text(
+        json.dumps(app.openapi(), ensure_ascii=False, separators=(',', ':')),
+        encoding='utf-8',
+    )
+
+
+def main() -> None:
+    from car_api.app import app  # noqa: PLC0415
+    from car_api.core.settings import get_settings  # noqa: PLC0415
+
+    export_openapi(app, get_settings().OPENAPI_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import math
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from car_api.core import database
+from car_api.core.settings import get_settings
+
+QUANTILES = {'p10': 0.1, 'p50': 0.5, 'p90': 0.9}
+
+
+def bin_edges(low: float, high: float, bins: int) -> List[float]:
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    return [low + width * index for index in range(bins)] + [high]
+
+
+def histogram(values: Sequence[float], edges: Sequence[float]) -> List[int]:
+    positions = [bisect_left(values, edge) for edge in edges[:-1]]
+    positions.append(bisect_right(values, edges[-1]))
+    return [end - start for start, end in zip(positions, positions[1:])]
+
+
+def quantile(values: Sequence[float], q: float) -> float:
+    position = (len(values) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(
+    values: Sequence[float], edges: Sequence[float]
+) -> Dict[str, Any]:
+    if not values:
+        return {
+            'count': 0,
+            'min': None,
+            'max': None,
+            **dict.fromkeys(QUANTILES),
+            'histogram': [0] * max(len(edges) - 1, 0),
+        }
+    return {
+        'count': len(values),
+        'min': values[0],
+        'max': values[-1],
+        **{
+            name: round(quantile(values, q), 2)
+            for name, q in QUANTILES.items()
+        },
+        'histogram': histogram(values, edges),
+    }
+
+
+def group_bounds(keys: Sequence[Hashable]) -> List[Tuple[int, int]]:
+    bounds = []
+    start = 0
+    while start < len(keys):
+        end = bisect_right(keys, keys[start], lo=start)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def distribution(rows: Sequence[Sequence], bins: int) -> Dict[str, Any]:
+    brand_ids, model_years, prices = tuple(zip(*rows)) or ((), (), ())
+    ordered = sorted(prices)
+    edges = bin_edges(ordered[0], ordered[-1], bins) if ordered else []
+    groups = [
+        {
+            'brand_id': brand_ids[start],
+            'model_year': model_years[start],
+            **summarize(prices[start:end], edges),
+        }
+        for start, end in group_bounds(list(zip(brand_ids, model_years)))
+    ]
+    return {
+        'edges': edges,
+        'overall': summarize(ordered, edges),
+        'groups': groups,
+    }
+
+
+class PriceDistributionCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.generations: Dict[int, int] = defaultdict(int)
+
+    def key(self, owner_id: int, params: Hashable) -> Hashable:
+        return owner_id, self.generations[owner_id], params
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, content = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return content
+
+    def set(self, key: Hashable, content: Dict) -> None:
+        self.entries[key] = (time.monotonic() + self.ttl, content)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, owner_id: int) -> None:
+        self.generations[owner_id] += 1
+
+    def invalidate_on_commit(self, db: AsyncSession, owner_id: int) -> None:
+        database.after_commit(db, lambda: self.invalidate(owner_id))
+
+
+@lru_cache
+def get_price_distribution_cache() -> PriceDistributionCache:
+    settings = get_settings()
+    return PriceDistributionCache(
+        settings.PRICE_DISTRIBUTION_CACHE_SIZE,
+        settings.PRICE_DISTRIBUTION_CACHE_TTL,
+    )
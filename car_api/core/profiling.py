@@ -0,0 +1,184 @@
+import asyncio
+import json
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = 'x-profile'
+MEMORY_HEADER = 'x-profile-memory'
+PROFILE_ID_HEADER = b'x-profile-id'
+
+FrameKey = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: List[Tuple[FrameKey, ...]] = []
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def sample(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, frame.f_lineno))
+                frame = frame.f_back
+            self.samples.append(tuple(reversed(stack)))
+
+    def to_speedscope(self, name: str) -> Dict:
+        frames: List[Dict] = []
+        indexes: Dict[FrameKey, int] = {}
+        samples = []
+        for stack in self.samples:
+            sample = []
+            for key in stack:
+                if key not in indexes:
+                    indexes[key] = len(frames)
+                    frames.append({
+                        'name': key[0],
+                        'file': key[1],
+                        'line': key[2],
+                    })
+                sample.append(indexes[key])
+            samples.append(sample)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'car_api',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': name,
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': self.elapsed,
+                    'samples': samples,
+                    'weights': [self.interval] * len(samples),
+                }
+            ],
+        }
+
+
+def allocation_top(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict]:
+    return [
+        {
+            'file': stat.traceback[0].filename,
+            'line': stat.traceback[0].lineno,
+            'size_bytes': stat.size,
+            'count': stat.count,
+        }
+        for stat in snapshot.statistics('lineno')[:limit]
+    ]
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str,
+        output_dir: str = 'profiles',
+        interval: float = 0.001,
+        memory_top: int = 20,
+    ):
+        self.app = app
+        self.token = token.encode()
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.memory_top = memory_top
+
+    def requested(self, headers: Headers) -> bool:
+        value = headers.get(PROFILE_HEADER)
+        return value is not None and secrets.compare_digest(
+            value.encode('latin-1'), self.token
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not self.requested(headers):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        trace_memory = (
+            headers.get(MEMORY_HEADER) == '1' and not tracemalloc.is_tracing()
+        )
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                message.setdefault('headers', [])
+                message['headers'].append((
+                    PROFILE_ID_HEADER,
+                    profile_id.encode(),
+                ))
+            await send(message)
+
+        if trace_memory:
+            tracemalloc.start()
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            snapshot = None
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+            await asyncio.to_thread(
+                self.store, profile_id, scope, profiler, snapshot
+            )
+
+    def store(
+        self,
+        profile_id: str,
+        scope: Scope,
+        profiler: SamplingProfiler,
+        snapshot: Optional[tracemalloc.Snapshot],
+    ) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = f'{scope["method"]} {scope["path"]}'
+
+        profile_path = self.output_dir / f'{profile_id}.speedscope.json'
+        profile_path.write_text(
+            json.dumps(profiler.to_speedscope(name)), encoding='utf-8'
+        )
+
+        if snapshot is not None:
+            memory_path = self.output_dir / f'{profile_id}.memory.json'
+            memory_path.write_text(
+                json.dumps({
+                    'name': name,
+                    'top': allocation_top(snapshot, self.memory_top),
+                }),
+                encoding='utf-8',
+            )
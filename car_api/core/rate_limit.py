@@ -0,0 +1,232 @@
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from car_api.core import batch, database
+from car_api.core.metrics import RATE_LIMITED
+from car_api.core.security import verify_token
+from car_api.core.settings import get_settings
+from car_api.models.rate_limits import RateLimitState
+
+PERIODS = {'second': 1.0, 'minute': 60.0, 'hour': 3600.0, 'day': 86400.0}
+UPSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: int
+    period: float
+    burst: int
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.rate
+
+    @property
+    def tolerance(self) -> float:
+        return self.interval * self.burst
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            'RateLimit-Limit': str(self.limit),
+            'RateLimit-Remaining': str(self.remaining),
+            'RateLimit-Reset': str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(math.ceil(self.retry_after))
+        return headers
+
+
+def parse_rate_limit(value: str) -> Optional[RateLimit]:
+    if not value:
+        return None
+    rate, _, rest = value.partition('/')
+    period, _, burst = rest.partition(':')
+    if period not in PERIODS:
+        raise ValueError(f'Período inválido: {value}')
+    return RateLimit(int(rate), PERIODS[period], int(burst or rate))
+
+
+def gcra(
+    limit: RateLimit, tat: Optional[float], now: float
+) -> Tuple[Decision, Optional[float]]:
+    start = now if tat is None else max(tat, now)
+    new_tat = start + limit.interval
+    delay = new_tat - now
+    if delay > limit.tolerance:
+        return (
+            Decision(
+                allowed=False,
+                limit=limit.burst,
+                remaining=0,
+                reset_after=start - now,
+                retry_after=delay - limit.tolerance,
+            ),
+            tat,
+        )
+    remaining = int((limit.tolerance - delay) / limit.interval + 1e-9)
+    return (
+        Decision(
+            allowed=True,
+            limit=limit.burst,
+            remaining=remaining,
+            reset_after=delay,
+        ),
+        new_tat,
+    )
+
+
+class MemoryStore:
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        self.tats: Dict[str, float] = {}
+        self.next_sweep = 0.0
+
+    def sweep(self, now: float) -> None:
+        if now < self.next_sweep:
+            return
+        self.next_sweep = now + self.sweep_interval
+        self.tats = {key: tat for key, tat in self.tats.items() if tat > now}
+
+    async def hit(self, key: str, limit: RateLimit, now: float) -> Decision:
+        self.sweep(now)
+        decision, tat = gcra(limit, self.tats.get(key), now)
+        if decision.allowed:
+            self.tats[key] = tat
+        return decision
+
+
+class DatabaseStore:
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        self.next_sweep = 0.0
+
+    async def sweep(self, conn: AsyncConnection, now: float) -> None:
+        if now < self.next_sweep:
+            return
+        self.next_sweep = now + self.sweep_interval
+        await conn.execute(
+            delete(RateLimitState).where(RateLimitState.tat <= now)
+        )
+
+    async def hit(self, key: str, limit: RateLimit, now: float) -> Decision:
+        engine = database.get_engine()
+        table = RateLimitState.__table__
+        new_tat = (
+            case((table.c.tat > now, table.c.tat), else_=now) + limit.interval
+        )
+        statement = UPSERTS[engine.dialect.name](table).values(
+            key=key, tat=now + limit.interval
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={'tat': new_tat},
+            where=new_tat - now <= limit.tolerance,
+        ).returning(table.c.tat)
+
+        async with engine.begin() as conn:
+            await self.sweep(conn, now)
+            tat = (await conn.execute(statement)).scalar_one_or_none()
+            if tat is None:
+                stored = await conn.scalar(
+                    select(table.c.tat).where(table.c.key == key)
+                )
+                return gcra(limit, stored, now)[0]
+        return gcra(limit, tat - limit.interval, now)[0]
+
+
+STORES = {'memory': MemoryStore, 'database': DatabaseStore}
+
+
+def client_identity(request: Request) -> str:
+    payload = getattr(request.state, 'token_payload', None)
+    if payload:
+        return f'user:{payload["sub"]}'
+    scheme, _, token = request.headers.get('authorization', '').partition(' ')
+    if scheme.lower() == 'bearer' and token:
+        try:
+            payload = verify_token(token)
+        except HTTPException:
+            payload = {}
+        if payload.get('sub'):
+            request.state.token_payload = payload
+            return f'user:{payload["sub"]}'
+    host = request.client.host if request.client else 'unknown'
+    return f'ip:{host}'
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        store,
+        default: Optional[RateLimit] = None,
+        routes: Optional[Dict[str, Optional[RateLimit]]] = None,
+    ):
+        self.store = store
+        self.default = default
+        self.routes = routes or {}
+
+    def limit_for(self, route: str) -> Optional[RateLimit]:
+        return self.routes.get(route, self.default)
+
+    async def check(self, route: str, request: Request) -> Optional[Decision]:
+        if batch.is_operation(request):
+            limit = self.routes.get(route)
+        else:
+            limit = self.limit_for(route)
+        if limit is None:
+            return None
+        key = f'{route}:{client_identity(request)}'
+        decision = await self.store.hit(key, limit, time.time())
+        if not decision.allowed:
+            RATE_LIMITED.inc(route)
+        return decision
+
+
+def rejection(decision: Decision) -> JSONResponse:
+    return JSONResponse(
+        {'detail': 'Limite de requisições excedido'},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers=decision.headers(),
+    )
+
+
+@lru_cache
+def get_rate_limiter() -> Optional[RateLimiter]:
+    settings = get_settings()
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    return RateLimiter(
+        STORES[settings.RATE_LIMIT_STORE or 'memory'](
+            settings.RATE_LIMIT_SWEEP_INTERVAL
+        ),
+        default=parse_rate_limit(settings.RATE_LIMIT_DEFAULT),
+        routes={
+            route: parse_rate_limit(value)
+            for route, value in settings.RATE_LIMIT_ROUTES.items()
+        },
+    )
+
+
+async def check(route: str, request: Request) -> Optional[Decision]:
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return None
+    return await limiter.check(route, request)
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from car_api.core.metrics import EVENT_LOOP_LAG
+from car_api.core.settings import get_settings
+
+
+@dataclass
+class DatabaseCheck:
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: Optional[str] = None
+
+
+def pool_status(engine: AsyncEngine) -> Dict:
+    pool = engine.sync_engine.pool
+    checked_out = pool.checkedout() if hasattr(pool, 'checkedout') else 0
+    capacity = None
+    if hasattr(pool, 'size') and getattr(pool, '_max_overflow', -1) >= 0:
+        capacity = pool.size() + pool._max_overflow
+    return {
+        'checked_out': checked_out,
+        'capacity': capacity,
+        'usage': round(checked_out / capacity, 3) if capacity else None,
+    }
+
+
+class ReadinessProbe:
+    def __init__(
+        self,
+        cache_ttl: float = 1.0,
+        timeout: float = 1.0,
+        max_db_latency_ms: float = 500.0,
+        max_pool_usage: float = 0.9,
+        max_event_loop_lag_ms: float = 200.0,
+    ):
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.max_db_latency_ms = max_db_latency_ms
+        self.max_pool_usage = max_pool_usage
+        self.max_event_loop_lag_ms = max_event_loop_lag_ms
+        self.last_check: Optional[DatabaseCheck] = None
+        self.checking = False
+
+    async def ping(self, engine: AsyncEngine) -> DatabaseCheck:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with engine.connect() as conn:
+                    await conn.execute(text('SELECT 1'))
+        except Exception as exc:
+            return DatabaseCheck(
+                ok=False,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                checked_at=time.monotonic(),
+                error=str(exc) or type(exc).__name__,
+            )
+        return DatabaseCheck(
+            ok=True,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            checked_at=time.monotonic(),
+        )
+
+    async def check_database(
+        self, engine: AsyncEngine
+    ) -> Tuple[DatabaseCheck, bool]:
+        last_check = self.last_check
+        if last_check is not None and (
+            self.checking
+            or time.monotonic() - last_check.checked_at < self.cache_ttl
+        ):
+            return last_check, True
+
+        self.checking = True
+        try:
+            self.last_check = await self.ping(engine)
+        finally:
+            self.checking = False
+        return self.last_check, False
+
+    async def report(self, engine: AsyncEngine) -> Tuple[bool, Dict]:
+        database, cached = await self.check_database(engine)
+        database_ok = (
+            database.ok and database.latency_ms <= self.max_db_latency_ms
+        )
+
+        pool = pool_status(engine)
+        pool_ok = pool['usage'] is None or pool['usage'] < self.max_pool_usage
+
+        lag_ms = EVENT_LOOP_LAG.get() * 1000
+        loop_ok = lag_ms <= self.max_event_loop_lag_ms
+
+        ready = database_ok and pool_ok and loop_ok
+        return ready, {
+            'status': 'ready' if ready else 'unavailable',
+            'checks': {
+                'database': {
+                    'status': 'ok' if database_ok else 'fail',
+                    'latency_ms': round(database.latency_ms, 3),
+                    'cached': cached,
+                    'error': database.error,
+                },
+                'pool': {'status': 'ok' if pool_ok else 'fail', **pool},
+                'event_loop': {
+                    'status': 'ok' if loop_ok else 'fail',
+                    'lag_ms': round(lag_ms, 3),
+                },
+            },
+        }
+
+
+@lru_cache
+def get_readiness_probe() -> ReadinessProbe:
+    settings = get_settings()
+    return ReadinessProbe(
+        cache_ttl=settings.READY_CACHE_TTL,
+        timeout=settings.READY_DB_TIMEOUT,
+        max_db_latency_ms=settings.READY_MAX_DB_LATENCY_MS,
+        max_pool_usage=settings.READY_MAX_POOL_USAGE,
+        max_event_loop_lag_ms=settings.READY_MAX_EVENT_LOOP_LAG_MS,
+    )
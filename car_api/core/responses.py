@@ -0,0 +1,31 @@
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Type
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    media_type = 'application/json'
+
+    def render(self, content: BaseModel) -> bytes:  # noqa: PLR6301
+        return content.__pydantic_serializer__.to_json(content)
+
+
+def model_response(
+    schema: Type[BaseModel],
+    content: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ModelResponse:
+    model = schema.model_validate(content, from_attributes=True)
+    return ModelResponse(model, status_code=status_code, headers=headers)
+
+
+def ordered_batch(
+    ids: List[int], items: Iterable[Any]
+) -> Tuple[List[Optional[Any]], List[int]]:
+    by_id = {item.id: item for item in items}
+    missing = [
+        item_id for item_id in dict.fromkeys(ids) if item_id not in by_id
+    ]
+    return [by_id.get(item_id) for item_id in ids], missing
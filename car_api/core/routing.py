@@ -0,0 +1,93 @@
+from time import perf_counter
+from typing import Optional
+
+from fastapi import Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException
+
+from car_api.core import (
+    batch,
+    concurrency,
+    idempotency,
+    metrics,
+    rate_limit,
+    tracing,
+)
+
+
+def reject(
+    stats: metrics.RequestStats,
+    span: Optional[tracing.Span],
+    request: Request,
+    response: Response,
+    decision: Optional[rate_limit.Decision] = None,
+) -> Response:
+    if decision:
+        response.headers.update(decision.headers())
+    tracing.finish_request_span(span, response.status_code)
+    metrics.finish_request(stats, request.method, response.status_code)
+    return response
+
+
+class InstrumentedRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.name
+        methods = self.methods
+
+        async def instrumented_handler(request: Request) -> Response:
+            stats = metrics.start_request(route)
+            span = tracing.start_request_span(route, request)
+            decision = await rate_limit.check(route, request)
+            if decision and not decision.allowed:
+                return reject(
+                    stats, span, request, rate_limit.rejection(decision)
+                )
+
+            guard = await idempotency.guard(route, request)
+            if guard and guard.response:
+                return reject(stats, span, request, guard.response, decision)
+
+            limiter = (
+                None
+                if batch.is_operation(request)
+                else concurrency.get_concurrency_limiter()
+            )
+            if limiter:
+                priority = limiter.priority(route, methods)
+                if not limiter.try_acquire(priority):
+                    metrics.REQUESTS_SHED.inc(route, priority)
+                    if guard:
+                        await guard.release()
+                    return reject(stats, span, request, limiter.rejection())
+
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            started = perf_counter()
+            try:
+                response = await idempotency.run(guard, handler, request)
+                status_code = response.status_code
+                if decision:
+                    response.headers.update(decision.headers())
+                return response
+            except HTTPException as exc:
+                status_code = exc.status_code
+                if decision:
+                    exc.headers = {**(exc.headers or {}), **decision.headers()}
+                raise
+            except RequestValidationError:
+                status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+                raise
+            finally:
+                if limiter:
+                    finished = perf_counter()
+                    limiter.release(
+                        route,
+                        finished - started,
+                        finished,
+                        failed=status_code >= 500,
+                    )
+                tracing.finish_request_span(span, status_code)
+                metrics.finish_request(stats, request.method, status_code)
+
+        return instrumented_handler
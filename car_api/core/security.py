@@ -1,31 +1,40 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, Optional
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pwdlib import PasswordHash
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from car_api.core.database import get_session
-from car_api.core.settings import Settings
+from car_api.core.metrics import JWT_VERIFY_DURATION, PASSWORD_HASH_DURATION
+from car_api.core.settings import get_settings
+from car_api.core.tracing import traced
 from car_api.models.users import User
 
-pwd_context = PasswordHash.recommended()
 security = HTTPBearer()
-settings = Settings()
+
+
+@lru_cache
+def get_password_context() -> PasswordHash:
+    return PasswordHash.recommended()
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_DURATION.time('hash'):
+        return get_password_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_DURATION.time('verify'):
+        return get_password_context().verify(plain_password, hashed_password)
 
 
 def create_access_token(data: Dict) -> str:
+    settings = get_settings()
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.JWT_EXPIRATION_MINUTES
@@ -40,10 +49,14 @@ def create_access_token(data: Dict) -> str:
 
 
 def verify_token(token: str) -> Dict:
+    settings = get_settings()
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        with JWT_VERIFY_DURATION.time():
+            payload = jwt.decode(
+                token,
+                settings.JWT_SECRET_KEY,
+                algorithms=[settings.JWT_ALGORITHM],
+            )
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -74,29 +87,30 @@ async def authenticate_user(
     return user
 
 
-async def get_current_user(
+@traced
+def get_current_user_id(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_session),
-) -> User:
-    payload = verify_token(credentials.credentials)
-
-    user_id_str = payload.get('sub')
-    if not user_id_str:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail='Could not validate credentials',
-            headers={'WWW-Authenticate': 'Bearer'},
-        )
+) -> int:
+    payload = getattr(request.state, 'token_payload', None)
+    if payload is None:
+        payload = verify_token(credentials.credentials)
 
     try:
-        user_id = int(user_id_str)
-    except (ValueError, TypeError):
+        return int(payload['sub'])
+    except (KeyError, ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Could not validate credentials',
             headers={'WWW-Authenticate': 'Bearer'},
         )
 
+
+@traced
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_session),
+) -> User:
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
 
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,3 +14,83 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = 'HS256'
     JWT_EXPIRATION_MINUTES: int = 30
+
+    OPENAPI_PREBUILT: bool = False
+    OPENAPI_PATH: str = 'openapi.json'
+
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_EXPORT_PATH: str = 'traces.jsonl'
+    TRACING_TRUST_PARENT: bool = False
+
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    METRICS_DIR: str = ''
+    METRICS_FLUSH_SECONDS: float = 1.0
+
+    PROFILING_TOKEN: str = ''
+    PROFILING_OUTPUT_DIR: str = 'profiles'
+    PROFILING_INTERVAL: float = 0.001
+
+    READY_CACHE_TTL: float = 1.0
+    READY_DB_TIMEOUT: float = 1.0
+    READY_MAX_DB_LATENCY_MS: float = 500.0
+    READY_MAX_POOL_USAGE: float = 0.9
+    READY_MAX_EVENT_LOOP_LAG_MS: float = 200.0
+
+    CONCURRENCY_LIMIT_ENABLED: bool = False
+    CONCURRENCY_INITIAL_LIMIT: int = 20
+    CONCURRENCY_MIN_LIMIT: int = 2
+    CONCURRENCY_MAX_LIMIT: int = 200
+    CONCURRENCY_BACKOFF: float = 0.9
+    CONCURRENCY_LATENCY_TOLERANCE: float = 2.0
+    CONCURRENCY_RTT_WINDOW: float = 30.0
+    CONCURRENCY_RETRY_AFTER: int = 1
+    CONCURRENCY_PRIORITIES: Dict[str, str] = {'token': 'low'}
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORE: str = ''
+    RATE_LIMIT_DEFAULT: str = '1200/minute'
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        'token': '20/minute',
+        'create_user': '20/minute',
+    }
+    RATE_LIMIT_SWEEP_INTERVAL: float = 60.0
+
+    CHANGES_SAFETY_WINDOW: float = 5.0
+
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_ROUTES: List[str] = [
+        'create_brand',
+        'create_car',
+        'create_user',
+    ]
+    IDEMPOTENCY_TTL: float = 86400.0
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0
+    IDEMPOTENCY_SWEEP_INTERVAL: float = 60.0
+    IDEMPOTENCY_STORE: str = ''
+    IDEMPOTENCY_LOCK_TIMEOUT: float = 60.0
+
+    PRICE_DISTRIBUTION_CACHE_SIZE: int = 1024
+    PRICE_DISTRIBUTION_CACHE_TTL: float = 30.0
+
+    SUGGEST_REFRESH_SECONDS: float = 60.0
+
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+
+    SERVER_HOST: str = '0.0.0.0'
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE: int = 5
+    SERVER_THREAD_LIMIT: int = 40
+    SERVER_ACCESS_LOG: bool = False
+    SERVER_FORWARDED_ALLOW_IPS: str = '127.0.0.1'
+    SERVER_MAX_CRASHES: int = 10
+    SERVER_CRASH_WINDOW: float = 60.0
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
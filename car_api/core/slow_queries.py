@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from car_api.core.metrics import current_request
+from car_api.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIXES = {
+    'postgresql': 'EXPLAIN (ANALYZE off) ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+}
+
+_NORMALIZERS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'%\(\w+\)s|:\w+|\$\d+|%s'), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def normalize_statement(statement: str) -> str:
+    for pattern, replacement in _NORMALIZERS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def fingerprint(statement: str) -> str:
+    normalized = normalize_statement(statement)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def parameter_shape(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {
+                'executemany': len(parameters),
+                'shape': parameter_shape(parameters[0]),
+            }
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    statement: str
+    dialect: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    routes: Set[str] = field(default_factory=set)
+    parameter_shape: Any = None
+    plan: Optional[List[str]] = None
+    explaining: bool = False
+
+    def to_dict(self) -> Dict:
+        return {
+            'fingerprint': self.fingerprint,
+            'statement': normalize_statement(self.statement),
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3),
+            'max_ms': round(self.max_ms, 3),
+            'routes': sorted(self.routes),
+            'parameter_shape': self.parameter_shape,
+            'plan': self.plan,
+        }
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain: bool = True,
+        max_entries: int = 500,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.max_entries = max_entries
+        self.entries: Dict[str, SlowQuery] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        elapsed_ms: float,
+        route: str,
+        dialect: str,
+    ) -> SlowQuery:
+        key = fingerprint(statement)
+        entry = self.entries.get(key)
+        if entry is None:
+            if len(self.entries) >= self.max_entries:
+                cheapest = min(self.entries.values(), key=_total_ms)
+                del self.entries[cheapest.fingerprint]
+            entry = self.entries[key] = SlowQuery(key, statement, dialect)
+
+        entry.count += 1
+        entry.total_ms += elapsed_ms
+        entry.max_ms = max(entry.max_ms, elapsed_ms)
+        entry.routes.add(route)
+        entry.parameter_shape = parameter_shape(parameters)
+
+        logger.warning(
+            'Slow query %s (%.1f ms) on route %s: %s params=%s',
+            key,
+            elapsed_ms,
+            route,
+            normalize_statement(statement),
+            entry.parameter_shape,
+        )
+        return entry
+
+    def needs_plan(self, entry: SlowQuery) -> bool:
+        return (
+            self.explain
+            and entry.plan is None
+            and not entry.explaining
+            and entry.dialect in EXPLAIN_PREFIXES
+            and entry.statement.lstrip().upper().startswith('SELECT')
+        )
+
+    def top(self, limit: int = 10) -> List[SlowQuery]:
+        return sorted(self.entries.values(), key=_total_ms, reverse=True)[
+            :limit
+        ]
+
+    def report(self, limit: int = 10) -> str:
+        lines = [
+            f'{"fingerprint":<16} {"count":>6} {"total_ms":>10} '
+            f'{"max_ms":>9}  statement'
+        ]
+        lines.extend(
+            f'{entry.fingerprint:<16} {entry.count:>6} '
+            f'{entry.total_ms:>10.1f} {entry.max_ms:>9.1f}  '
+            f'{normalize_statement(entry.statement)[:120]}'
+            for entry in self.top(limit)
+        )
+        return '\n'.join(lines)
+
+
+def _total_ms(entry: SlowQuery) -> float:
+    return entry.total_ms
+
+
+@lru_cache
+def get_slow_query_log() -> SlowQueryLog:
+    settings = get_settings()
+    return SlowQueryLog(
+        settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_EXPLAIN
+    )
+
+
+async def capture_plan(
+    engine: Engine, entry: SlowQuery, parameters: Any
+) -> None:
+    entry.explaining = True
+    prefix = EXPLAIN_PREFIXES[entry.dialect]
+    try:
+        async with AsyncEngine(engine).connect() as conn:
+            result = await conn.exec_driver_sql(
+                prefix + entry.statement, parameters
+            )
+            entry.plan = [
+                ' '.join(str(column) for column in row)
+                for row in result.fetchall()
+            ]
+    except Exception as exc:
+        entry.plan = [f'EXPLAIN failed: {exc}']
+    finally:
+        entry.explaining = False
+
+
+def schedule_plan(engine: Engine, entry: SlowQuery, parameters: Any) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(capture_plan(engine, entry, parameters))
+    _pending_plans.add(task)
+    task.add_done_callback(_pending_plans.discard)
+
+
+_pending_plans: Set[asyncio.Task] = set()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if get_slow_query_log().enabled:
+        context._slow_query_started = perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    started = getattr(context, '_slow_query_started', None)
+    if started is None:
+        return
+
+    slow_query_log = get_slow_query_log()
+    elapsed_ms = (perf_counter() - started) * 1000
+    if elapsed_ms < slow_query_log.threshold_ms:
+        return
+
+    stats = current_request.get()
+    entry = slow_query_log.record(
+        statement,
+        parameters,
+        elapsed_ms,
+        stats.route if stats else 'none',
+        conn.dialect.name,
+    )
+    if slow_query_log.needs_plan(entry):
+        schedule_plan(conn.engine, entry, parameters)
+
+
+def log_slow_query_report(limit: int = 10) -> None:
+    slow_query_log = get_slow_query_log()
+    if slow_query_log.entries:
+        logger.warning(
+            'Top %d slow queries:\n%s', limit, slow_query_log.report(limit)
+        )
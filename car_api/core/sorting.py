@@ -0,0 +1,17 @@
+from typing import Dict, List, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement
+
+
+def order_by(
+    sort: str, allowed: Dict[str, Sequence[ColumnElement]]
+) -> List[ColumnElement]:
+    descending = sort.startswith('-')
+    columns = allowed.get(sort.removeprefix('-'))
+    if columns is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Ordenação inválida: {sort}',
+        )
+    return [column.desc() if descending else column for column in columns]
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from functools import lru_cache, partial
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from car_api.core import database
+from car_api.core.metrics import SUGGEST_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Iterable[Sequence]]]
+
+
+class PrefixIndex:
+    def __init__(self, counts: Optional[Dict[str, int]] = None):
+        self.counts: Dict[Tuple[str, str], int] = {
+            (value.casefold(), value): count
+            for value, count in (counts or {}).items()
+        }
+        self.keys: List[Tuple[str, str]] = sorted(self.counts)
+
+    def add(self, value: str) -> None:
+        key = (value.casefold(), value)
+        if key in self.counts:
+            self.counts[key] += 1
+            return
+        self.counts[key] = 1
+        insort(self.keys, key)
+
+    def discard(self, value: str) -> None:
+        key = (value.casefold(), value)
+        count = self.counts.get(key)
+        if count is None:
+            return
+        if count > 1:
+            self.counts[key] = count - 1
+            return
+        del self.counts[key]
+        del self.keys[bisect_left(self.keys, key)]
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        prefix = prefix.casefold()
+        start = bisect_left(self.keys, (prefix,))
+        results = []
+        for key in self.keys[start : start + limit]:
+            if not key[0].startswith(prefix):
+                break
+            results.append((key[1], self.counts[key]))
+        return results
+
+
+class SuggestIndex:
+    def __init__(self, name: str, fields: Sequence[str]):
+        self.name = name
+        self.fields = tuple(fields)
+        self.entries: Dict[int, Tuple[Hashable, Tuple[str, ...]]] = {}
+        self.indexes: Dict[Tuple[Hashable, str], PrefixIndex] = defaultdict(
+            PrefixIndex
+        )
+        self.ready = False
+        self.journal: Optional[List[Callable[[], None]]] = None
+        self.lock = asyncio.Lock()
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return
+        scope, values = entry
+        for field, value in zip(self.fields, values):
+            self.indexes[scope, field].discard(value)
+
+    def _upsert(
+        self, entry_id: int, scope: Hashable, values: Sequence[str]
+    ) -> None:
+        self._remove(entry_id)
+        self.entries[entry_id] = (scope, tuple(values))
+        for field, value in zip(self.fields, values):
+            self.indexes[scope, field].add(value)
+
+    def _apply(self, operation: Callable[[], None]) -> None:
+        if self.journal is not None:
+            self.journal.append(operation)
+        if self.ready:
+            operation()
+            SUGGEST_ENTRIES.set(len(self.entries), self.name)
+
+    def _remove_scope(self, scope: Hashable) -> None:
+        self.entries = {
+            entry_id: entry
+            for entry_id, entry in self.entries.items()
+            if entry[0] != scope
+        }
+        for field in self.fields:
+            self.indexes.pop((scope, field), None)
+
+    def _build(self, rows: Iterable[Sequence]) -> None:
+        entries = {}
+        counts: Dict[Tuple[Hashable, str], Counter] = defaultdict(Counter)
+        for entry_id, scope, *values in rows:
+            entries[entry_id] = (scope, tuple(values))
+            for field, value in zip(self.fields, values):
+                counts[scope, field][value] += 1
+
+        indexes: Dict[Tuple[Hashable, str], PrefixIndex] = defaultdict(
+            PrefixIndex
+        )
+        for key, values in counts.items():
+            indexes[key] = PrefixIndex(values)
+        self.entries, self.indexes = entries, indexes
+
+    def upsert(
+        self, entry_id: int, scope: Hashable, values: Sequence[str]
+    ) -> None:
+        self._apply(partial(self._upsert, entry_id, scope, values))
+
+    def remove(self, entry_id: int) -> None:
+        self._apply(partial(self._remove, entry_id))
+
+    def remove_scope(self, scope: Hashable) -> None:
+        self._apply(partial(self._remove_scope, scope))
+
+    async def _load(self, load: Loader) -> None:
+        self.journal = []
+        try:
+            self._build(await load())
+            for operation in self.journal:
+                operation()
+            self.ready = True
+        finally:
+            self.journal = None
+        SUGGEST_ENTRIES.set(len(self.entries), self.name)
+
+    async def refresh(self, load: Loader) -> None:
+        async with self.lock:
+            await self._load(load)
+
+    async def ensure(self, load: Loader) -> None:
+        if self.ready:
+            return
+        async with self.lock:
+            if not self.ready:
+                await self._load(load)
+
+    def search(
+        self, scope: Hashable, prefix: str, limit: int
+    ) -> List[Dict[str, object]]:
+        results = []
+        for field in self.fields:
+            index = self.indexes.get((scope, field))
+            if index is None:
+                continue
+            results.extend(
+                {'field': field, 'value': value, 'count': count}
+                for value, count in index.search(prefix, limit - len(results))
+            )
+            if len(results) >= limit:
+                break
+        return results
+
+
+@lru_cache
+def get_car_index() -> SuggestIndex:
+    return SuggestIndex('cars', ('model', 'plate'))
+
+
+@lru_cache
+def get_brand_index() -> SuggestIndex:
+    return SuggestIndex('brands', ('name',))
+
+
+async def keep_fresh(
+    get_index: Callable[[], SuggestIndex],
+    load: Callable[[AsyncSession], Awaitable[Iterable[Sequence]]],
+    interval: float,
+) -> None:
+    while True:
+        index = get_index()
+        try:
+            async with AsyncSession(database.get_engine()) as db:
+                await index.refresh(partial(load, db))
+        except Exception:
+            logger.exception('Falha ao carregar o índice %s', index.name)
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
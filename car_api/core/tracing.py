@@ -0,0 +1,284 @@
+import inspect
+import json
+import queue
+import random
+import secrets
+import threading
+import time
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from car_api.core.settings import get_settings
+
+MAX_STATEMENT_LENGTH = 500
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    kind: str = 'internal'
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    status: str = 'ok'
+    attributes: Dict = field(default_factory=dict)
+    trace: List['Span'] = field(default_factory=list, repr=False)
+    token: Optional[Token] = field(default=None, repr=False)
+
+    def child(self, name: str, kind: str = 'internal', **attributes) -> 'Span':
+        span = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=self.span_id,
+            kind=kind,
+            attributes=attributes,
+            trace=self.trace,
+        )
+        self.trace.append(span)
+        return span
+
+    def end(self, status: Optional[str] = None) -> None:
+        self.end_ns = time.time_ns()
+        if status is not None:
+            self.status = status
+
+    def to_dict(self) -> Dict:
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'durationMs': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'status': self.status,
+            'attributes': self.attributes,
+        }
+
+
+class InMemoryExporter:
+    def __init__(self):
+        self.spans: List[Dict] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(span.to_dict() for span in spans)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonlExporter:
+    def __init__(self, path: str):
+        self.path = path
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def export(self, spans: List[Span]) -> None:
+        self.queue.put([span.to_dict() for span in spans])
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(
+                        target=self.write_forever, daemon=True
+                    )
+                    self.thread.start()
+
+    def shutdown(self) -> None:
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def write_forever(self) -> None:
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.writelines(
+                    json.dumps(span, ensure_ascii=False, default=str) + '\n'
+                    for span in batch
+                )
+
+
+class Tracer:
+    def __init__(
+        self, exporter, sample_rate: float, trust_parent: bool = False
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.trust_parent = trust_parent
+
+    def should_sample(self, traceparent: Optional[str]) -> bool:
+        if self.trust_parent and traceparent:
+            parts = traceparent.split('-')
+            if len(parts) == 4:
+                return parts[3].endswith('1')
+        return random.random() < self.sample_rate
+
+    def start_trace(
+        self, name: str, traceparent: Optional[str] = None, **attributes
+    ) -> Optional[Span]:
+        if not self.should_sample(traceparent):
+            return None
+
+        trace_id, parent_id = secrets.token_hex(16), None
+        if traceparent and len(traceparent.split('-')) == 4:
+            _, trace_id, parent_id, _ = traceparent.split('-')
+
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent_id,
+            kind='server',
+            attributes=attributes,
+        )
+        span.trace.append(span)
+        return span
+
+    def finish_trace(self, span: Span) -> None:
+        self.exporter.export([
+            child for child in span.trace if child.end_ns is not None
+        ])
+
+
+@lru_cache
+def get_tracer() -> Tracer:
+    settings = get_settings()
+    return Tracer(
+        JsonlExporter(settings.TRACING_EXPORT_PATH),
+        settings.TRACING_SAMPLE_RATE,
+        settings.TRACING_TRUST_PARENT,
+    )
+
+
+def shutdown_tracer() -> None:
+    get_tracer().exporter.shutdown()
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar(
+    'current_span', default=None
+)
+
+
+def start_request_span(route: str, request: Request) -> Optional[Span]:
+    span = get_tracer().start_trace(
+        f'{request.method} {route}',
+        request.headers.get('traceparent'),
+        route=route,
+        method=request.method,
+        path=request.url.path,
+    )
+    if span is not None:
+        span.token = current_span.set(span)
+    return span
+
+
+def finish_request_span(span: Optional[Span], status_code: int) -> None:
+    if span is None:
+        return
+    span.attributes['status_code'] = status_code
+    span.end('error' if status_code >= 500 else 'ok')
+    current_span.reset(span.token)
+    get_tracer().finish_trace(span)
+
+
+@contextmanager
+def start_span(
+    name: str, kind: str = 'internal', **attributes
+) -> Iterator[Optional[Span]]:
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    span = parent.child(name, kind, **attributes)
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException:
+        span.end('error')
+        raise
+    else:
+        span.end()
+    finally:
+        current_span.reset(token)
+
+
+def traced(func):
+    name = f'dependency {func.__name__}'
+
+    if inspect.isasyncgenfunction(func):
+        context_manager = asynccontextmanager(func)
+
+        @wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            async with AsyncExitStack() as stack:
+                with start_span(name):
+                    value = await stack.enter_async_context(
+                        context_manager(*args, **kwargs)
+                    )
+                yield value
+
+        return async_gen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with start_span(name):
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with start_span(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    parent = current_span.get()
+    if parent is not None:
+        context._trace_span = parent.child(
+            'db.query',
+            'client',
+            statement=statement[:MAX_STATEMENT_LENGTH],
+            system=conn.dialect.name,
+        )
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    span = getattr(context, '_trace_span', None)
+    if span is not None:
+        span.end()
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    span = getattr(context, '_trace_span', None)
+    if span is not None:
+        span.attributes['error'] = str(exception_context.original_exception)
+        span.end('error')
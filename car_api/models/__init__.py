@@ -1,5 +1,15 @@
 from car_api.models.base import Base
-from car_api.models.cars import Brand, Car
+from car_api.models.cars import Brand, Car, CarDeletion
+from car_api.models.idempotency import IdempotencyRecord
+from car_api.models.rate_limits import RateLimitState
 from car_api.models.users import User
 
-__all__ = ['Base', 'Brand', 'Car', 'User']
+__all__ = [
+    'Base',
+    'Brand',
+    'Car',
+    'CarDeletion',
+    'IdempotencyRecord',
+    'RateLimitState',
+    'User',
+]
@@ -3,7 +3,17 @@ from decimal import Decimal
 from enum import Enum
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from car_api.models import Base
@@ -11,6 +21,16 @@ from car_api.models import Base
 if TYPE_CHECKING:
     from car_api.models import User
 
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            '%(year)04d-%(month)02d-%(day)02d '
+            '%(hour)02d:%(minute)02d:%(second)02d'
+        )
+    ),
+    'sqlite',
+)
+
 
 class FuelType(str, Enum):
     GASOLINE = 'gasoline'
@@ -49,6 +69,13 @@ class Brand(Base):
 
 class Car(Base):
     __tablename__ = 'cars'
+    __table_args__ = (
+        Index('ix_cars_owner_id_id', 'owner_id', 'id'),
+        Index('ix_cars_owner_id_price', 'owner_id', 'price', 'id'),
+        Index('ix_cars_owner_id_model_year', 'owner_id', 'model_year', 'id'),
+        Index('ix_cars_owner_id_created_at', 'owner_id', 'created_at', 'id'),
+        Index('ix_cars_owner_id_updated_at', 'owner_id', 'updated_at', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -72,9 +99,11 @@ class Car(Base):
         ForeignKey('users.id'),
     )
 
-    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now()
+    )
     updated_at: Mapped[Optional[datetime]] = mapped_column(
-        onupdate=func.now(), server_default=func.now()
+        Timestamp, onupdate=func.now(), server_default=func.now()
     )
 
     brand: Mapped['Brand'] = relationship(
@@ -85,3 +114,22 @@ class Car(Base):
         'User',
         back_populates='cars',
     )
+
+
+class CarDeletion(Base):
+    __tablename__ = 'car_deletions'
+    __table_args__ = (
+        Index(
+            'ix_car_deletions_owner_id_deleted_at',
+            'owner_id',
+            'deleted_at',
+            'id',
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    car_id: Mapped[int]
+    owner_id: Mapped[int]
+    deleted_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now()
+    )
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from car_api.models import Base
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = 'idempotency_keys'
+
+    key: Mapped[str] = mapped_column(String(400), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[Optional[int]]
+    body: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    media_type: Mapped[Optional[str]] = mapped_column(String(100))
+    expires_at: Mapped[float] = mapped_column(index=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from car_api.models import Base
+
+
+class RateLimitState(Base):
+    __tablename__ = 'rate_limits'
+
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    tat: Mapped[float] = mapped_column(index=True)
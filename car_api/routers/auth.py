@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from car_api.core.database import get_session
+from car_api.core.responses import model_response
+from car_api.core.routing import InstrumentedRoute
 from car_api.core.security import (
     authenticate_user,
     create_access_token,
@@ -10,7 +12,7 @@ from car_api.core.security import (
 from car_api.models.users import User
 from car_api.schemas.auth import LoginRequest, Token
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 
 @router.post(
@@ -32,7 +34,9 @@ async def token(
         )
     access_token = create_access_token(data={'sub': str(user.id)})
 
-    return {'access_token': access_token, 'token_type': 'bearer'}
+    return model_response(
+        Token, {'access_token': access_token, 'token_type': 'bearer'}
+    )
 
 
 @router.post(
@@ -44,4 +48,6 @@ async def token(
 async def refresh_token(current_user: User = Depends(get_current_user)):
     access_token = create_access_token(data={'sub': str(current_user.id)})
 
-    return {'access_token': access_token, 'token_type': 'bearer'}
+    return model_response(
+        Token, {'access_token': access_token, 'token_type': 'bearer'}
+    )
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from car_api.core.batch import execute_batch
+from car_api.core.database import get_session
+from car_api.core.responses import model_response
+from car_api.core.routing import InstrumentedRoute
+from car_api.core.security import get_current_user
+from car_api.models.users import User
+from car_api.schemas.batch import BatchPublicSchema, BatchSchema
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.post(
+    path='/',
+    status_code=status.HTTP_200_OK,
+    response_model=BatchPublicSchema,
+    summary='Executar operações em lote',
+)
+async def run_batch(
+    batch: BatchSchema,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    content = await execute_batch(
+        request, db.bind, batch.operations, batch.atomic
+    )
+    return model_response(BatchPublicSchema, content)
@@ -1,21 +1,43 @@
-from typing import Optional
+from functools import partial
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import exists, func, select
+from sqlalchemy import exists, func, null, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from car_api.core import database, suggest
 from car_api.core.database import get_session
-from car_api.core.security import get_current_user
+from car_api.core.responses import model_response, ordered_batch
+from car_api.core.routing import InstrumentedRoute
+from car_api.core.security import get_current_user, get_current_user_id
+from car_api.core.sorting import order_by
 from car_api.models.cars import Brand, Car
 from car_api.models.users import User
+from car_api.schemas.batch import BatchGetSchema
 from car_api.schemas.brands import (
+    BrandBatchPublicSchema,
     BrandListPublicSchema,
     BrandPublicSchema,
     BrandSchema,
     BrandUpdateSchema,
 )
+from car_api.schemas.suggest import SuggestPublicSchema
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+BRAND_SORTS = {'id': (Brand.id,), 'name': (Brand.name,)}
+
+
+def _index_brand(db: AsyncSession, brand: Brand) -> None:
+    index = suggest.get_brand_index()
+    database.after_commit(
+        db, lambda: index.upsert(brand.id, None, (brand.name,))
+    )
+
+
+async def brand_suggest_rows(db: AsyncSession) -> List:
+    result = await db.execute(select(Brand.id, null(), Brand.name))
+    return result.all()
 
 
 @router.post(
@@ -45,10 +67,11 @@ async def create_brand(
     )
 
     db.add(db_brand)
+    _index_brand(db, db_brand)
     await db.commit()
     await db.refresh(db_brand)
 
-    return db_brand
+    return model_response(BrandPublicSchema, db_brand, status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -60,6 +83,9 @@ async def create_brand(
 async def list_brands(
     offset: int = Query(0, ge=0, description='Número de registros para pular'),
     limit: int = Query(100, ge=1, le=100, description='Limite de registros'),
+    sort: str = Query(
+        'id', description='Ordenação: id ou name; prefixo - para decrescente'
+    ),
     search: Optional[str] = Query(
         None, description='Buscar por nome da marca'
     ),
@@ -78,12 +104,58 @@ async def list_brands(
     if is_active is not None:
         query = query.where(Brand.is_active == is_active)
 
+    query = query.order_by(*order_by(sort, BRAND_SORTS))
     query = query.offset(offset).limit(limit)
 
     result = await db.execute(query)
     brands = result.scalars().all()
 
-    return {'brands': brands, 'offset': offset, 'limit': limit}
+    return model_response(
+        BrandListPublicSchema,
+        {'brands': brands, 'offset': offset, 'limit': limit},
+    )
+
+
+@router.get(
+    path='/suggest',
+    status_code=status.HTTP_200_OK,
+    response_model=SuggestPublicSchema,
+    summary='Sugerir nomes de marcas',
+)
+async def suggest_brands(
+    q: str = Query(
+        ..., min_length=1, max_length=100, description='Início do nome'
+    ),
+    limit: int = Query(10, ge=1, le=50, description='Limite de sugestões'),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_session),
+):
+    index = suggest.get_brand_index()
+    await index.ensure(lambda: brand_suggest_rows(db))
+    return model_response(
+        SuggestPublicSchema, {'suggestions': index.search(None, q, limit)}
+    )
+
+
+@router.post(
+    path='/batch-get',
+    status_code=status.HTTP_200_OK,
+    response_model=BrandBatchPublicSchema,
+    summary='Buscar marcas por lista de IDs',
+)
+async def batch_get_brands(
+    batch: BatchGetSchema,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    result = await db.execute(
+        select(Brand).where(Brand.id.in_(set(batch.ids)))
+    )
+    brands, missing = ordered_batch(batch.ids, result.scalars().all())
+
+    return model_response(
+        BrandBatchPublicSchema, {'brands': brands, 'missing': missing}
+    )
 
 
 @router.get(
@@ -105,7 +177,7 @@ async def get_brand(
             detail='Marca não encontrada',
         )
 
-    return brand
+    return model_response(BrandPublicSchema, brand)
 
 
 @router.put(
@@ -148,10 +220,11 @@ async def update_brand(
     for field, value in update_data.items():
         setattr(brand, field, value)
 
+    _index_brand(db, brand)
     await db.commit()
     await db.refresh(brand)
 
-    return brand
+    return model_response(BrandPublicSchema, brand)
 
 
 @router.delete(
@@ -183,4 +256,7 @@ async def delete_brand(
         )
 
     await db.delete(brand)
+    database.after_commit(
+        db, partial(suggest.get_brand_index().remove, brand_id)
+    )
     await db.commit()
@@ -1,22 +1,311 @@
-from typing import Optional
+import base64
+import json
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import exists, select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Float,
+    Select,
+    and_,
+    cast,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from car_api.core import database, events, price_distribution, suggest
 from car_api.core.database import get_session
-from car_api.core.security import get_current_user, verify_car_ownership
-from car_api.models.cars import Brand, Car, FuelType, TransmissionType
+from car_api.core.responses import model_response, ordered_batch
+from car_api.core.routing import InstrumentedRoute
+from car_api.core.security import (
+    get_current_user,
+    get_current_user_id,
+    verify_car_ownership,
+)
+from car_api.core.settings import get_settings
+from car_api.core.sorting import order_by
+from car_api.core.tracing import traced
+from car_api.models.cars import (
+    Brand,
+    Car,
+    CarDeletion,
+    FuelType,
+    TransmissionType,
+)
 from car_api.models.users import User
+from car_api.schemas.batch import BatchGetSchema
 from car_api.schemas.cars import (
+    CAR_EMBEDS,
+    CAR_FIELDS,
+    CarChangesPublicSchema,
+    CarFacetsPublicSchema,
+    CarFilterSchema,
+    CarFlatPublicSchema,
+    CarListFormat,
     CarListPublicSchema,
+    CarPriceDistributionSchema,
     CarPublicSchema,
     CarSchema,
     CarUpdateSchema,
+    car_batch_public_schema,
+    car_list_public_schema,
+    car_normalized_list_public_schema,
+    car_public_schema,
 )
+from car_api.schemas.suggest import SuggestPublicSchema
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+CAR_FACETS = ('brand_id', 'fuel_type', 'transmission', 'is_available')
+CAR_SORTS = {
+    'id': (Car.id,),
+    'price': (Car.price, Car.id),
+    'model_year': (Car.model_year, Car.id),
+    'created_at': (Car.created_at, Car.id),
+    'updated_at': (Car.updated_at, Car.id),
+}
+
+
+def _parse_names(
+    value: Optional[str], allowed: Tuple[str, ...], detail: str
+) -> Tuple[str, ...]:
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    invalid = sorted(names.difference(allowed))
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'{detail}: {", ".join(invalid)}',
+        )
+    return tuple(sorted(names))
+
+
+@traced
+def get_car_fieldset(
+    fields: Optional[str] = Query(
+        None, description='Campos do carro a retornar, separados por vírgula'
+    ),
+    embed: Optional[str] = Query(
+        None, description='Relações a incluir: brand, owner'
+    ),
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    selected_fields = CAR_FIELDS
+    if fields is not None:
+        selected_fields = _parse_names(fields, CAR_FIELDS, 'Campo inválido')
+
+    selected_embed = CAR_EMBEDS
+    if embed is not None:
+        selected_embed = _parse_names(embed, CAR_EMBEDS, 'Relação inválida')
+
+    return selected_fields, selected_embed
+
+
+@traced
+def get_car_filters(
+    search: Optional[str] = Query(
+        None, description='Buscar por modelo ou placa'
+    ),
+    brand_id: Optional[int] = Query(None, description='Filtrar por marca'),
+    fuel_type: Optional[FuelType] = Query(
+        None, description='Filtrar por tipo de combustível'
+    ),
+    transmission: Optional[TransmissionType] = Query(
+        None, description='Filtrar por transmissão'
+    ),
+    is_available: Optional[bool] = Query(
+        None, description='Filtrar por disponibilidade'
+    ),
+    min_price: Optional[float] = Query(None, ge=0, description='Preço mínimo'),
+    max_price: Optional[float] = Query(None, ge=0, description='Preço máximo'),
+) -> CarFilterSchema:
+    return CarFilterSchema(
+        search=search,
+        brand_id=brand_id,
+        fuel_type=fuel_type,
+        transmission=transmission,
+        is_available=is_available,
+        min_price=min_price,
+        max_price=max_price,
+    )
+
+
+def apply_car_filters(query: Select, filters: CarFilterSchema) -> Select:
+    if filters.search:
+        search_filter = f'%{filters.search}%'
+        query = query.where(
+            (Car.model.ilike(search_filter)) | (Car.plate.ilike(search_filter))
+        )
+
+    if filters.brand_id is not None:
+        query = query.where(Car.brand_id == filters.brand_id)
+
+    if filters.fuel_type is not None:
+        query = query.where(Car.fuel_type == filters.fuel_type)
+
+    if filters.transmission is not None:
+        query = query.where(Car.transmission == filters.transmission)
+
+    if filters.is_available is not None:
+        query = query.where(Car.is_available == filters.is_available)
+
+    if filters.min_price is not None:
+        query = query.where(Car.price >= filters.min_price)
+
+    if filters.max_price is not None:
+        query = query.where(Car.price <= filters.max_price)
+
+    return query
+
+
+def _car_load_options(
+    fields: Tuple[str, ...],
+    embed: Tuple[str, ...],
+    required: Iterable[str] = (),
+) -> List:
+    options = []
+
+    if set(fields) != set(CAR_FIELDS):
+        columns = {'id', *fields, *required}
+        if 'brand' in embed:
+            columns.add('brand_id')
+        options.append(load_only(*(getattr(Car, name) for name in columns)))
+
+    if 'brand' in embed:
+        options.append(selectinload(Car.brand))
 
-router = APIRouter()
+    return options
+
+
+def _encode_changes_token(
+    updated_at: Optional[datetime],
+    car_id: int,
+    deleted_at: Optional[datetime],
+    deletion_id: int,
+) -> str:
+    payload = {
+        'u': updated_at.isoformat() if updated_at else None,
+        'c': car_id,
+        'e': deleted_at.isoformat() if deleted_at else None,
+        'd': deletion_id,
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_changes_token(
+    token: str,
+) -> Tuple[Optional[datetime], int, Optional[datetime], int]:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        updated_at = payload['u'] and datetime.fromisoformat(payload['u'])
+        deleted_at = payload.get('e') and datetime.fromisoformat(payload['e'])
+        return (
+            updated_at or None,
+            int(payload['c']),
+            deleted_at or None,
+            int(payload['d']),
+        )
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Token de sincronização inválido',
+        )
+
+
+def car_facets_query(
+    filters: CarFilterSchema,
+    owner_id: int,
+    year_bucket: int,
+    grouping_sets: bool,
+) -> Select:
+    bucket = literal(year_bucket, literal_execute=True)
+    columns = [
+        *(getattr(Car, name) for name in CAR_FACETS),
+        ((Car.model_year // bucket) * bucket).label('year_bucket'),
+    ]
+    query = select(*columns, func.count().label('count')).where(
+        Car.owner_id == owner_id
+    )
+    query = apply_car_filters(query, filters)
+
+    if grouping_sets:
+        return query.group_by(
+            func.grouping_sets(*(tuple_(column) for column in columns))
+        )
+    return query.group_by(*columns)
+
+
+async def _count_car_facets(
+    db: AsyncSession, filters: CarFilterSchema, owner_id: int, year_bucket: int
+) -> Dict[str, Counter]:
+    query = car_facets_query(
+        filters,
+        owner_id,
+        year_bucket,
+        grouping_sets=db.bind.dialect.name == 'postgresql',
+    )
+    counts = {name: Counter() for name in (*CAR_FACETS, 'year_bucket')}
+    for row in (await db.execute(query)).mappings():
+        for name, counter in counts.items():
+            if row[name] is not None:
+                counter[row[name]] += row['count']
+    return counts
+
+
+def _invalidate_price_distribution(db: AsyncSession, owner_id: int) -> None:
+    cache = price_distribution.get_price_distribution_cache()
+    cache.invalidate_on_commit(db, owner_id)
+
+
+def _index_car(db: AsyncSession, car: Car) -> None:
+    index = suggest.get_car_index()
+    database.after_commit(
+        db, lambda: index.upsert(car.id, car.owner_id, (car.model, car.plate))
+    )
+
+
+async def car_suggest_rows(db: AsyncSession) -> List:
+    result = await db.execute(
+        select(Car.id, Car.owner_id, Car.model, Car.plate)
+    )
+    return result.all()
+
+
+def _publish_car_event(db: AsyncSession, event: str, car: Car) -> None:
+    if events.get_event_broker().has_subscribers(car.owner_id):
+        data = CarFlatPublicSchema.model_validate(car).model_dump_json()
+        events.publish(db, car.owner_id, event, data)
+
+
+async def _side_load_relations(
+    cars: List[Car], embed: Tuple[str, ...], owner: User, db: AsyncSession
+) -> dict:
+    content = {'cars': cars}
+
+    if 'brand' in embed:
+        brand_ids = {car.brand_id for car in cars}
+        brands = []
+        if brand_ids:
+            result = await db.execute(
+                select(Brand).where(Brand.id.in_(brand_ids))
+            )
+            brands = result.scalars().all()
+        content['brands'] = {brand.id: brand for brand in brands}
+
+    if 'owner' in embed:
+        content['users'] = {owner.id: owner} if cars else {}
+
+    return content
 
 
 @router.post(
@@ -64,6 +353,8 @@ async def create_car(
     )
 
     db.add(db_car)
+    _invalidate_price_distribution(db, current_user.id)
+    _index_car(db, db_car)
     await db.commit()
     await db.refresh(db_car)
 
@@ -73,8 +364,11 @@ async def create_car(
         .where(Car.id == db_car.id)
     )
     car_with_relations = result.scalar_one()
+    _publish_car_event(db, 'car.created', car_with_relations)
 
-    return car_with_relations
+    return model_response(
+        CarPublicSchema, car_with_relations, status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -86,59 +380,285 @@ async def create_car(
 async def list_cars(
     offset: int = Query(0, ge=0, description='Número de registros para pular'),
     limit: int = Query(100, ge=1, le=100, description='Limite de registros'),
-    search: Optional[str] = Query(
-        None, description='Buscar por modelo ou placa'
+    sort: str = Query(
+        'id',
+        description='Ordenação: id, price, model_year, created_at ou '
+        'updated_at; prefixo - para decrescente',
     ),
-    brand_id: Optional[int] = Query(None, description='Filtrar por marca'),
-    fuel_type: Optional[FuelType] = Query(
-        None, description='Filtrar por tipo de combustível'
+    filters: CarFilterSchema = Depends(get_car_filters),
+    fieldset: Tuple[Tuple[str, ...], Tuple[str, ...]] = Depends(
+        get_car_fieldset
     ),
-    transmission: Optional[TransmissionType] = Query(
-        None, description='Filtrar por transmissão'
+    response_format: CarListFormat = Query(
+        CarListFormat.EMBEDDED,
+        alias='format',
+        description='Formato da resposta: embedded ou normalized',
     ),
-    is_available: Optional[bool] = Query(
-        None, description='Filtrar por disponibilidade'
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    fields, embed = fieldset
+    normalized = response_format == CarListFormat.NORMALIZED
+
+    if normalized:
+        options = _car_load_options(
+            fields, (), required=('brand_id', 'owner_id')
+        )
+    else:
+        options = _car_load_options(fields, embed)
+
+    query = select(Car).options(*options)
+    query = query.where(Car.owner_id == current_user.id)
+
+    query = apply_car_filters(query, filters)
+
+    query = query.order_by(*order_by(sort, CAR_SORTS))
+    query = query.offset(offset).limit(limit)
+
+    result = await db.execute(query)
+    cars = result.scalars().all()
+
+    if normalized:
+        content = await _side_load_relations(cars, embed, current_user, db)
+        content.update({'offset': offset, 'limit': limit})
+        return model_response(
+            car_normalized_list_public_schema(fields, embed), content
+        )
+
+    if 'owner' in embed:
+        for car in cars:
+            set_committed_value(car, 'owner', current_user)
+
+    return model_response(
+        car_list_public_schema(fields, embed),
+        {'cars': cars, 'offset': offset, 'limit': limit},
+    )
+
+
+@router.get(
+    path='/facets',
+    status_code=status.HTTP_200_OK,
+    response_model=CarFacetsPublicSchema,
+    summary='Contar carros por filtro',
+)
+async def list_car_facets(
+    filters: CarFilterSchema = Depends(get_car_filters),
+    year_bucket: int = Query(
+        5, ge=1, le=100, description='Tamanho da faixa de ano modelo'
     ),
-    min_price: Optional[float] = Query(None, ge=0, description='Preço mínimo'),
-    max_price: Optional[float] = Query(None, ge=0, description='Preço máximo'),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
-    query = select(Car).options(
-        selectinload(Car.brand), selectinload(Car.owner)
+    counts = await _count_car_facets(db, filters, current_user.id, year_bucket)
+
+    content = {
+        name: [
+            {'value': value, 'count': count}
+            for value, count in sorted(counts[name].items())
+        ]
+        for name in CAR_FACETS
+    }
+    content['model_year'] = [
+        {'start': start, 'end': start + year_bucket - 1, 'count': count}
+        for start, count in sorted(counts['year_bucket'].items())
+    ]
+    content['total'] = counts['brand_id'].total()
+    return model_response(CarFacetsPublicSchema, content)
+
+
+@router.get(
+    path='/suggest',
+    status_code=status.HTTP_200_OK,
+    response_model=SuggestPublicSchema,
+    summary='Sugerir modelos e placas',
+)
+async def suggest_cars(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=100,
+        description='Início do modelo ou da placa',
+    ),
+    limit: int = Query(10, ge=1, le=50, description='Limite de sugestões'),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_session),
+):
+    index = suggest.get_car_index()
+    await index.ensure(lambda: car_suggest_rows(db))
+    return model_response(
+        SuggestPublicSchema, {'suggestions': index.search(user_id, q, limit)}
     )
-    query = query.where(Car.owner_id == current_user.id)
 
-    if search:
-        search_filter = f'%{search}%'
-        query = query.where(
-            (Car.model.ilike(search_filter)) | (Car.plate.ilike(search_filter))
+
+@router.get(
+    path='/price-distribution',
+    status_code=status.HTTP_200_OK,
+    response_model=CarPriceDistributionSchema,
+    summary='Distribuição de preços dos carros',
+)
+async def get_car_price_distribution(
+    filters: CarFilterSchema = Depends(get_car_filters),
+    bins: int = Query(
+        10, ge=1, le=50, description='Número de faixas do histograma'
+    ),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    cache = price_distribution.get_price_distribution_cache()
+    key = cache.key(current_user.id, (filters.model_dump_json(), bins))
+    content = cache.get(key)
+
+    if content is None:
+        query = select(
+            Car.brand_id, Car.model_year, cast(Car.price, Float)
+        ).where(Car.owner_id == current_user.id)
+        query = apply_car_filters(query, filters).order_by(
+            Car.brand_id, Car.model_year, Car.price
         )
+        rows = (await db.execute(query)).all()
+        content = price_distribution.distribution(rows, bins)
+        cache.set(key, content)
 
-    if brand_id is not None:
-        query = query.where(Car.brand_id == brand_id)
+    return model_response(CarPriceDistributionSchema, content)
 
-    if fuel_type is not None:
-        query = query.where(Car.fuel_type == fuel_type)
 
-    if transmission is not None:
-        query = query.where(Car.transmission == transmission)
+@router.post(
+    path='/batch-get',
+    status_code=status.HTTP_200_OK,
+    response_model=car_batch_public_schema(),
+    summary='Buscar carros por lista de IDs',
+)
+async def batch_get_cars(
+    batch: BatchGetSchema,
+    fieldset: Tuple[Tuple[str, ...], Tuple[str, ...]] = Depends(
+        get_car_fieldset
+    ),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    fields, embed = fieldset
 
-    if is_available is not None:
-        query = query.where(Car.is_available == is_available)
+    result = await db.execute(
+        select(Car)
+        .options(*_car_load_options(fields, embed))
+        .where(Car.owner_id == current_user.id, Car.id.in_(set(batch.ids)))
+    )
+    cars = result.scalars().all()
 
-    if min_price is not None:
-        query = query.where(Car.price >= min_price)
+    if 'owner' in embed:
+        for car in cars:
+            set_committed_value(car, 'owner', current_user)
 
-    if max_price is not None:
-        query = query.where(Car.price <= max_price)
+    cars, missing = ordered_batch(batch.ids, cars)
+    return model_response(
+        car_batch_public_schema(fields, embed),
+        {'cars': cars, 'missing': missing},
+    )
 
-    query = query.offset(offset).limit(limit)
 
-    result = await db.execute(query)
+@router.get(
+    path='/changes',
+    status_code=status.HTTP_200_OK,
+    response_model=CarChangesPublicSchema,
+    summary='Listar alterações de carros',
+)
+async def list_car_changes(
+    since: Optional[str] = Query(
+        None, description='Token retornado pela sincronização anterior'
+    ),
+    limit: int = Query(100, ge=1, le=100, description='Limite de registros'),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
+    updated_at, car_id, deleted_at, deletion_id = None, 0, None, 0
+    if since is not None:
+        updated_at, car_id, deleted_at, deletion_id = _decode_changes_token(
+            since
+        )
+
+    window = timedelta(seconds=get_settings().CHANGES_SAFETY_WINDOW)
+    cutoff = await db.scalar(select(func.now())) - window
+
+    query = select(Car).where(
+        Car.owner_id == current_user.id, Car.updated_at <= cutoff
+    )
+    if updated_at is not None:
+        query = query.where(
+            or_(
+                Car.updated_at > updated_at,
+                and_(Car.updated_at == updated_at, Car.id > car_id),
+            )
+        )
+    result = await db.execute(
+        query.order_by(Car.updated_at, Car.id).limit(limit + 1)
+    )
     cars = result.scalars().all()
 
-    return {'cars': cars, 'offset': offset, 'limit': limit}
+    query = select(CarDeletion).where(
+        CarDeletion.owner_id == current_user.id,
+        CarDeletion.deleted_at <= cutoff,
+    )
+    if deleted_at is not None:
+        query = query.where(
+            or_(
+                CarDeletion.deleted_at > deleted_at,
+                and_(
+                    CarDeletion.deleted_at == deleted_at,
+                    CarDeletion.id > deletion_id,
+                ),
+            )
+        )
+    else:
+        query = query.where(CarDeletion.id > deletion_id)
+    result = await db.execute(
+        query.order_by(CarDeletion.deleted_at, CarDeletion.id).limit(limit + 1)
+    )
+    deletions = result.scalars().all()
+
+    more_cars = len(cars) > limit
+    more_deletions = len(deletions) > limit
+    cars, deletions = cars[:limit], deletions[:limit]
+
+    if cars:
+        updated_at, car_id = cars[-1].updated_at, cars[-1].id
+    if deletions:
+        deleted_at, deletion_id = deletions[-1].deleted_at, deletions[-1].id
+
+    return model_response(
+        CarChangesPublicSchema,
+        {
+            'cars': cars,
+            'deleted': [
+                {'id': deletion.car_id, 'deleted_at': deletion.deleted_at}
+                for deletion in deletions
+            ],
+            'next_token': _encode_changes_token(
+                updated_at, car_id, deleted_at, deletion_id
+            ),
+            'has_more': more_cars or more_deletions,
+        },
+    )
+
+
+@router.get(
+    path='/events',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            'content': {'text/event-stream': {}},
+            'description': 'Stream de eventos car.created, car.updated e '
+            'car.deleted',
+        }
+    },
+    summary='Acompanhar alterações de carros',
+)
+async def stream_car_events(current_user: User = Depends(get_current_user)):
+    return StreamingResponse(
+        events.get_event_broker().stream(current_user.id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @router.get(
@@ -149,12 +669,17 @@ async def list_cars(
 )
 async def get_car(
     car_id: int,
+    fieldset: Tuple[Tuple[str, ...], Tuple[str, ...]] = Depends(
+        get_car_fieldset
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
+    fields, embed = fieldset
+
     result = await db.execute(
         select(Car)
-        .options(selectinload(Car.brand), selectinload(Car.owner))
+        .options(*_car_load_options(fields, embed, required=('owner_id',)))
         .where(Car.id == car_id)
     )
     car = result.scalar_one_or_none()
@@ -167,7 +692,10 @@ async def get_car(
 
     verify_car_ownership(current_user, car.owner_id)
 
-    return car
+    if 'owner' in embed:
+        set_committed_value(car, 'owner', current_user)
+
+    return model_response(car_public_schema(fields, embed), car)
 
 
 @router.put(
@@ -224,6 +752,8 @@ async def update_car(
     for field, value in update_data.items():
         setattr(car, field, value)
 
+    _invalidate_price_distribution(db, current_user.id)
+    _index_car(db, car)
     await db.commit()
     await db.refresh(car)
 
@@ -233,8 +763,9 @@ async def update_car(
         .where(Car.id == car_id)
     )
     car_with_relations = result.scalar_one()
+    _publish_car_event(db, 'car.updated', car_with_relations)
 
-    return car_with_relations
+    return model_response(CarPublicSchema, car_with_relations)
 
 
 @router.delete(
@@ -257,5 +788,12 @@ async def delete_car(
 
     verify_car_ownership(current_user, car.owner_id)
 
+    db.add(CarDeletion(car_id=car.id, owner_id=car.owner_id))
     await db.delete(car)
+    _invalidate_price_distribution(db, current_user.id)
+    database.after_commit(db, partial(suggest.get_car_index().remove, car_id))
     await db.commit()
+
+    events.publish(
+        db, current_user.id, 'car.deleted', json.dumps({'id': car_id})
+    )
@@ -1,20 +1,33 @@
+from functools import partial
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from car_api.core import database, suggest
 from car_api.core.database import get_session
+from car_api.core.responses import model_response, ordered_batch
+from car_api.core.routing import InstrumentedRoute
 from car_api.core.security import get_current_user, get_password_hash
+from car_api.core.sorting import order_by
 from car_api.models.users import User
+from car_api.schemas.batch import BatchGetSchema
 from car_api.schemas.users import (
+    UserBatchPublicSchema,
     UserListPublicSchema,
     UserPublicSchema,
     UserSchema,
     UserUpdateSchema,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+USER_SORTS = {
+    'id': (User.id,),
+    'username': (User.username,),
+    'email': (User.email,),
+}
 
 
 @router.post(
@@ -55,7 +68,7 @@ async def create_user(
     await db.commit()
     await db.refresh(db_user)
 
-    return db_user
+    return model_response(UserPublicSchema, db_user, status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -67,6 +80,11 @@ async def create_user(
 async def list_users(
     offset: int = Query(0, ge=0, description='Número de registros para pular'),
     limit: int = Query(100, ge=1, le=100, description='Limite de registros'),
+    sort: str = Query(
+        'id',
+        description='Ordenação: id, username ou email; prefixo - para '
+        'decrescente',
+    ),
     search: Optional[str] = Query(
         None, description='Buscar por username ou email'
     ),
@@ -81,12 +99,34 @@ async def list_users(
             | (User.email.ilike(search_filter))
         )
 
+    query = query.order_by(*order_by(sort, USER_SORTS))
     query = query.offset(offset).limit(limit)
 
     result = await db.execute(query)
     users = result.scalars().all()
 
-    return {'users': users, 'offset': offset, 'limit': limit}
+    return model_response(
+        UserListPublicSchema,
+        {'users': users, 'offset': offset, 'limit': limit},
+    )
+
+
+@router.post(
+    path='/batch-get',
+    status_code=status.HTTP_200_OK,
+    response_model=UserBatchPublicSchema,
+    summary='Buscar usuários por lista de IDs',
+)
+async def batch_get_users(
+    batch: BatchGetSchema,
+    db: AsyncSession = Depends(get_session),
+):
+    result = await db.execute(select(User).where(User.id.in_(set(batch.ids))))
+    users, missing = ordered_batch(batch.ids, result.scalars().all())
+
+    return model_response(
+        UserBatchPublicSchema, {'users': users, 'missing': missing}
+    )
 
 
 @router.get(
@@ -107,7 +147,7 @@ async def get_user(
             detail='Usuário não encontrado',
         )
 
-    return user
+    return model_response(UserPublicSchema, user)
 
 
 @router.put(
@@ -170,7 +210,7 @@ async def update_user(
     await db.commit()
     await db.refresh(user)
 
-    return user
+    return model_response(UserPublicSchema, user)
 
 
 @router.delete(
@@ -192,4 +232,7 @@ async def delete_user(
         )
 
     await db.delete(user)
+    database.after_commit(
+        db, partial(suggest.get_car_index().remove_scope, user_id)
+    )
     await db.commit()
@@ -0,0 +1,57 @@
+from enum import Enum
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, field_validator
+
+MAX_BATCH_IDS = 100
+MAX_BATCH_OPERATIONS = 50
+
+
+class BatchGetSchema(BaseModel):
+    ids: List[int]
+
+    @field_validator('ids')
+    def ids_length(cls, v):
+        if not v:
+            raise ValueError('Informe pelo menos um id')
+        if len(v) > MAX_BATCH_IDS:
+            raise ValueError(f'Informe no máximo {MAX_BATCH_IDS} ids')
+        return v
+
+
+class BatchMethod(str, Enum):
+    GET = 'GET'
+    POST = 'POST'
+    PUT = 'PUT'
+    DELETE = 'DELETE'
+
+
+class BatchOperationSchema(BaseModel):
+    method: BatchMethod
+    path: str
+    body: Optional[Any] = None
+
+
+class BatchSchema(BaseModel):
+    operations: List[BatchOperationSchema]
+    atomic: bool = True
+
+    @field_validator('operations')
+    def operations_length(cls, v):
+        if not v:
+            raise ValueError('Informe pelo menos uma operação')
+        if len(v) > MAX_BATCH_OPERATIONS:
+            raise ValueError(
+                f'Informe no máximo {MAX_BATCH_OPERATIONS} operações'
+            )
+        return v
+
+
+class BatchResultSchema(BaseModel):
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchPublicSchema(BaseModel):
+    results: List[BatchResultSchema]
+    committed: bool
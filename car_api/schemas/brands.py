@@ -43,3 +43,8 @@ class BrandListPublicSchema(BaseModel):
     brands: List[BrandPublicSchema]
     offset: int
     limit: int
+
+
+class BrandBatchPublicSchema(BaseModel):
+    brands: List[Optional[BrandPublicSchema]]
+    missing: List[int]
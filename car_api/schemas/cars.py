@@ -1,8 +1,10 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type, Union
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, create_model, field_validator
 
 from car_api.models.cars import FuelType, TransmissionType
 from car_api.schemas.brands import BrandPublicSchema
@@ -101,7 +103,7 @@ class CarUpdateSchema(BaseModel):
         return v
 
 
-class CarPublicSchema(BaseModel):
+class CarFlatPublicSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
@@ -119,11 +121,157 @@ class CarPublicSchema(BaseModel):
     owner_id: int
     created_at: datetime
     updated_at: Optional[datetime]
+
+
+class CarPublicSchema(CarFlatPublicSchema):
     brand: BrandPublicSchema
     owner: UserPublicSchema
 
 
+class CarFilterSchema(BaseModel):
+    search: Optional[str] = None
+    brand_id: Optional[int] = None
+    fuel_type: Optional[FuelType] = None
+    transmission: Optional[TransmissionType] = None
+    is_available: Optional[bool] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
 class CarListPublicSchema(BaseModel):
     cars: List[CarPublicSchema]
     offset: int
     limit: int
+
+
+class CarTombstoneSchema(BaseModel):
+    id: int
+    deleted_at: datetime
+
+
+class CarChangesPublicSchema(BaseModel):
+    cars: List[CarFlatPublicSchema]
+    deleted: List[CarTombstoneSchema]
+    next_token: str
+    has_more: bool
+
+
+class CarFacetCountSchema(BaseModel):
+    value: Union[bool, int, str]
+    count: int
+
+
+class CarYearFacetSchema(BaseModel):
+    start: int
+    end: int
+    count: int
+
+
+class CarFacetsPublicSchema(BaseModel):
+    total: int
+    brand_id: List[CarFacetCountSchema]
+    fuel_type: List[CarFacetCountSchema]
+    transmission: List[CarFacetCountSchema]
+    is_available: List[CarFacetCountSchema]
+    model_year: List[CarYearFacetSchema]
+
+
+class CarPriceStatsSchema(BaseModel):
+    count: int
+    min: Optional[float]
+    max: Optional[float]
+    p10: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+    histogram: List[int]
+
+
+class CarPriceGroupSchema(CarPriceStatsSchema):
+    brand_id: int
+    model_year: int
+
+
+class CarPriceDistributionSchema(BaseModel):
+    edges: List[float]
+    overall: CarPriceStatsSchema
+    groups: List[CarPriceGroupSchema]
+
+
+class CarListFormat(str, Enum):
+    EMBEDDED = 'embedded'
+    NORMALIZED = 'normalized'
+
+
+CAR_EMBEDS = ('brand', 'owner')
+CAR_FIELDS = tuple(
+    name for name in CarPublicSchema.model_fields if name not in CAR_EMBEDS
+)
+
+
+@lru_cache
+def car_public_schema(
+    fields: Tuple[str, ...] = CAR_FIELDS, embed: Tuple[str, ...] = CAR_EMBEDS
+) -> Type[BaseModel]:
+    if set(fields) == set(CAR_FIELDS) and set(embed) == set(CAR_EMBEDS):
+        return CarPublicSchema
+
+    selected = {'id', *fields, *embed}
+    return create_model(
+        'CarPartialPublicSchema',
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, ...)
+            for name, field in CarPublicSchema.model_fields.items()
+            if name in selected
+        },
+    )
+
+
+@lru_cache
+def car_list_public_schema(
+    fields: Tuple[str, ...] = CAR_FIELDS, embed: Tuple[str, ...] = CAR_EMBEDS
+) -> Type[BaseModel]:
+    car_schema = car_public_schema(fields, embed)
+    if car_schema is CarPublicSchema:
+        return CarListPublicSchema
+
+    return create_model(
+        'CarPartialListPublicSchema',
+        cars=(List[car_schema], ...),
+        offset=(int, ...),
+        limit=(int, ...),
+    )
+
+
+@lru_cache
+def car_batch_public_schema(
+    fields: Tuple[str, ...] = CAR_FIELDS, embed: Tuple[str, ...] = CAR_EMBEDS
+) -> Type[BaseModel]:
+    car_schema = car_public_schema(fields, embed)
+    return create_model(
+        'CarBatchPublicSchema',
+        cars=(List[Optional[car_schema]], ...),
+        missing=(List[int], ...),
+    )
+
+
+@lru_cache
+def car_normalized_list_public_schema(
+    fields: Tuple[str, ...] = CAR_FIELDS, embed: Tuple[str, ...] = CAR_EMBEDS
+) -> Type[BaseModel]:
+    car_schema = car_public_schema(
+        tuple(sorted({*fields, 'brand_id', 'owner_id'})), ()
+    )
+    related = {}
+    if 'brand' in embed:
+        related['brands'] = (Dict[int, BrandPublicSchema], ...)
+    if 'owner' in embed:
+        related['users'] = (Dict[int, UserPublicSchema], ...)
+
+    return create_model(
+        'CarNormalizedListPublicSchema',
+        cars=(List[car_schema], ...),
+        **related,
+        offset=(int, ...),
+        limit=(int, ...),
+    )
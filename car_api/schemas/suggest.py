@@ -0,0 +1,13 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class SuggestionSchema(BaseModel):
+    field: str
+    value: str
+    count: int
+
+
+class SuggestPublicSchema(BaseModel):
+    suggestions: List[SuggestionSchema]
@@ -54,3 +54,8 @@ class UserListPublicSchema(BaseModel):
     users: List[UserPublicSchema]
     offset: int
     limit: int
+
+
+class UserBatchPublicSchema(BaseModel):
+    users: List[Optional[UserPublicSchema]]
+    missing: List[int]
@@ -0,0 +1,243 @@
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+import uvicorn
+from anyio import to_thread
+
+from car_api.core.metrics import REGISTRY
+from car_api.core.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+STARTUP_FAILURE = 3
+RESTART_BACKOFF = 0.5
+MAX_RESTART_BACKOFF = 30.0
+
+
+class WorkerServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, thread_limit: int):
+        super().__init__(config)
+        self.thread_limit = thread_limit
+
+    async def startup(self, sockets: Optional[list] = None) -> None:
+        limiter = to_thread.current_default_thread_limiter()
+        limiter.total_tokens = self.thread_limit
+        await super().startup(sockets=sockets)
+
+
+def cpu_count() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+SHARED_STORES = {
+    'IDEMPOTENCY_STORE': (
+        'repetições que caírem em outro worker serão executadas novamente'
+    ),
+    'RATE_LIMIT_STORE': (
+        'cada worker aplica o limite separadamente, multiplicando-o'
+    ),
+}
+
+
+def resolve_stores(settings: Settings, workers: int) -> None:
+    for name, consequence in SHARED_STORES.items():
+        store = getattr(settings, name)
+        if not store:
+            setattr(settings, name, 'memory' if workers == 1 else 'database')
+        elif store == 'memory' and workers > 1:
+            logger.warning(
+                '%s=memory com %d workers: %s', name, workers, consequence
+            )
+
+
+def prepare_metrics_dir(settings: Settings, workers: int) -> Optional[str]:
+    if workers == 1:
+        return None
+    if not settings.METRICS_DIR:
+        settings.METRICS_DIR = tempfile.mkdtemp(prefix='car-api-metrics-')
+        return settings.METRICS_DIR
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob('*.json'):
+        path.unlink()
+    return None
+
+
+def build_config(settings: Settings) -> uvicorn.Config:
+    return uvicorn.Config(
+        'car_api.app:app',
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        loop='uvloop',
+        http='httptools',
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        access_log=settings.SERVER_ACCESS_LOG,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        server_header=False,
+    )
+
+
+def run_worker(
+    config: uvicorn.Config, sock: socket.socket, thread_limit: int
+) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    server = WorkerServer(config, thread_limit)
+    server.run(sockets=[sock])
+    if not server.started:
+        sys.exit(STARTUP_FAILURE)
+
+
+def spawn_worker(
+    config: uvicorn.Config, sock: socket.socket, thread_limit: int
+) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            run_worker(config, sock, thread_limit)
+            code = 0
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            os._exit(code)
+    return pid
+
+
+def restart_delay(failures: int) -> float:
+    return min(MAX_RESTART_BACKOFF, RESTART_BACKOFF * 2 ** (failures - 1))
+
+
+def supervise(
+    config: uvicorn.Config,
+    sock: socket.socket,
+    workers: int,
+    thread_limit: int,
+    max_crashes: int = 10,
+    crash_window: float = 60.0,
+    metrics_dir: str = '',
+) -> int:
+    children: Dict[int, Tuple[int, float]] = {}
+    failures: Dict[int, int] = {}
+    crashes: Deque[float] = deque()
+    stopping = threading.Event()
+    gave_up = False
+
+    def stop_children() -> None:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def stop(signum, frame):
+        stopping.set()
+        stop_children()
+
+    def spawn(index: int) -> None:
+        pid = spawn_worker(config, sock, thread_limit)
+        children[pid] = (index, time.monotonic())
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index in range(workers):
+        spawn(index)
+
+    while children:
+        try:
+            pid, wait_status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        child = children.pop(pid, None)
+        if child is not None and metrics_dir:
+            REGISTRY.retire(metrics_dir, pid)
+        if child is None or stopping.is_set() or gave_up:
+            continue
+
+        index, started = child
+        now = time.monotonic()
+        logger.warning(
+            'Worker %d (pid %d) saiu com status %d',
+            index,
+            pid,
+            os.waitstatus_to_exitcode(wait_status),
+        )
+        crashes.append(now)
+        while crashes and crashes[0] < now - crash_window:
+            crashes.popleft()
+        if len(crashes) > max_crashes:
+            logger.error(
+                '%d falhas de workers em %.0f s, encerrando o servidor',
+                len(crashes),
+                crash_window,
+            )
+            gave_up = True
+            stop_children()
+            continue
+
+        failures[index] = (
+            1 if now - started >= crash_window else failures.get(index, 0) + 1
+        )
+        if not stopping.wait(restart_delay(failures[index])):
+            spawn(index)
+
+    return 1 if gave_up else 0
+
+
+def main() -> None:
+    settings = get_settings()
+    workers = settings.SERVER_WORKERS or cpu_count()
+    resolve_stores(settings, workers)
+    temporary_metrics_dir = prepare_metrics_dir(settings, workers)
+
+    config = build_config(settings)
+    config.load()
+    sock = config.bind_socket()
+
+    gc.collect()
+    gc.freeze()
+
+    code = 0
+    if workers == 1 or not hasattr(os, 'fork'):
+        run_worker(config, sock, settings.SERVER_THREAD_LIMIT)
+    else:
+        code = supervise(
+            config,
+            sock,
+            workers,
+            settings.SERVER_THREAD_LIMIT,
+            settings.SERVER_MAX_CRASHES,
+            settings.SERVER_CRASH_WINDOW,
+            settings.METRICS_DIR,
+        )
+
+    sock.close()
+    if temporary_metrics_dir:
+        shutil.rmtree(temporary_metrics_dir, ignore_errors=True)
+    sys.exit(code)
+
+
+if __name__ == '__main__':
+    main()
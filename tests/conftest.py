@@ -3,9 +3,18 @@ from decimal import Decimal
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from car_api.app import app
+from car_api.core import (
+    concurrency,
+    database,
+    idempotency,
+    price_distribution,
+    rate_limit,
+    suggest,
+)
 from car_api.core.database import get_session
 from car_api.core.security import create_access_token, get_password_hash
 from car_api.models import Base
@@ -13,6 +22,43 @@ from car_api.models.cars import Brand, Car, FuelType, TransmissionType
 from car_api.models.users import User
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    rate_limit.get_rate_limiter.cache_clear()
+    yield
+    rate_limit.get_rate_limiter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_concurrency_limiter():
+    concurrency.get_concurrency_limiter.cache_clear()
+    yield
+    concurrency.get_concurrency_limiter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_idempotency_store():
+    idempotency.get_idempotency_store.cache_clear()
+    yield
+    idempotency.get_idempotency_store.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_price_distribution_cache():
+    price_distribution.get_price_distribution_cache.cache_clear()
+    yield
+    price_distribution.get_price_distribution_cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_suggest_indexes():
+    suggest.get_car_index.cache_clear()
+    suggest.get_brand_index.cache_clear()
+    yield
+    suggest.get_car_index.cache_clear()
+    suggest.get_brand_index.cache_clear()
+
+
 @pytest_asyncio.fixture
 async def session():
     engine = create_async_engine(
@@ -32,7 +78,7 @@ async def session():
 @pytest.fixture
 def client(session):
     def get_session_override():
-        return session
+        return database.current_session.get() or session
 
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
@@ -41,6 +87,19 @@ def client(session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def sql_statements(session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
 @pytest_asyncio.fixture
 async def user_data():
     return {
@@ -0,0 +1,242 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import func, select
+
+from car_api.core import events
+from car_api.core.events import EventBroker
+from car_api.models.cars import Brand, Car
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = EventBroker()
+    monkeypatch.setattr(events, 'get_event_broker', lambda: broker)
+    return broker
+
+
+def car_payload(brand_id, plate='BAT1234'):
+    return {
+        'model': 'Corolla',
+        'factory_year': 2023,
+        'model_year': 2023,
+        'color': 'White',
+        'plate': plate,
+        'fuel_type': 'flex',
+        'transmission': 'manual',
+        'price': 50000.00,
+        'is_available': True,
+        'brand_id': brand_id,
+    }
+
+
+def test_batch_atomic_resolves_references(client, auth_headers):
+    operations = [
+        {
+            'method': 'POST',
+            'path': '/api/v1/brands/',
+            'body': {'name': 'Fiat', 'is_active': True},
+        },
+        {
+            'method': 'POST',
+            'path': '/api/v1/cars/',
+            'body': car_payload({'$ref': '0.id'}),
+        },
+        {
+            'method': 'PUT',
+            'path': '/api/v1/cars/{1.id}',
+            'body': {'color': 'Red'},
+        },
+        {'method': 'GET', 'path': '/api/v1/brands/{0.id}'},
+    ]
+
+    response = client.post(
+        '/api/v1/batch/',
+        json={'operations': operations},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['committed'] is True
+    assert [result['status'] for result in data['results']] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.CREATED,
+        HTTPStatus.OK,
+        HTTPStatus.OK,
+    ]
+    brand_id = data['results'][0]['body']['id']
+    assert data['results'][1]['body']['brand_id'] == brand_id
+    assert data['results'][2]['body']['color'] == 'Red'
+    assert data['results'][3]['body']['name'] == 'Fiat'
+
+    car = client.get(
+        f'/api/v1/cars/{data["results"][1]["body"]["id"]}',
+        headers=auth_headers,
+    )
+    assert car.json()['color'] == 'Red'
+
+
+@pytest.mark.asyncio
+async def test_batch_atomic_failure_rolls_back(
+    client, auth_headers, session, car
+):
+    operations = [
+        {
+            'method': 'POST',
+            'path': '/api/v1/brands/',
+            'body': {'name': 'Fiat', 'is_active': True},
+        },
+        {
+            'method': 'POST',
+            'path': '/api/v1/cars/',
+            'body': car_payload({'$ref': '0.id'}, plate=car.plate),
+        },
+        {'method': 'DELETE', 'path': f'/api/v1/cars/{car.id}'},
+    ]
+
+    response = client.post(
+        '/api/v1/batch/',
+        json={'operations': operations},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['committed'] is False
+    assert [result['status'] for result in data['results']] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.FAILED_DEPENDENCY,
+    ]
+    assert (
+        await session.scalar(
+            select(func.count()).select_from(Brand).where(Brand.name == 'Fiat')
+        )
+        == 0
+    )
+    assert await session.scalar(select(func.count()).select_from(Car)) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_non_atomic_keeps_successful_operations(
+    client, auth_headers, session, car
+):
+    operations = [
+        {'method': 'DELETE', 'path': '/api/v1/cars/999'},
+        {'method': 'DELETE', 'path': f'/api/v1/cars/{car.id}'},
+    ]
+
+    response = client.post(
+        '/api/v1/batch/',
+        json={'operations': operations, 'atomic': False},
+        headers=auth_headers,
+    )
+
+    data = response.json()
+    assert data['committed'] is True
+    assert [result['status'] for result in data['results']] == [
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.NO_CONTENT,
+    ]
+    assert await session.scalar(select(func.count()).select_from(Car)) == 0
+
+
+def test_batch_rejects_invalid_reference_and_blocked_path(
+    client, auth_headers
+):
+    operations = [
+        {'method': 'GET', 'path': '/api/v1/cars/{3.id}'},
+        {'method': 'GET', 'path': '/api/v1/cars/events'},
+        {'method': 'POST', 'path': '/api/v1/batch/', 'body': {}},
+        {'method': 'GET', 'path': '/metrics'},
+    ]
+
+    response = client.post(
+        '/api/v1/batch/',
+        json={'operations': operations, 'atomic': False},
+        headers=auth_headers,
+    )
+
+    results = response.json()['results']
+    assert results[0] == {
+        'status': HTTPStatus.BAD_REQUEST,
+        'body': {'detail': 'Referência inválida: 3.id'},
+    }
+    assert all(
+        result
+        == {
+            'status': HTTPStatus.BAD_REQUEST,
+            'body': {'detail': 'Operação não permitida em lote'},
+        }
+        for result in results[1:]
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_treats_redirect_as_failure(
+    client, auth_headers, session, brand
+):
+    operations = [
+        {
+            'method': 'POST',
+            'path': '/api/v1/brands/',
+            'body': {'name': 'Fiat', 'is_active': True},
+        },
+        {
+            'method': 'POST',
+            'path': '/api/v1/cars',
+            'body': car_payload(brand.id),
+        },
+    ]
+
+    response = client.post(
+        '/api/v1/batch/',
+        json={'operations': operations},
+        headers=auth_headers,
+    )
+
+    data = response.json()
+    assert data['committed'] is False
+    assert [result['status'] for result in data['results']] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.TEMPORARY_REDIRECT,
+    ]
+    assert await session.scalar(select(func.count()).select_from(Brand)) == 1
+
+
+def test_batch_requires_operations(client, auth_headers):
+    response = client.post(
+        '/api/v1/batch/', json={'operations': []}, headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_batch_publishes_events_after_commit(
+    client, auth_headers, broker, user, car
+):
+    subscription = broker.subscribe(user.id)
+    operations = [
+        {
+            'method': 'PUT',
+            'path': f'/api/v1/cars/{car.id}',
+            'body': {'color': 'Blue'},
+        },
+        {'method': 'DELETE', 'path': '/api/v1/cars/999'},
+    ]
+
+    client.post(
+        '/api/v1/batch/',
+        json={'operations': operations},
+        headers=auth_headers,
+    )
+    assert subscription.queue.empty()
+
+    operations.pop()
+    client.post(
+        '/api/v1/batch/',
+        json={'operations': operations},
+        headers=auth_headers,
+    )
+    assert subscription.queue.qsize() == 1
@@ -573,3 +573,34 @@ def test_update_brand_with_refresh_after_commit(client, auth_headers):
     data = response.json()
     assert data['description'] == update_data['description']
     assert data['name'] == brand_data['name']
+
+
+def test_batch_get_brands(client, auth_headers, brand, second_brand):
+    response = client.post(
+        '/api/v1/brands/batch-get',
+        json={'ids': [second_brand.id, 999, brand.id]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert [item and item['name'] for item in data['brands']] == [
+        'Honda',
+        None,
+        'Toyota',
+    ]
+    assert data['missing'] == [999]
+
+
+def test_list_brands_sorted_by_name(client, auth_headers, brand, second_brand):
+    response = client.get(
+        '/api/v1/brands/', params={'sort': '-name'}, headers=auth_headers
+    )
+
+    names = [item['name'] for item in response.json()['brands']]
+    assert names == ['Toyota', 'Honda']
+
+    response = client.get(
+        '/api/v1/brands/', params={'sort': 'price'}, headers=auth_headers
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
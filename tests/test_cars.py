@@ -1,9 +1,16 @@
+from datetime import timedelta
 from decimal import Decimal
 from http import HTTPStatus
 
 import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
 
+from car_api.core.settings import get_settings
+from car_api.core.sorting import order_by
 from car_api.models.cars import Car, FuelType, TransmissionType
+from car_api.routers.cars import CAR_SORTS, car_facets_query
+from car_api.schemas.cars import CarFilterSchema
 
 
 def test_create_car_success(client, auth_headers, brand):
@@ -1026,3 +1033,492 @@ def test_update_car_model_too_short_validation(client, auth_headers, car):
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
     data = response.json()
     assert 'Modelo deve ter pelo menos 2 caracteres' in str(data['detail'])
+
+
+def test_list_cars_sparse_fields(client, auth_headers, car):
+    response = client.get(
+        '/api/v1/cars/?fields=model,price&embed=', headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['cars'] == [
+        {'id': car.id, 'model': 'Corolla', 'price': '50000.00'}
+    ]
+
+
+def test_list_cars_embed_owner_reuses_current_user(
+    client, auth_headers, user, car, sql_statements
+):
+    response = client.get(
+        '/api/v1/cars/?fields=model&embed=owner', headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()['cars'][0]
+    assert set(data) == {'id', 'model', 'owner'}
+    assert data['owner']['id'] == user.id
+
+    car_queries = [s for s in sql_statements if 'FROM cars' in s]
+    assert len(car_queries) == 1
+    assert not any('FROM brands' in s for s in sql_statements)
+    assert sum('FROM users' in s for s in sql_statements) == 1
+
+
+def test_list_cars_default_embeds_brand_and_owner(
+    client, auth_headers, car, sql_statements
+):
+    response = client.get('/api/v1/cars/', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()['cars'][0]
+    assert data['brand']['name'] == 'Toyota'
+    assert data['owner']['username'] == 'testuser'
+    assert sum('FROM brands' in s for s in sql_statements) == 1
+    assert sum('FROM users' in s for s in sql_statements) == 1
+
+
+def test_list_cars_invalid_field(client, auth_headers):
+    response = client.get(
+        '/api/v1/cars/?fields=model,password', headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['detail'] == 'Campo inválido: password'
+
+
+def test_list_cars_invalid_embed(client, auth_headers):
+    response = client.get('/api/v1/cars/?embed=dealer', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['detail'] == 'Relação inválida: dealer'
+
+
+def test_get_car_sparse_fields_with_brand(client, auth_headers, car):
+    response = client.get(
+        f'/api/v1/cars/{car.id}?fields=plate&embed=brand',
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert set(data) == {'id', 'plate', 'brand'}
+    assert data['brand']['id'] == car.brand_id
+
+
+def test_list_cars_normalized_format(
+    client, auth_headers, user, brand, second_brand, car, sql_statements
+):
+    client.post(
+        '/api/v1/cars/',
+        json={
+            'model': 'Civic',
+            'factory_year': 2022,
+            'model_year': 2022,
+            'color': 'Black',
+            'plate': 'XYZ5678',
+            'fuel_type': 'gasoline',
+            'transmission': 'automatic',
+            'price': 45000.00,
+            'brand_id': second_brand.id,
+        },
+        headers=auth_headers,
+    )
+    sql_statements.clear()
+
+    response = client.get(
+        '/api/v1/cars/?format=normalized', headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert len(data['cars']) == 2
+    assert 'brand' not in data['cars'][0]
+    assert 'owner' not in data['cars'][0]
+    assert {c['brand_id'] for c in data['cars']} == {brand.id, second_brand.id}
+    assert set(data['brands']) == {str(brand.id), str(second_brand.id)}
+    assert list(data['users']) == [str(user.id)]
+    assert data['users'][str(user.id)]['username'] == 'testuser'
+    assert sum('FROM brands' in s for s in sql_statements) == 1
+
+
+def test_list_cars_normalized_without_embeds(client, auth_headers, car):
+    response = client.get(
+        '/api/v1/cars/?format=normalized&embed=&fields=model',
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'cars': [
+            {
+                'id': car.id,
+                'model': 'Corolla',
+                'brand_id': car.brand_id,
+                'owner_id': car.owner_id,
+            }
+        ],
+        'offset': 0,
+        'limit': 100,
+    }
+
+
+def test_list_cars_normalized_empty(client, auth_headers):
+    response = client.get(
+        '/api/v1/cars/?format=normalized', headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'cars': [],
+        'brands': {},
+        'users': {},
+        'offset': 0,
+        'limit': 100,
+    }
+
+
+def test_list_cars_invalid_format(client, auth_headers):
+    response = client.get('/api/v1/cars/?format=xml', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.fixture
+def changes_window(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'CHANGES_SAFETY_WINDOW', 0.0)
+    return settings
+
+
+def test_car_changes_initial_sync(
+    client, auth_headers, car, second_user_car, changes_window
+):
+    response = client.get('/api/v1/cars/changes', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert [item['id'] for item in data['cars']] == [car.id]
+    assert 'brand' not in data['cars'][0]
+    assert data['deleted'] == []
+    assert data['has_more'] is False
+    assert data['next_token']
+
+
+def test_car_changes_paginates(client, auth_headers, car_data, changes_window):
+    payload = {**car_data, 'price': str(car_data['price'])}
+    created = [
+        client.post(
+            '/api/v1/cars/',
+            json={**payload, 'plate': f'ABC123{index}'},
+            headers=auth_headers,
+        ).json()['id']
+        for index in range(3)
+    ]
+
+    seen = []
+    params = {'limit': 2}
+    while True:
+        data = client.get(
+            '/api/v1/cars/changes', params=params, headers=auth_headers
+        ).json()
+        seen.extend(item['id'] for item in data['cars'])
+        params['since'] = data['next_token']
+        if not data['has_more']:
+            break
+
+    assert seen == created
+
+
+def test_car_changes_include_tombstones(
+    client, auth_headers, car, changes_window
+):
+    token = client.get('/api/v1/cars/changes', headers=auth_headers).json()[
+        'next_token'
+    ]
+    client.delete(f'/api/v1/cars/{car.id}', headers=auth_headers)
+
+    response = client.get(
+        '/api/v1/cars/changes',
+        params={'since': token},
+        headers=auth_headers,
+    )
+
+    data = response.json()
+    assert data['cars'] == []
+    assert [item['id'] for item in data['deleted']] == [car.id]
+
+    data = client.get(
+        '/api/v1/cars/changes',
+        params={'since': data['next_token']},
+        headers=auth_headers,
+    ).json()
+    assert data['deleted'] == []
+
+
+@pytest.mark.asyncio
+async def test_car_changes_include_updates(
+    client, auth_headers, session, car, changes_window
+):
+    now = await session.scalar(select(func.now()))
+    car.updated_at = now - timedelta(minutes=2)
+    await session.commit()
+
+    token = client.get('/api/v1/cars/changes', headers=auth_headers).json()[
+        'next_token'
+    ]
+    client.put(
+        f'/api/v1/cars/{car.id}',
+        json={'color': 'Blue'},
+        headers=auth_headers,
+    )
+
+    data = client.get(
+        '/api/v1/cars/changes',
+        params={'since': token},
+        headers=auth_headers,
+    ).json()
+
+    assert [item['color'] for item in data['cars']] == ['Blue']
+
+
+@pytest.mark.asyncio
+async def test_car_changes_wait_for_late_commits(
+    client, auth_headers, session, user, car, changes_window
+):
+    def changed_car(plate, updated_at):
+        return Car(
+            model='Yaris',
+            factory_year=2020,
+            model_year=2020,
+            color='Red',
+            plate=plate,
+            fuel_type=FuelType.FLEX,
+            transmission=TransmissionType.MANUAL,
+            price=Decimal('40000.00'),
+            is_available=True,
+            brand_id=car.brand_id,
+            owner_id=user.id,
+            updated_at=updated_at,
+        )
+
+    now = await session.scalar(select(func.now()))
+    car.updated_at = now - timedelta(minutes=2)
+    recent = changed_car('CHG0001', now)
+    session.add(recent)
+    await session.commit()
+
+    changes_window.CHANGES_SAFETY_WINDOW = 60.0
+    data = client.get('/api/v1/cars/changes', headers=auth_headers).json()
+    assert [item['id'] for item in data['cars']] == [car.id]
+
+    late = changed_car('CHG0002', now - timedelta(seconds=30))
+    session.add(late)
+    await session.commit()
+
+    changes_window.CHANGES_SAFETY_WINDOW = 0.0
+    data = client.get(
+        '/api/v1/cars/changes',
+        params={'since': data['next_token']},
+        headers=auth_headers,
+    ).json()
+    assert [item['id'] for item in data['cars']] == [late.id, recent.id]
+
+
+def test_car_changes_invalid_token(client, auth_headers):
+    response = client.get(
+        '/api/v1/cars/changes',
+        params={'since': 'not-a-token'},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['detail'] == 'Token de sincronização inválido'
+
+
+def test_batch_get_cars_preserves_order_and_ownership(
+    client, auth_headers, car, second_user_car
+):
+    response = client.post(
+        '/api/v1/cars/batch-get?fields=model&embed=',
+        json={'ids': [999, car.id, second_user_car.id, car.id]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'cars': [
+            None,
+            {'id': car.id, 'model': 'Corolla'},
+            None,
+            {'id': car.id, 'model': 'Corolla'},
+        ],
+        'missing': [999, second_user_car.id],
+    }
+
+
+def test_batch_get_cars_single_query(
+    client, auth_headers, car, sql_statements
+):
+    response = client.post(
+        '/api/v1/cars/batch-get',
+        json={'ids': [car.id]},
+        headers=auth_headers,
+    )
+
+    assert response.json()['cars'][0]['brand']['name'] == 'Toyota'
+    car_queries = [s for s in sql_statements if 'FROM cars' in s]
+    assert len(car_queries) == 1
+    assert 'IN' in car_queries[0]
+
+
+def test_batch_get_cars_rejects_empty_list(client, auth_headers):
+    response = client.post(
+        '/api/v1/cars/batch-get', json={'ids': []}, headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_car_facets_counts_filtered_cars(
+    client, auth_headers, session, user, car, second_brand, second_user_car
+):
+    session.add_all([
+        Car(
+            model='Fit',
+            factory_year=2019,
+            model_year=2019,
+            color='Blue',
+            plate='FCT0001',
+            fuel_type=FuelType.FLEX,
+            transmission=TransmissionType.CVT,
+            price=Decimal('30000.00'),
+            is_available=False,
+            brand_id=second_brand.id,
+            owner_id=user.id,
+        ),
+        Car(
+            model='Corolla Cross',
+            factory_year=2021,
+            model_year=2021,
+            color='Gray',
+            plate='FCT0002',
+            fuel_type=FuelType.HYBRID,
+            transmission=TransmissionType.AUTOMATIC,
+            price=Decimal('60000.00'),
+            is_available=True,
+            brand_id=car.brand_id,
+            owner_id=user.id,
+        ),
+    ])
+    await session.commit()
+
+    response = client.get('/api/v1/cars/facets', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'total': 3,
+        'brand_id': [
+            {'value': car.brand_id, 'count': 2},
+            {'value': second_brand.id, 'count': 1},
+        ],
+        'fuel_type': [
+            {'value': 'flex', 'count': 2},
+            {'value': 'hybrid', 'count': 1},
+        ],
+        'transmission': [
+            {'value': 'automatic', 'count': 1},
+            {'value': 'cvt', 'count': 1},
+            {'value': 'manual', 'count': 1},
+        ],
+        'is_available': [
+            {'value': False, 'count': 1},
+            {'value': True, 'count': 2},
+        ],
+        'model_year': [
+            {'start': 2015, 'end': 2019, 'count': 1},
+            {'start': 2020, 'end': 2024, 'count': 2},
+        ],
+    }
+
+    response = client.get(
+        '/api/v1/cars/facets',
+        params={'is_available': True, 'year_bucket': 1},
+        headers=auth_headers,
+    )
+
+    data = response.json()
+    assert data['total'] == 2
+    assert data['is_available'] == [{'value': True, 'count': 2}]
+    assert data['model_year'] == [
+        {'start': 2021, 'end': 2021, 'count': 1},
+        {'start': 2023, 'end': 2023, 'count': 1},
+    ]
+
+
+def test_car_facets_use_grouping_sets_on_postgres():
+    query = car_facets_query(
+        CarFilterSchema(), owner_id=1, year_bucket=5, grouping_sets=True
+    )
+
+    assert 'GROUPING SETS' in str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_list_cars_sorted(client, auth_headers, session, user, car):
+    session.add(
+        Car(
+            model='Yaris',
+            factory_year=2020,
+            model_year=2020,
+            color='Red',
+            plate='SRT0001',
+            fuel_type=FuelType.FLEX,
+            transmission=TransmissionType.MANUAL,
+            price=Decimal('40000.00'),
+            is_available=True,
+            brand_id=car.brand_id,
+            owner_id=user.id,
+        )
+    )
+    await session.commit()
+
+    def models(sort):
+        response = client.get(
+            '/api/v1/cars/', params={'sort': sort}, headers=auth_headers
+        )
+        return [item['model'] for item in response.json()['cars']]
+
+    assert models('price') == ['Yaris', 'Corolla']
+    assert models('-price') == ['Corolla', 'Yaris']
+    assert models('model_year') == ['Yaris', 'Corolla']
+    assert models('-id') == ['Yaris', 'Corolla']
+
+
+def test_list_cars_invalid_sort(client, auth_headers):
+    response = client.get(
+        '/api/v1/cars/', params={'sort': 'owner_id'}, headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Ordenação inválida: owner_id'}
+
+
+@pytest.mark.asyncio
+async def test_list_cars_sort_uses_owner_index(session):
+    query = (
+        select(Car)
+        .where(Car.owner_id == 1)
+        .order_by(*order_by('-price', CAR_SORTS))
+        .limit(10)
+    )
+    compiled = query.compile(
+        dialect=session.bind.dialect,
+        compile_kwargs={'literal_binds': True},
+    )
+
+    result = await session.execute(text(f'EXPLAIN QUERY PLAN {compiled}'))
+    plan = ' '.join(row[-1] for row in result)
+
+    assert 'ix_cars_owner_id_price' in plan
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,178 @@
+from http import HTTPStatus
+
+import pytest
+
+from car_api.core import concurrency
+from car_api.core.concurrency import AdaptiveLimiter
+from car_api.core.metrics import REQUESTS_SHED
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = AdaptiveLimiter(initial_limit=4, min_limit=1)
+    monkeypatch.setattr(
+        concurrency, 'get_concurrency_limiter', lambda: limiter
+    )
+    return limiter
+
+
+def test_route_priorities():
+    limiter = AdaptiveLimiter(priorities={'token': 'low'})
+
+    assert limiter.priority('token', {'POST'}) == 'low'
+    assert limiter.priority('list_cars', {'GET'}) == 'medium'
+    assert limiter.priority('create_car', {'POST'}) == 'high'
+
+
+def test_low_priority_is_shed_first():
+    limiter = AdaptiveLimiter(initial_limit=4)
+
+    assert all(limiter.try_acquire('low') for _ in range(3))
+    assert limiter.try_acquire('low') is False
+    assert limiter.try_acquire('high') is True
+    assert limiter.try_acquire('high') is False
+    assert limiter.in_flight == 4  # noqa: PLR2004
+
+
+def fill(limiter):
+    while limiter.try_acquire('high'):
+        pass
+
+
+def test_limit_grows_while_saturated_with_stable_latency():
+    limiter = AdaptiveLimiter(initial_limit=4)
+
+    for now in range(20):
+        fill(limiter)
+        limiter.release('list_cars', 0.01, now)
+
+    assert limiter.limit > 4  # noqa: PLR2004
+
+
+def test_limit_follows_latency_gradient_at_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=10, smoothing=1.0)
+    limiter.try_acquire('high')
+    limiter.release('list_cars', 0.001, 0.0)
+
+    fill(limiter)
+    limiter.release('list_cars', 0.003, 1.0)
+
+    assert limiter.limit == pytest.approx(10 * 2 / 3)
+
+
+def test_gradient_is_bounded_to_half_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=10, smoothing=1.0)
+    limiter.try_acquire('high')
+    limiter.release('list_cars', 0.001, 0.0)
+
+    fill(limiter)
+    limiter.release('list_cars', 1.0, 1.0)
+
+    assert limiter.limit == pytest.approx(5.0)
+
+
+def test_limit_holds_when_latency_rises_below_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=10, smoothing=1.0)
+    limiter.try_acquire('high')
+    limiter.release('list_cars', 0.001, 0.0)
+
+    limiter.try_acquire('high')
+    limiter.release('list_cars', 1.0, 1.0)
+
+    assert limiter.limit == pytest.approx(10.0)
+
+
+def test_failures_back_off_once_per_latency_window():
+    limiter = AdaptiveLimiter(initial_limit=10)
+
+    for _ in range(3):
+        fill(limiter)
+        limiter.release('list_cars', 60.0, 0.0, failed=True)
+
+    assert limiter.limit == pytest.approx(9.0)
+
+
+def test_failures_below_the_limit_do_not_back_off():
+    limiter = AdaptiveLimiter(initial_limit=10)
+
+    limiter.try_acquire('high')
+    limiter.release('list_cars', 0.01, 0.0, failed=True)
+
+    assert limiter.limit == pytest.approx(10.0)
+
+
+def test_baseline_is_min_latency_within_window():
+    limiter = AdaptiveLimiter(rtt_window=10.0)
+    for now, latency in ((0.0, 0.5), (1.0, 0.01), (2.0, 0.03)):
+        limiter.try_acquire('high')
+        limiter.release('list_cars', latency, now)
+
+    assert limiter.baseline('list_cars') == 0.01  # noqa: PLR2004
+
+    limiter.try_acquire('high')
+    limiter.release('list_cars', 0.04, 11.5)
+
+    assert limiter.baseline('list_cars') == 0.03  # noqa: PLR2004
+
+
+def test_latency_baseline_is_per_route():
+    limiter = AdaptiveLimiter(initial_limit=10, smoothing=1.0)
+    limiter.try_acquire('high')
+    limiter.release('list_cars', 0.001, 0.0)
+
+    fill(limiter)
+    limiter.release('token', 0.5, 1.0)
+
+    assert limiter.limit > 10  # noqa: PLR2004
+    assert limiter.baseline('list_cars') == 0.001  # noqa: PLR2004
+    assert limiter.baseline('token') == 0.5  # noqa: PLR2004
+
+
+def test_limit_recovers_at_low_utilisation():
+    limiter = AdaptiveLimiter(initial_limit=10)
+    limiter.limit = 2.0
+
+    for now in range(100):
+        limiter.try_acquire('high')
+        limiter.release('list_cars', 0.01, now)
+
+    assert limiter.limit == pytest.approx(10.0)
+
+
+def test_overloaded_request_is_rejected(client, auth_headers, limiter):
+    limiter.in_flight = 4
+    shed = REQUESTS_SHED.get('list_cars', 'medium')
+
+    response = client.get('/api/v1/cars/', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['retry-after'] == '1'
+    assert REQUESTS_SHED.get('list_cars', 'medium') == shed + 1
+    assert limiter.in_flight == 4  # noqa: PLR2004
+
+
+def test_admitted_request_releases_slot(client, auth_headers, limiter):
+    response = client.get('/api/v1/cars/', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert limiter.in_flight == 0
+    assert 'list_cars' in limiter.latency
+
+
+def test_batch_operations_share_the_batch_slot(client, auth_headers, limiter):
+    limiter.in_flight = 3
+
+    response = client.post(
+        '/api/v1/batch/',
+        headers=auth_headers,
+        json={
+            'operations': [
+                {'method': 'GET', 'path': '/api/v1/cars/'},
+                {'method': 'GET', 'path': '/api/v1/brands/'},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [r['status'] for r in response.json()['results']] == [200, 200]
+    assert limiter.in_flight == 3  # noqa: PLR2004
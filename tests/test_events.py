@@ -0,0 +1,119 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from car_api.core import events
+from car_api.core.events import EventBroker
+
+
+class ClosedBroker(EventBroker):
+    def subscribe(self, owner_id):
+        subscription = super().subscribe(owner_id)
+        self.publish(owner_id, 'car.deleted', json.dumps({'id': 1}))
+        subscription.push(None)
+        return subscription
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = EventBroker()
+    monkeypatch.setattr(events, 'get_event_broker', lambda: broker)
+    return broker
+
+
+def frames(subscription):
+    items = []
+    while not subscription.queue.empty():
+        items.append(subscription.queue.get_nowait())
+    return items
+
+
+def parse(frame):
+    fields = dict(
+        line.split(': ', 1) for line in frame.decode().strip().split('\n')
+    )
+    return fields['event'], json.loads(fields['data'])
+
+
+def test_publish_reaches_only_owner_subscribers():
+    broker = EventBroker()
+    mine = broker.subscribe(1)
+    other = broker.subscribe(2)
+
+    broker.publish(1, 'car.updated', '{"id": 10}')
+    broker.publish(3, 'car.updated', '{"id": 11}')
+
+    assert [parse(frame) for frame in frames(mine)] == [
+        ('car.updated', {'id': 10})
+    ]
+    assert frames(other) == []
+
+    broker.unsubscribe(mine)
+    assert broker.has_subscribers(1) is False
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_events():
+    broker = EventBroker(queue_size=2)
+    stream = broker.stream(1)
+    assert await anext(stream) == b': connected\n\n'
+
+    for car_id in range(3):
+        broker.publish(1, 'car.updated', json.dumps({'id': car_id}))
+
+    assert parse(await anext(stream)) == ('lagged', {'dropped': 1})
+    assert parse(await anext(stream)) == ('car.updated', {'id': 1})
+    assert parse(await anext(stream)) == ('car.updated', {'id': 2})
+    await stream.aclose()
+    assert broker.subscribers == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_keepalive_and_stops_on_close():
+    broker = EventBroker(keepalive=0.01)
+    stream = broker.stream(1)
+    await anext(stream)
+
+    assert await anext(stream) == events.KEEPALIVE_FRAME
+
+    broker.close()
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert broker.subscribers == {}
+
+
+def test_stream_car_events(client, auth_headers, monkeypatch):
+    broker = ClosedBroker()
+    monkeypatch.setattr(events, 'get_event_broker', lambda: broker)
+
+    response = client.get('/api/v1/cars/events', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert 'event: car.deleted\ndata: {"id": 1}' in response.text
+    assert broker.subscribers == {}
+
+
+def test_car_writes_publish_events(
+    client, auth_headers, user, car_data, broker
+):
+    subscription = broker.subscribe(user.id)
+    payload = {**car_data, 'price': str(car_data['price'])}
+
+    car_id = client.post(
+        '/api/v1/cars/', json=payload, headers=auth_headers
+    ).json()['id']
+    client.put(
+        f'/api/v1/cars/{car_id}', json={'color': 'Blue'}, headers=auth_headers
+    )
+    client.delete(f'/api/v1/cars/{car_id}', headers=auth_headers)
+
+    published = [parse(frame) for frame in frames(subscription)]
+    assert [event for event, _ in published] == [
+        'car.created',
+        'car.updated',
+        'car.deleted',
+    ]
+    assert published[1][1]['color'] == 'Blue'
+    assert published[2][1] == {'id': car_id}
@@ -0,0 +1,210 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from car_api.core import database
+from car_api.core.idempotency import (
+    DatabaseStore,
+    IdempotencyConflict,
+    MemoryStore,
+)
+from car_api.core.security import create_access_token
+from car_api.models import Base
+from car_api.models.cars import Car
+
+
+def car_payload(brand_id, plate='IDP1234'):
+    return {
+        'model': 'Corolla',
+        'factory_year': 2023,
+        'model_year': 2023,
+        'color': 'White',
+        'plate': plate,
+        'fuel_type': 'flex',
+        'transmission': 'manual',
+        'price': 50000.00,
+        'is_available': True,
+        'brand_id': brand_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_stored_response(
+    client, auth_headers, session, brand
+):
+    headers = {**auth_headers, 'Idempotency-Key': 'create-1'}
+
+    first = client.post(
+        '/api/v1/cars/', json=car_payload(brand.id), headers=headers
+    )
+    retry = client.post(
+        '/api/v1/cars/', json=car_payload(brand.id), headers=headers
+    )
+
+    assert first.status_code == retry.status_code == HTTPStatus.CREATED
+    assert retry.json() == first.json()
+    assert 'idempotent-replayed' not in first.headers
+    assert retry.headers['idempotent-replayed'] == 'true'
+    assert retry.headers['content-type'] == 'application/json'
+    assert await session.scalar(select(func.count()).select_from(Car)) == 1
+
+
+def test_retry_replays_business_error(client, auth_headers):
+    headers = {**auth_headers, 'Idempotency-Key': 'create-1'}
+
+    first = client.post(
+        '/api/v1/cars/', json=car_payload(999), headers=headers
+    )
+    retry = client.post(
+        '/api/v1/cars/', json=car_payload(999), headers=headers
+    )
+
+    assert first.status_code == retry.status_code == HTTPStatus.BAD_REQUEST
+    assert retry.json() == first.json()
+    assert retry.headers['idempotent-replayed'] == 'true'
+
+
+def test_key_reused_with_other_payload(client, auth_headers, brand):
+    headers = {**auth_headers, 'Idempotency-Key': 'create-1'}
+    client.post('/api/v1/cars/', json=car_payload(brand.id), headers=headers)
+
+    response = client.post(
+        '/api/v1/cars/',
+        json=car_payload(brand.id, plate='IDP9999'),
+        headers=headers,
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {
+        'detail': 'Idempotency-Key já usada com outro conteúdo'
+    }
+
+
+def test_keys_are_scoped_per_client(client, auth_headers, brand, second_user):
+    token = create_access_token(data={'sub': str(second_user.id)})
+    payload = car_payload(brand.id)
+    client.post(
+        '/api/v1/cars/',
+        json=payload,
+        headers={**auth_headers, 'Idempotency-Key': 'shared'},
+    )
+
+    response = client.post(
+        '/api/v1/cars/',
+        json=payload,
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Idempotency-Key': 'shared',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'idempotent-replayed' not in response.headers
+
+
+def test_invalid_key(client, user_data):
+    response = client.post(
+        '/api/v1/users/',
+        json=user_data,
+        headers={'Idempotency-Key': 'x' * 256},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Idempotency-Key inválida'}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_for_first_attempt():
+    store = MemoryStore()
+    assert await store.acquire('key', 'hash') is None
+
+    waiter = asyncio.create_task(store.acquire('key', 'hash'))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await store.save(
+        'key', 'hash', HTTPStatus.CREATED, b'{}', 'application/json'
+    )
+    await store.release('key')
+
+    stored = await waiter
+    assert stored.status_code == HTTPStatus.CREATED
+    assert stored.body == b'{}'
+
+
+@pytest.mark.asyncio
+async def test_waiter_retries_when_first_attempt_fails():
+    store = MemoryStore()
+    await store.acquire('key', 'hash')
+    waiter = asyncio.create_task(store.acquire('key', 'hash'))
+    await asyncio.sleep(0)
+
+    await store.release('key')
+
+    assert await waiter is None
+    assert 'key' in store.pending
+
+
+@pytest.mark.asyncio
+async def test_waiter_gives_up_after_timeout():
+    store = MemoryStore(wait_timeout=0.01)
+    await store.acquire('key', 'hash')
+
+    with pytest.raises(IdempotencyConflict, match='em processamento'):
+        await store.acquire('key', 'hash')
+
+
+@pytest_asyncio.fixture
+async def shared_engine(monkeypatch, tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/keys.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(database, 'get_engine', lambda: engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_database_store_shares_keys_between_workers(shared_engine):
+    first = DatabaseStore(wait_timeout=0.01, poll_interval=0.001)
+    second = DatabaseStore(wait_timeout=0.01, poll_interval=0.001)
+    assert await first.acquire('key', 'hash') is None
+
+    with pytest.raises(IdempotencyConflict, match='em processamento'):
+        await second.acquire('key', 'hash')
+    with pytest.raises(IdempotencyConflict, match='outro conteúdo'):
+        await second.acquire('key', 'other')
+
+    await first.save(
+        'key', 'hash', HTTPStatus.CREATED, b'{}', 'application/json'
+    )
+    await first.release('key')
+
+    stored = await second.acquire('key', 'hash')
+    assert stored.status_code == HTTPStatus.CREATED
+    assert stored.body == b'{}'
+    assert stored.media_type == 'application/json'
+
+
+@pytest.mark.asyncio
+async def test_database_store_releases_failed_attempts(shared_engine):
+    first = DatabaseStore()
+    second = DatabaseStore()
+    await first.acquire('key', 'hash')
+
+    await first.release('key')
+
+    assert await second.acquire('key', 'other') is None
+
+
+@pytest.mark.asyncio
+async def test_database_store_takes_over_stale_locks(shared_engine):
+    crashed = DatabaseStore(lock_timeout=-1)
+    store = DatabaseStore(wait_timeout=0)
+    await crashed.acquire('key', 'hash')
+
+    assert await store.acquire('key', 'hash') is None
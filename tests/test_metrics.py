@@ -0,0 +1,128 @@
+import json
+from http import HTTPStatus
+
+from car_api.core.metrics import (
+    DB_STATEMENTS_PER_REQUEST,
+    JWT_VERIFY_DURATION,
+    REQUESTS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    write_snapshot,
+)
+from car_api.core.settings import get_settings
+
+
+def worker_registry():
+    registry = Registry()
+    registry.register(Counter('hits', 'Acessos.', ('route',)))
+    registry.register(Gauge('busy', 'Ocupação.'))
+    registry.register(Gauge('lag', 'Atraso.', aggregate='max'))
+    registry.register(Histogram('latency', 'Latência.', (), (0.1, 1.0)))
+    return registry
+
+
+def test_histogram_render():
+    histogram = Histogram('latency', 'Latência.', ('route',), (0.1, 1.0))
+    histogram.observe(0.05, 'list_cars')
+    histogram.observe(0.5, 'list_cars')
+    histogram.observe(5, 'list_cars')
+
+    assert histogram.render() == [
+        '# HELP latency Latência.',
+        '# TYPE latency histogram',
+        'latency_bucket{route="list_cars",le="0.1"} 1',
+        'latency_bucket{route="list_cars",le="1"} 2',
+        'latency_bucket{route="list_cars",le="+Inf"} 3',
+        'latency_sum{route="list_cars"} 5.55',
+        'latency_count{route="list_cars"} 3',
+    ]
+
+
+def test_metrics_records_route_and_sql(client, auth_headers, car):
+    requests_before = REQUESTS.get('list_cars', 'GET', '200')
+    sql_before = DB_STATEMENTS_PER_REQUEST.count('list_cars')
+    jwt_before = JWT_VERIFY_DURATION.count()
+
+    client.get('/api/v1/cars/', headers=auth_headers)
+
+    assert REQUESTS.get('list_cars', 'GET', '200') == requests_before + 1
+    assert DB_STATEMENTS_PER_REQUEST.count('list_cars') == sql_before + 1
+    assert JWT_VERIFY_DURATION.count() == jwt_before + 1
+
+
+def test_metrics_records_error_status(client, auth_headers):
+    before = REQUESTS.get('get_car', 'GET', '404')
+
+    client.get('/api/v1/cars/999', headers=auth_headers)
+
+    assert REQUESTS.get('get_car', 'GET', '404') == before + 1
+
+
+def test_metrics_endpoint(client, auth_headers, car):
+    client.get('/api/v1/cars/', headers=auth_headers)
+
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'http_request_duration_seconds_count{route="list_cars"}'
+        in response.text
+    )
+    assert 'db_statements_total{route="list_cars"}' in response.text
+    assert 'http_requests_in_progress{route="list_cars"} 0' in response.text
+    assert '# TYPE event_loop_lag_seconds gauge' in response.text
+
+
+def test_registry_aggregates_worker_snapshots(tmp_path):
+    for pid, lag in ((101, 0.2), (102, 0.5)):
+        registry = worker_registry()
+        hits, busy, lag_gauge, latency = registry.metrics
+        hits.inc('list_cars', amount=2)
+        busy.set(3)
+        lag_gauge.set(lag)
+        latency.observe(0.05)
+        write_snapshot(str(tmp_path), registry.snapshot(), pid)
+
+    merged = worker_registry().aggregate(str(tmp_path))
+    hits, busy, lag_gauge, latency = merged.metrics
+
+    assert hits.get('list_cars') == 4
+    assert busy.get() == 6
+    assert lag_gauge.get() == 0.5
+    assert latency.values[()] == [[2, 0], 0.1, 2]
+
+
+def test_registry_retire_keeps_counters_and_drops_gauges(tmp_path):
+    registry = worker_registry()
+    hits, busy, _, _ = registry.metrics
+    hits.inc('list_cars')
+    busy.set(3)
+    write_snapshot(str(tmp_path), registry.snapshot(), 101)
+
+    registry.retire(str(tmp_path), 101)
+
+    snapshot = json.loads((tmp_path / '101.json').read_text())
+    assert snapshot == {
+        'hits': [[['list_cars'], 1.0]],
+        'latency': [],
+    }
+
+
+def test_metrics_endpoint_merges_other_workers(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), 'METRICS_DIR', str(tmp_path))
+    other = Registry()
+    other.register(
+        Counter(REQUESTS.name, REQUESTS.documentation, REQUESTS.labels)
+    ).inc('list_brands', 'GET', '200', amount=1000)
+    write_snapshot(str(tmp_path), other.snapshot(), 1)
+
+    response = client.get('/metrics')
+
+    line = (
+        'http_requests_total{route="list_brands",method="GET",status="200"} '
+    )
+    total = REQUESTS.get('list_brands', 'GET', '200') + 1000
+    assert f'{line}{int(total)}' in response.text
@@ -0,0 +1,24 @@
+import json
+from http import HTTPStatus
+from pathlib import Path
+
+from car_api.app import app
+from car_api.core.openapi import prebuilt_openapi
+
+
+def test_committed_openapi_is_up_to_date():
+    committed = json.loads(Path('openapi.json').read_bytes())
+
+    assert committed == app.openapi()
+
+
+def test_prebuilt_openapi_served_from_file(client, tmp_path, monkeypatch):
+    path = tmp_path / 'openapi.json'
+    path.write_text(json.dumps({'openapi': '3.1.0', 'paths': {}}))
+    monkeypatch.setattr(app, 'openapi_schema', None)
+    monkeypatch.setattr(app, 'openapi', prebuilt_openapi(app, str(path)))
+
+    response = client.get('/openapi.json')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'openapi': '3.1.0', 'paths': {}}
@@ -0,0 +1,166 @@
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+
+from car_api.core.price_distribution import (
+    PriceDistributionCache,
+    bin_edges,
+    distribution,
+    group_bounds,
+    histogram,
+    quantile,
+)
+from car_api.models.cars import Car, FuelType, TransmissionType
+
+
+def test_quantile_interpolates_between_values():
+    values = [10.0, 20.0, 30.0, 40.0]
+
+    assert quantile(values, 0.1) == pytest.approx(13.0)
+    assert quantile(values, 0.5) == pytest.approx(25.0)
+    assert quantile(values, 0.9) == pytest.approx(37.0)
+    assert quantile([5.0], 0.9) == pytest.approx(5.0)
+
+
+def test_histogram_includes_upper_edge():
+    values = [0.0, 1.0, 2.5, 5.0, 9.9, 10.0]
+    edges = bin_edges(0.0, 10.0, 2)
+
+    assert edges == [0.0, 5.0, 10.0]
+    assert histogram(values, edges) == [3, 3]
+    assert bin_edges(7.0, 7.0, 1) == [6.5, 7.5]
+
+
+def test_group_bounds_splits_sorted_keys():
+    keys = [(1, 2020), (1, 2020), (1, 2021), (2, 2020), (2, 2020)]
+
+    assert group_bounds(keys) == [(0, 2), (2, 3), (3, 5)]
+    assert group_bounds([]) == []
+
+
+def test_distribution_groups_by_brand_and_model_year():
+    rows = [
+        (1, 2020, 100.0),
+        (1, 2020, 300.0),
+        (1, 2021, 200.0),
+        (2, 2020, 500.0),
+    ]
+
+    content = distribution(rows, 4)
+
+    assert content['edges'] == [100.0, 200.0, 300.0, 400.0, 500.0]
+    assert content['overall']['count'] == 4
+    assert content['overall']['histogram'] == [1, 1, 1, 1]
+    assert content['overall']['p50'] == pytest.approx(250.0)
+    assert [
+        (group['brand_id'], group['model_year'], group['histogram'])
+        for group in content['groups']
+    ] == [
+        (1, 2020, [1, 0, 1, 0]),
+        (1, 2021, [0, 1, 0, 0]),
+        (2, 2020, [0, 0, 0, 1]),
+    ]
+
+
+def test_distribution_empty():
+    assert distribution([], 10) == {
+        'edges': [],
+        'overall': {
+            'count': 0,
+            'min': None,
+            'max': None,
+            'p10': None,
+            'p50': None,
+            'p90': None,
+            'histogram': [],
+        },
+        'groups': [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_price_distribution_endpoint(
+    client, auth_headers, session, user, car, second_user_car
+):
+    session.add(
+        Car(
+            model='Yaris',
+            factory_year=2023,
+            model_year=2023,
+            color='Red',
+            plate='PRC0001',
+            fuel_type=FuelType.FLEX,
+            transmission=TransmissionType.MANUAL,
+            price=Decimal('70000.00'),
+            is_available=False,
+            brand_id=car.brand_id,
+            owner_id=user.id,
+        )
+    )
+    await session.commit()
+
+    response = client.get(
+        '/api/v1/cars/price-distribution',
+        params={'bins': 2},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data['edges'] == [50000.0, 60000.0, 70000.0]
+    assert data['overall'] == {
+        'count': 2,
+        'min': 50000.0,
+        'max': 70000.0,
+        'p10': 52000.0,
+        'p50': 60000.0,
+        'p90': 68000.0,
+        'histogram': [1, 1],
+    }
+    assert len(data['groups']) == 1
+
+    response = client.get(
+        '/api/v1/cars/price-distribution',
+        params={'is_available': False},
+        headers=auth_headers,
+    )
+
+    assert response.json()['overall']['count'] == 1
+
+
+def test_price_distribution_cached_until_car_write(
+    client, auth_headers, car, sql_statements
+):
+    def price_queries():
+        return [s for s in sql_statements if 'CAST(cars.price' in s]
+
+    client.get('/api/v1/cars/price-distribution', headers=auth_headers)
+    response = client.get(
+        '/api/v1/cars/price-distribution', headers=auth_headers
+    )
+
+    assert response.json()['overall']['max'] == 50000.0
+    assert len(price_queries()) == 1
+
+    client.put(
+        f'/api/v1/cars/{car.id}',
+        json={'price': 55000.00},
+        headers=auth_headers,
+    )
+    response = client.get(
+        '/api/v1/cars/price-distribution', headers=auth_headers
+    )
+
+    assert response.json()['overall']['max'] == 55000.0
+    assert len(price_queries()) == 2
+
+
+def test_price_distribution_cache_entries_expire():
+    cache = PriceDistributionCache(ttl=0)
+    key = cache.key(1, 'params')
+
+    cache.set(key, {'overall': {}})
+
+    assert cache.get(key) is None
+    assert not cache.entries
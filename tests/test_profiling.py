@@ -0,0 +1,66 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from car_api.app import app
+from car_api.core.profiling import ProfilingMiddleware
+
+
+@pytest.fixture
+def profiling_client(client, tmp_path):
+    wrapped = ProfilingMiddleware(
+        app, token='admin-secret', output_dir=str(tmp_path)
+    )
+    return TestClient(wrapped)
+
+
+def test_profile_request_stores_speedscope_file(
+    profiling_client, auth_headers, car, tmp_path
+):
+    response = profiling_client.get(
+        '/api/v1/cars/',
+        headers={**auth_headers, 'X-Profile': 'admin-secret'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    profile_id = response.headers['x-profile-id']
+    profile = json.loads(
+        (tmp_path / f'{profile_id}.speedscope.json').read_text()
+    )
+    assert profile['name'] == 'GET /api/v1/cars/'
+    assert profile['profiles'][0]['type'] == 'sampled'
+    assert not (tmp_path / f'{profile_id}.memory.json').exists()
+
+
+def test_profile_request_with_memory(profiling_client, tmp_path):
+    response = profiling_client.get(
+        '/api/v1/users/',
+        headers={'X-Profile': 'admin-secret', 'X-Profile-Memory': '1'},
+    )
+
+    profile_id = response.headers['x-profile-id']
+    memory = json.loads((tmp_path / f'{profile_id}.memory.json').read_text())
+    assert memory['name'] == 'GET /api/v1/users/'
+    assert isinstance(memory['top'], list)
+
+
+def test_profile_requires_token(profiling_client, tmp_path):
+    response = profiling_client.get(
+        '/api/v1/users/', headers={'X-Profile': 'wrong'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'x-profile-id' not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_ignores_non_ascii_token(profiling_client, tmp_path):
+    response = profiling_client.get(
+        '/api/v1/users/', headers={'X-Profile': 'sénha'.encode()}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'x-profile-id' not in response.headers
+    assert list(tmp_path.iterdir()) == []
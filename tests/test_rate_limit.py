@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from car_api.core import database, rate_limit
+from car_api.core.rate_limit import (
+    DatabaseStore,
+    MemoryStore,
+    RateLimit,
+    RateLimiter,
+    gcra,
+    parse_rate_limit,
+)
+from car_api.core.security import create_access_token
+from car_api.models import Base
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter(
+        MemoryStore(),
+        default=RateLimit(rate=2, period=60, burst=2),
+        routes={'token': RateLimit(rate=1, period=60, burst=1)},
+    )
+    monkeypatch.setattr(rate_limit, 'get_rate_limiter', lambda: limiter)
+    return limiter
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit('100/minute') == RateLimit(100, 60.0, 100)
+    assert parse_rate_limit('5/second:20') == RateLimit(5, 1.0, 20)
+    assert parse_rate_limit('') is None
+    with pytest.raises(ValueError, match='Período inválido'):
+        parse_rate_limit('5/week')
+
+
+def test_gcra_allows_burst_then_spaces_requests():
+    limit = RateLimit(rate=3, period=60, burst=3)
+    tat = None
+    remaining = []
+    for _ in range(3):
+        decision, tat = gcra(limit, tat, 1000.0)
+        remaining.append(decision.remaining)
+
+    decision, _ = gcra(limit, tat, 1000.0)
+
+    assert remaining == [2, 1, 0]
+    assert decision.allowed is False
+    assert decision.retry_after == pytest.approx(20.0)
+    assert gcra(limit, tat, 1020.0)[0].allowed is True
+
+
+@pytest.mark.asyncio
+async def test_memory_store_expires_idle_keys():
+    store = MemoryStore(sweep_interval=0)
+    limit = RateLimit(rate=1, period=60, burst=1)
+
+    await store.hit('a', limit, 1000.0)
+    await store.hit('b', limit, 1050.0)
+
+    assert list(store.tats) == ['a', 'b']
+    await store.hit('b', limit, 1100.0)
+    assert list(store.tats) == ['b']
+
+
+@pytest.mark.asyncio
+async def test_database_store_shares_state(monkeypatch, tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/rate.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(database, 'get_engine', lambda: engine)
+    limit = RateLimit(rate=2, period=60, burst=2)
+    first, second = DatabaseStore(), DatabaseStore()
+
+    decisions = [
+        await first.hit('key', limit, 1000.0),
+        await second.hit('key', limit, 1000.0),
+        await first.hit('key', limit, 1000.0),
+    ]
+    await engine.dispose()
+
+    assert [d.allowed for d in decisions] == [True, True, False]
+    assert [d.remaining for d in decisions] == [1, 0, 0]
+    assert decisions[2].retry_after == pytest.approx(30.0)
+
+
+def test_rate_limited_route_returns_429(client, limiter, user, user_data):
+    login = {'email': user_data['email'], 'password': user_data['password']}
+
+    response = client.post('/api/v1/auth/token', json=login)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ratelimit-remaining'] == '0'
+
+    response = client.post('/api/v1/auth/token', json=login)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.headers['retry-after'] == '60'
+    assert response.headers['ratelimit-limit'] == '1'
+
+
+def test_rate_limit_is_keyed_by_user(client, limiter, auth_headers):
+    other_headers = {
+        'Authorization': f'Bearer {create_access_token({"sub": "999"})}'
+    }
+    for _ in range(2):
+        client.get('/api/v1/cars/', headers=auth_headers)
+
+    blocked = client.get('/api/v1/cars/', headers=auth_headers)
+    other = client.get('/api/v1/cars/', headers=other_headers)
+
+    assert blocked.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert other.status_code == HTTPStatus.UNAUTHORIZED
+    assert other.headers['ratelimit-remaining'] == '1'
+
+
+def test_rate_limit_headers_on_errors(client, limiter, auth_headers):
+    response = client.get('/api/v1/cars/999', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.headers['ratelimit-limit'] == '2'
+    assert response.headers['ratelimit-remaining'] == '1'
+
+
+def test_batch_operations_use_the_batch_quota(client, limiter, auth_headers):
+    response = client.post(
+        '/api/v1/batch/',
+        json={
+            'operations': [
+                {'method': 'GET', 'path': '/api/v1/cars/'} for _ in range(3)
+            ]
+        },
+        headers=auth_headers,
+    )
+
+    assert [r['status'] for r in response.json()['results']] == [200] * 3
+    response = client.get('/api/v1/cars/', headers=auth_headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ratelimit-remaining'] == '1'
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from car_api.core import database, readiness
+from car_api.core.readiness import ReadinessProbe, pool_status
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    probe = ReadinessProbe(cache_ttl=60)
+    monkeypatch.setattr(readiness, 'get_readiness_probe', lambda: probe)
+    return probe
+
+
+@pytest.fixture
+def ping_engine(monkeypatch, tmp_path):
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/car.db', poolclass=NullPool
+    )
+    monkeypatch.setattr(database, 'get_engine', lambda: engine)
+    return engine
+
+
+def test_ready(client, probe, ping_engine):
+    response = client.get('/ready')
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert body['status'] == 'ready'
+    assert body['checks']['database']['status'] == 'ok'
+    assert body['checks']['database']['cached'] is False
+    assert set(body['checks']) == {'database', 'pool', 'event_loop'}
+
+
+def test_ready_caches_database_ping(client, probe, ping_engine):
+    client.get('/ready')
+
+    response = client.get('/ready')
+
+    assert response.json()['checks']['database']['cached'] is True
+
+
+def test_ready_unavailable_when_database_fails(
+    client, probe, monkeypatch, tmp_path
+):
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/missing/car.db'
+    )
+    monkeypatch.setattr(database, 'get_engine', lambda: engine)
+
+    response = client.get('/ready')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    body = response.json()
+    assert body['status'] == 'unavailable'
+    assert body['checks']['database']['status'] == 'fail'
+    assert body['checks']['database']['error']
+
+
+def test_ready_unavailable_on_event_loop_lag(client, probe, ping_engine):
+    probe.max_event_loop_lag_ms = -1
+
+    response = client.get('/ready')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()['checks']['event_loop']['status'] == 'fail'
+
+
+@pytest.mark.asyncio
+async def test_pool_status_reports_saturation(tmp_path):
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/car.db',
+        pool_size=1,
+        max_overflow=0,
+    )
+    probe = ReadinessProbe(timeout=0.1, max_pool_usage=0.9)
+
+    async with engine.connect():
+        assert pool_status(engine) == {
+            'checked_out': 1,
+            'capacity': 1,
+            'usage': 1.0,
+        }
+        is_ready, report = await probe.report(engine)
+
+    await engine.dispose()
+    assert is_ready is False
+    assert report['checks']['pool']['status'] == 'fail'
@@ -0,0 +1,24 @@
+from http import HTTPStatus
+
+from car_api.core.responses import model_response
+from car_api.schemas.auth import Token
+
+
+def test_model_response_renders_json_bytes():
+    response = model_response(
+        Token,
+        {'access_token': 'abc', 'token_type': 'bearer'},
+        HTTPStatus.CREATED,
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.media_type == 'application/json'
+    assert response.body == b'{"access_token":"abc","token_type":"bearer"}'
+
+
+def test_list_cars_price_serialized_as_string(client, auth_headers, car):
+    response = client.get('/api/v1/cars/', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/json'
+    assert response.json()['cars'][0]['price'] == '50000.00'
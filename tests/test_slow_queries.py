@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from car_api.core import slow_queries
+from car_api.models import Base
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    statement = (
+        'SELECT * FROM cars\n  WHERE cars.id IN (?, ?, ?) '
+        "AND cars.model = 'Civic' LIMIT 10"
+    )
+
+    assert slow_queries.normalize_statement(statement) == (
+        'SELECT * FROM cars WHERE cars.id IN (?+) AND cars.model = ? LIMIT ?'
+    )
+    assert slow_queries.fingerprint(statement) == slow_queries.fingerprint(
+        'SELECT * FROM cars WHERE cars.id IN (?) '
+        "AND cars.model = 'Gol' LIMIT 50"
+    )
+
+
+def test_record_aggregates_by_fingerprint():
+    log = slow_queries.SlowQueryLog(threshold_ms=1)
+    log.record('SELECT 1 FROM cars WHERE id = ?', (1,), 5.0, 'get_car', 'x')
+    log.record('SELECT 1 FROM cars WHERE id = ?', (2,), 15.0, 'get_car', 'x')
+    log.record('SELECT 1 FROM brands', (), 3.0, 'list_brands', 'x')
+
+    top = log.top(1)[0]
+    assert top.count == 2
+    assert top.total_ms == 20.0
+    assert top.max_ms == 15.0
+    assert top.routes == {'get_car'}
+    assert top.parameter_shape == ['int']
+    assert 'SELECT ? FROM cars WHERE id = ?' in log.report()
+
+
+def test_parameter_shape_for_named_and_executemany():
+    assert slow_queries.parameter_shape({'plate': 'ABC', 'id': 1}) == {
+        'plate': 'str',
+        'id': 'int',
+    }
+    assert slow_queries.parameter_shape([(1, 'a'), (2, 'b')]) == {
+        'executemany': 2,
+        'shape': ['int', 'str'],
+    }
+
+
+def test_slow_queries_are_recorded_with_route(
+    client, auth_headers, car, monkeypatch
+):
+    log = slow_queries.SlowQueryLog(threshold_ms=1e-9, explain=False)
+    monkeypatch.setattr(slow_queries, 'get_slow_query_log', lambda: log)
+
+    client.get('/api/v1/cars/?search=Cor', headers=auth_headers)
+
+    car_query = next(e for e in log.entries.values() if 'LIKE' in e.statement)
+    assert car_query.routes == {'list_cars'}
+    assert car_query.parameter_shape[0] == 'int'
+
+
+@pytest.mark.asyncio
+async def test_capture_plan_with_sqlite(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/plan.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    entry = slow_queries.SlowQuery(
+        'abc', 'SELECT * FROM cars WHERE plate = ?', 'sqlite'
+    )
+
+    await slow_queries.capture_plan(engine.sync_engine, entry, ('ABC1234',))
+    await engine.dispose()
+
+    assert any('ix_cars_plate' in line for line in entry.plan)
@@ -0,0 +1,228 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from car_api.core import database, suggest
+from car_api.core.suggest import PrefixIndex, SuggestIndex
+from car_api.models import Base
+from car_api.models.cars import Brand
+from car_api.routers.brands import brand_suggest_rows
+
+
+def test_prefix_index_counts_and_case():
+    index = PrefixIndex()
+    for value in ('Corolla', 'corsa', 'Corolla', 'Civic'):
+        index.add(value)
+
+    assert index.search('COR', 10) == [('Corolla', 2), ('corsa', 1)]
+    assert index.search('cor', 1) == [('Corolla', 2)]
+
+    index.discard('Corolla')
+    index.discard('corsa')
+    index.discard('missing')
+
+    assert index.search('c', 10) == [('Civic', 1), ('Corolla', 1)]
+
+
+def test_prefix_index_bulk_build():
+    index = PrefixIndex({'corsa': 1, 'Corolla': 2, 'Civic': 1})
+
+    assert index.keys == sorted(index.keys)
+    assert index.search('cor', 10) == [('Corolla', 2), ('corsa', 1)]
+
+
+async def static_rows(rows):
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_writes_during_build_are_replayed():
+    index = SuggestIndex('cars', ('model',))
+    loaded = asyncio.Event()
+
+    async def load():
+        await loaded.wait()
+        return [(1, 10, 'Corolla'), (2, 10, 'Civic')]
+
+    build = asyncio.create_task(index.ensure(load))
+    await asyncio.sleep(0)
+    index.upsert(1, 10, ('Camry',))
+    index.remove(2)
+    loaded.set()
+    await build
+
+    assert index.search(10, 'c', 10) == [
+        {'field': 'model', 'value': 'Camry', 'count': 1}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_serving_and_replays_writes():
+    index = SuggestIndex('cars', ('model',))
+    await index.ensure(lambda: static_rows([(1, 10, 'Corolla')]))
+    loaded = asyncio.Event()
+
+    async def load():
+        await loaded.wait()
+        return [(1, 10, 'Corolla'), (2, 10, 'Civic')]
+
+    refresh = asyncio.create_task(index.refresh(load))
+    await asyncio.sleep(0)
+    index.upsert(3, 10, ('Camry',))
+    assert [item['value'] for item in index.search(10, 'c', 10)] == [
+        'Camry',
+        'Corolla',
+    ]
+    loaded.set()
+    await refresh
+
+    assert [item['value'] for item in index.search(10, 'c', 10)] == [
+        'Camry',
+        'Civic',
+        'Corolla',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_remove_scope_drops_owner_entries():
+    index = SuggestIndex('cars', ('model',))
+    await index.ensure(
+        lambda: static_rows([(1, 10, 'Corolla'), (2, 20, 'Civic')])
+    )
+
+    index.remove_scope(10)
+
+    assert index.search(10, 'c', 10) == []
+    assert list(index.entries) == [2]
+
+
+@pytest.mark.asyncio
+async def test_keep_fresh_builds_index_outside_requests(monkeypatch, tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/car.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as db:
+        db.add(Brand(name='Fiat'))
+        await db.commit()
+    monkeypatch.setattr(database, 'get_engine', lambda: engine)
+
+    await suggest.keep_fresh(suggest.get_brand_index, brand_suggest_rows, 0)
+    await engine.dispose()
+
+    index = suggest.get_brand_index()
+    assert index.ready is True
+    assert index.search(None, 'fi', 10) == [
+        {'field': 'name', 'value': 'Fiat', 'count': 1}
+    ]
+
+
+def test_suggest_cars_scoped_to_owner(
+    client, auth_headers, car, second_user_car, sql_statements
+):
+    response = client.get(
+        '/api/v1/cars/suggest', params={'q': 'c'}, headers=auth_headers
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'suggestions': [{'field': 'model', 'value': 'Corolla', 'count': 1}]
+    }
+
+    sql_statements.clear()
+    response = client.get(
+        '/api/v1/cars/suggest', params={'q': 'abc'}, headers=auth_headers
+    )
+
+    assert response.json() == {
+        'suggestions': [{'field': 'plate', 'value': 'ABC1234', 'count': 1}]
+    }
+    assert sql_statements == []
+
+
+def test_suggest_cars_follows_writes(client, auth_headers, car, car_data):
+    def suggestions(q):
+        return client.get(
+            '/api/v1/cars/suggest', params={'q': q}, headers=auth_headers
+        ).json()['suggestions']
+
+    assert suggestions('cor')[0]['count'] == 1
+
+    payload = {**car_data, 'price': str(car_data['price'])}
+    created = client.post(
+        '/api/v1/cars/',
+        json={**payload, 'plate': 'NEW0001'},
+        headers=auth_headers,
+    ).json()
+    assert suggestions('cor')[0]['count'] == 2
+
+    client.put(
+        f'/api/v1/cars/{car.id}',
+        json={'model': 'Etios'},
+        headers=auth_headers,
+    )
+    assert suggestions('cor')[0]['count'] == 1
+    assert suggestions('et') == [
+        {'field': 'model', 'value': 'Etios', 'count': 1}
+    ]
+
+    client.delete(f'/api/v1/cars/{created["id"]}', headers=auth_headers)
+    assert suggestions('cor') == []
+    assert suggestions('new') == []
+
+
+def test_suggest_ignores_rolled_back_batch(client, auth_headers, car):
+    client.get('/api/v1/cars/suggest', params={'q': 'c'}, headers=auth_headers)
+    operations = [
+        {
+            'method': 'PUT',
+            'path': f'/api/v1/cars/{car.id}',
+            'body': {'model': 'Etios'},
+        },
+        {'method': 'DELETE', 'path': '/api/v1/cars/999'},
+    ]
+
+    client.post(
+        '/api/v1/batch/',
+        json={'operations': operations},
+        headers=auth_headers,
+    )
+
+    response = client.get(
+        '/api/v1/cars/suggest', params={'q': 'et'}, headers=auth_headers
+    )
+    assert response.json() == {'suggestions': []}
+
+
+def test_suggest_brands(client, auth_headers, brand):
+    def suggestions(q):
+        return client.get(
+            '/api/v1/brands/suggest', params={'q': q}, headers=auth_headers
+        ).json()['suggestions']
+
+    assert suggestions('to') == [
+        {'field': 'name', 'value': 'Toyota', 'count': 1}
+    ]
+
+    client.post(
+        '/api/v1/brands/',
+        json={'name': 'Tesla', 'is_active': True},
+        headers=auth_headers,
+    )
+    client.put(
+        f'/api/v1/brands/{brand.id}',
+        json={'name': 'Troller'},
+        headers=auth_headers,
+    )
+
+    assert [item['value'] for item in suggestions('t')] == [
+        'Tesla',
+        'Troller',
+    ]
+
+
+def test_suggest_requires_query(client, auth_headers):
+    response = client.get('/api/v1/brands/suggest', headers=auth_headers)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,100 @@
+import pytest
+
+from car_api.core import tracing
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = tracing.InMemoryExporter()
+    tracer = tracing.Tracer(exporter, sample_rate=1.0)
+    monkeypatch.setattr(tracing, 'get_tracer', lambda: tracer)
+    return exporter
+
+
+def test_request_spans_include_dependencies_and_sql(
+    client, auth_headers, car, exporter
+):
+    client.get(f'/api/v1/cars/{car.id}', headers=auth_headers)
+
+    spans = {span['name']: span for span in exporter.spans}
+    root = spans['GET get_car']
+    assert root['kind'] == 'server'
+    assert root['attributes']['status_code'] == 200
+    assert (
+        spans['dependency get_current_user']['parentSpanId']
+        == (root['spanId'])
+    )
+    assert 'dependency get_car_fieldset' in spans
+
+    queries = [s for s in exporter.spans if s['name'] == 'db.query']
+    assert queries
+    assert all(s['traceId'] == root['traceId'] for s in queries)
+    assert any('FROM cars' in s['attributes']['statement'] for s in queries)
+
+
+def test_sql_in_dependency_is_nested(client, auth_headers, car, exporter):
+    client.get('/api/v1/cars/', headers=auth_headers)
+
+    spans = {span['spanId']: span for span in exporter.spans}
+    user_query = next(
+        s
+        for s in exporter.spans
+        if s['name'] == 'db.query'
+        and 'FROM users' in s['attributes']['statement']
+    )
+    assert spans[user_query['parentSpanId']]['name'] == (
+        'dependency get_current_user'
+    )
+
+
+def test_unsampled_requests_are_not_exported(client, monkeypatch, car):
+    exporter = tracing.InMemoryExporter()
+    tracer = tracing.Tracer(exporter, sample_rate=0.0)
+    monkeypatch.setattr(tracing, 'get_tracer', lambda: tracer)
+
+    client.get('/api/v1/users/')
+
+    assert exporter.spans == []
+
+
+def test_traceparent_forces_sampling(client, monkeypatch):
+    exporter = tracing.InMemoryExporter()
+    tracer = tracing.Tracer(exporter, sample_rate=0.0, trust_parent=True)
+    monkeypatch.setattr(tracing, 'get_tracer', lambda: tracer)
+    trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+
+    client.get(
+        '/api/v1/users/',
+        headers={'traceparent': f'00-{trace_id}-00f067aa0ba902b7-01'},
+    )
+
+    root = next(s for s in exporter.spans if s['name'] == 'GET list_users')
+    assert root['traceId'] == trace_id
+    assert root['parentSpanId'] == '00f067aa0ba902b7'
+
+
+def test_untrusted_traceparent_uses_sample_rate(client, monkeypatch):
+    exporter = tracing.InMemoryExporter()
+    tracer = tracing.Tracer(exporter, sample_rate=0.0)
+    monkeypatch.setattr(tracing, 'get_tracer', lambda: tracer)
+    trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+
+    client.get(
+        '/api/v1/users/',
+        headers={'traceparent': f'00-{trace_id}-00f067aa0ba902b7-01'},
+    )
+
+    assert exporter.spans == []
+
+
+def test_jsonl_exporter_writes_spans(tmp_path):
+    path = tmp_path / 'traces.jsonl'
+    exporter = tracing.JsonlExporter(str(path))
+    tracer = tracing.Tracer(exporter, sample_rate=1.0)
+    span = tracer.start_trace('GET list_cars')
+    span.end()
+
+    tracer.finish_trace(span)
+    exporter.shutdown()
+
+    assert '"name": "GET list_cars"' in path.read_text()
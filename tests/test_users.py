@@ -462,3 +462,26 @@ def test_update_user_only_password(client, user, auth_headers):
     user_data = response.json()
     assert user_data['username'] == original_username
     assert user_data['email'] == original_email
+
+
+def test_batch_get_users(client, user, second_user):
+    response = client.post(
+        '/api/v1/users/batch-get',
+        json={'ids': [second_user.id, user.id, 999]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item and item['username'] for item in data['users']] == [
+        'seconduser',
+        'testuser',
+        None,
+    ]
+    assert data['missing'] == [999]
+
+
+def test_list_users_sorted_by_username(client, user, second_user):
+    response = client.get('/api/v1/users/', params={'sort': '-username'})
+
+    usernames = [item['username'] for item in response.json()['users']]
+    assert usernames == ['testuser', 'seconduser']